@@ -21,7 +21,20 @@ CREATE TABLE raw_events (
     source_id UUID REFERENCES sources(source_id),
     fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     raw_payload JSONB NOT NULL,
-    raw_hash VARCHAR(64) UNIQUE NOT NULL
+    raw_hash VARCHAR(64) UNIQUE NOT NULL,
+    -- Marcado por el normalizer en la transacción que guarda el evento:
+    -- una reentrega del mismo raw_id se descarta
+    normalized_at TIMESTAMP
+);
+
+-- Outbox transaccional: se escribe en la misma transacción que raw_events
+-- y el relay del scraper lo publica a RabbitMQ marcando sent_at
+CREATE TABLE raw_events_outbox (
+    outbox_id BIGSERIAL PRIMARY KEY,
+    raw_id UUID NOT NULL REFERENCES raw_events(raw_id) ON DELETE CASCADE,
+    payload JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP
 );
 
 -- Tabla de eventos normalizados
@@ -36,8 +49,20 @@ CREATE TABLE events (
     evidence_url TEXT,
     source_id UUID REFERENCES sources(source_id),
     dedup_hash VARCHAR(64) UNIQUE NOT NULL,
+    -- Datos estructurados de sismos (NULL para otros tipos)
+    magnitude NUMERIC(3,1),
+    magnitude_type VARCHAR(10),
+    depth_km NUMERIC(6,1),
+    latitude DOUBLE PRECISION,
+    longitude DOUBLE PRECISION,
     status VARCHAR(50) DEFAULT 'NO_VERIFICADO' CHECK (status IN ('CONFIRMADO', 'EN_VERIFICACION', 'NO_VERIFICADO')),
     score INTEGER DEFAULT 0,
+    -- El score es una cota inferior: el verifier cortó la evaluación al
+    -- decidir el status y el reprogramador lo completa (rescore_at = ahora)
+    score_partial BOOLEAN DEFAULT FALSE,
+    -- Próxima fecha en que el score cambia por el paso del tiempo (R3) o
+    -- porque hay que reevaluarlo (cambio de reglas); NULL = nada pendiente
+    rescore_at TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -96,10 +121,17 @@ CREATE TABLE audit_logs (
 
 -- Índices para optimización
 CREATE INDEX idx_events_status ON events(status);
-CREATE INDEX idx_events_type ON events(type);
+-- Corroboración entre fuentes (regla R5): mismo tipo y zona en una ventana de tiempo
+CREATE INDEX idx_events_type_zone_occurred_at ON events(type, zone, occurred_at);
 CREATE INDEX idx_events_occurred_at ON events(occurred_at);
 CREATE INDEX idx_events_zone ON events(zone);
+-- Reprogramador de scores del verifier: eventos con rescore_at vencido
+CREATE INDEX idx_events_rescore_at ON events(rescore_at) WHERE rescore_at IS NOT NULL;
+CREATE INDEX idx_events_magnitude ON events(magnitude) WHERE magnitude IS NOT NULL;
+CREATE INDEX idx_events_epicenter ON events(latitude, longitude) WHERE latitude IS NOT NULL;
 CREATE INDEX idx_raw_events_source ON raw_events(source_id);
+CREATE INDEX idx_raw_events_outbox_pending ON raw_events_outbox(outbox_id) WHERE sent_at IS NULL;
+CREATE INDEX idx_raw_events_outbox_sent ON raw_events_outbox(sent_at) WHERE sent_at IS NOT NULL;
 CREATE INDEX idx_subscriptions_user ON subscriptions(user_id);
 CREATE INDEX idx_notifications_event ON notifications(event_id);
 
@@ -127,6 +159,30 @@ CREATE TRIGGER update_sources_updated_at BEFORE UPDATE ON sources
 CREATE TRIGGER update_events_updated_at BEFORE UPDATE ON events
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Notificar cambios del catálogo de fuentes (recarga en caliente del scraper)
+CREATE OR REPLACE FUNCTION notify_sources_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('sources_changed', COALESCE(NEW.source_id, OLD.source_id)::text);
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER notify_sources_changed AFTER INSERT OR UPDATE OR DELETE ON sources
+    FOR EACH ROW EXECUTE FUNCTION notify_sources_changed();
+
+-- Notificar cambios de reglas de verificación (recarga en caliente del verifier)
+CREATE OR REPLACE FUNCTION notify_verification_rules_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('verification_rules_changed', '');
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER notify_verification_rules_changed AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON verification_rules
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_verification_rules_changed();
+
 -- Insertar usuario admin por defecto (password: admin123)
 INSERT INTO users (email, password_hash, role) VALUES
     ('admin@sacv.local', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5GyYzS8qB.W96', 'admin');
@@ -0,0 +1,143 @@
+"""
+Benchmark de formatos de mensaje de las colas
+Corpus por cola, armado con los eventos de bench_neardup:
+  - raw_events: payload como el del scraper (content hasta 500 caracteres
+    y html_snippet hasta 500)
+  - normalized_events: el evento que publica el normalizer
+  - confirmed_events: el anterior con score y status
+Compara bytes por mensaje y costo de codificar/decodificar de:
+  - json (orjson) con claves, lo que viaja hoy
+  - msgpack como mapa (sin esquema)
+  - msgpack con esquema versionado (codec, sin comprimir)
+  - msgpack con esquema + zstd (codec, desde ZSTD_MIN_BYTES)
+y estima la memoria del broker para --depth mensajes encolados.
+
+Uso:
+    python benchmarks/bench_codec.py --events 2000 --depth 100000
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+sys.path.insert(0, HERE)
+
+import msgpack  # noqa: E402
+import structlog  # noqa: E402
+import codec  # noqa: E402
+from bench_neardup import generate  # noqa: E402
+from extraction import EventExtractor  # noqa: E402
+
+
+class Properties:
+    def __init__(self, content_type, content_encoding):
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+
+
+def corpus(size):
+    extractor = EventExtractor()
+    raws, normalized, confirmed = [], [], []
+    seed = 0
+    while len(raws) < size:
+        for event in generate(seed=seed):
+            if len(raws) == size:
+                break
+            occurred_at = datetime.fromisoformat(event['occurred_at']) + timedelta(days=5 * seed)
+            content = event['description'][:500]
+            raw = {
+                'raw_id': len(raws) + 1,
+                'source_id': str(uuid.uuid5(uuid.NAMESPACE_URL, event['type'])),
+                'source_type': event['type'],
+                'fetched_at': (occurred_at + timedelta(minutes=3)).isoformat(),
+                'raw_hash': hashlib.sha256(content.encode()).hexdigest(),
+                'raw_payload': {
+                    'title': event['title'],
+                    'content': content,
+                    'date': f"{occurred_at:%d/%m/%Y %H:%M}",
+                    'url': f"https://www.igepn.edu.ec/informes/{len(raws)}",
+                    'html_snippet': (f'<div class="evento"><h3 class="titulo">{event["title"]}</h3>'
+                                     f'<p class="contenido">{content}</p></div>')[:500],
+                    'scraped_at': (occurred_at + timedelta(minutes=3)).isoformat(),
+                },
+            }
+            raws.append(raw)
+            extracted, _ = extractor.extract(raw, raw['source_type'])
+            extracted['dedup_hash'] = raw['raw_hash']
+            extracted['event_id'] = str(uuid.uuid4())
+            normalized.append(extracted)
+            confirmed.append(dict(extracted, score=85, status='CONFIRMADO'))
+        seed += 1
+    return {
+        ('raw_events', codec.KIND_RAW_EVENT): raws,
+        ('normalized_events', codec.KIND_NORMALIZED_EVENT): normalized,
+        ('confirmed_events', codec.KIND_CONFIRMED_EVENT): confirmed,
+    }
+
+
+def measure(encode, decode, messages):
+    start = time.perf_counter()
+    encoded = [encode(message) for message in messages]
+    encode_us = (time.perf_counter() - start) / len(messages) * 1e6
+    start = time.perf_counter()
+    for item in encoded:
+        decode(item)
+    decode_us = (time.perf_counter() - start) / len(messages) * 1e6
+    size = sum(len(item[0]) for item in encoded) / len(messages)
+    return size, encode_us, decode_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--depth', type=int, default=100000)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(30))
+
+    zstd_min_bytes = codec.ZSTD_MIN_BYTES
+
+    def codec_encode(kind, compress):
+        def encode(message):
+            codec.ZSTD_MIN_BYTES = zstd_min_bytes if compress else 1 << 30
+            return codec.encode(message, kind, codec.FORMAT_MSGPACK)
+        return encode
+
+    def codec_decode(kind):
+        return lambda item: codec.decode(item.body, kind, Properties(item.content_type, item.content_encoding))
+
+    print(f"{args.events} mensajes por cola; memoria estimada para {args.depth} encolados")
+    print(f"{'cola':<18} {'formato':<18} {'bytes':>7} {'vs json':>8} {'enc us':>7} {'dec us':>7} {'MB':>7}")
+    for (queue, kind), messages in corpus(args.events).items():
+        formats = [
+            ('json', lambda m: (codec.dumps(m),), lambda item: codec.loads(item[0])),
+            ('msgpack mapa', lambda m: (msgpack.packb(m, default=str),),
+             lambda item: msgpack.unpackb(item[0], raw=False)),
+            ('msgpack esquema', codec_encode(kind, False), codec_decode(kind)),
+            ('msgpack+zstd', codec_encode(kind, True), codec_decode(kind)),
+        ]
+        json_size = None
+        for name, encode, decode in formats:
+            size, encode_us, decode_us = measure(encode, decode, messages)
+            json_size = json_size or size
+            megabytes = size * args.depth / 1e6
+            print(f"{queue:<18} {name:<18} {size:>7.0f} {size / json_size:>8.0%} "
+                  f"{encode_us:>7.1f} {decode_us:>7.1f} {megabytes:>7.1f}")
+    codec.ZSTD_MIN_BYTES = zstd_min_bytes
+
+    # Ida y vuelta sin perdidas con el esquema
+    for (queue, kind), messages in corpus(50).items():
+        for message in messages:
+            encoded = codec.encode(message, kind, codec.FORMAT_MSGPACK)
+            decoded = codec.decode(encoded.body, kind, Properties(encoded.content_type, encoded.content_encoding))
+            expected = codec.loads(codec.dumps(message))
+            assert decoded == expected, (queue, decoded, expected)
+    print("ida y vuelta msgpack == json: ok")
+
+
+if __name__ == '__main__':
+    main()
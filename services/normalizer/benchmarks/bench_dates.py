@@ -0,0 +1,91 @@
+"""
+Microbenchmark de parseo de fechas
+Corpus: las fechas reales de las fixtures HTML del scraper (IGEPN, INAMHI,
+CNEL) mas variantes vistas en boletines (ISO, abreviaturas, am/pm).
+Compara dateutil.parser.parse (camino original) con DateParser y reporta
+los aciertos por camino.
+
+Uso:
+    python benchmarks/bench_dates.py --repeat 50
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+from dateutil import parser as date_parser  # noqa: E402
+from dates import DateParser  # noqa: E402
+
+FIXTURES = os.path.join(HERE, '..', '..', 'scraper', 'benchmarks', 'fixtures', '*.html')
+EXTRA = [
+    '2026-01-15T14:32:00', '2026-01-15T19:32:00Z', '2026-01-15 14:32:00-05:00',
+    'Lunes, 15 de enero de 2026 a las 2:32 pm', '15 ene. 2026 14:32', '15-01-2026',
+    '1 de septiembre del 2025, 08:00', '31/12/2025 23:59:59',
+]
+
+
+def load_corpus():
+    strings = []
+    for path in sorted(glob.glob(FIXTURES)):
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        strings.extend(m.strip() for m in re.findall(r'class="(?:fecha|date)"[^>]*>([^<]+)<', html))
+    return strings + EXTRA
+
+
+def legacy(text):
+    try:
+        return date_parser.parse(text)
+    except Exception:
+        return None
+
+
+def timed(fn, corpus, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in corpus:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(corpus)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    legacy_failed = sum(1 for text in corpus if legacy(text) is None)
+
+    fast = DateParser()
+    # Una fuente por formato para que el camino aprendido tenga efecto
+    sources = [f"source-{hash(re.sub(r'[0-9]', '0', text)) % 8}" for text in corpus]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text, source_id in zip(corpus, sources):
+            fast.parse(text, source_id)
+    fast_us = (time.perf_counter() - start) / (args.repeat * len(corpus)) * 1e6
+    legacy_us = timed(legacy, corpus, args.repeat)
+
+    print(f"{len(corpus)} fechas x {args.repeat} repeticiones")
+    print(f"{'parser':<12} {'us/fecha':>10} {'fallidas':>9}")
+    print(f"{'dateutil':<12} {legacy_us:>10.1f} {legacy_failed:>9}")
+    print(f"{'DateParser':<12} {fast_us:>10.1f} {fast.stats['failed'] // args.repeat:>9}")
+    print(f"speedup x{legacy_us / fast_us:.1f}")
+    print()
+    print("aciertos por camino:", dict(Counter({k: v // args.repeat for k, v in fast.stats.items()})))
+
+    # Diferencias de interpretacion: dateutil asume mes/dia y no entiende español
+    wrong = [text for text in corpus if legacy(text) is not None and re.match(r'\d{1,2}/\d{1,2}/', text)
+             and legacy(text).month != int(text.split('/')[1])]
+    if wrong:
+        print(f"dateutil invierte dia/mes en {len(wrong)} fechas, p.ej. {wrong[0]!r} -> {legacy(wrong[0])}")
+
+
+if __name__ == '__main__':
+    main()
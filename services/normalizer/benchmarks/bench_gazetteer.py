@@ -0,0 +1,119 @@
+"""
+Benchmark de extraccion de zona
+  - legacy: diccionario de 12 palabras reconstruido en cada llamada con
+    busqueda lineal `in` (extract_zone original)
+  - gazetteer: automata Aho-Corasick (pyahocorasick y Python puro) con el
+    nomenclator completo de Ecuador
+  - escalado: nomenclator sintetico de 1k a 50k nombres para mostrar que el
+    costo por evento depende del largo del texto y no del numero de nombres
+
+Uso:
+    python benchmarks/bench_gazetteer.py --events 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import structlog  # noqa: E402
+from gazetteer import Gazetteer, LEVEL_CANTON, ahocorasick  # noqa: E402
+from gazetteer_data import CANTONES, PARROQUIAS  # noqa: E402
+
+TEMPLATES = [
+    ("Sismo de magnitud {mag} en {place}",
+     "El Instituto Geofisico reporta un sismo sentido en {place} y zonas aledañas. "
+     "Profundidad {depth} km. Se recomienda mantener la calma."),
+    ("Alerta de lluvias intensas",
+     "INAMHI informa precipitaciones fuertes en {place}, {other} y la región. "
+     "Posibles desbordamientos de ríos en sectores bajos."),
+    ("Cortes de energía programados",
+     "CNEL anuncia suspensión del servicio en {place}: sectores norte, centro y "
+     "sur desde las 08:00 hasta las 16:00 por mantenimiento de redes."),
+    ("Boletín informativo", "Sin novedades relevantes en el territorio nacional durante la jornada."),
+]
+
+
+def legacy_extract_zone(raw_payload):
+    content = str(raw_payload.get('content', '')) + str(raw_payload.get('title', ''))
+    content_lower = content.lower()
+    provincias = {
+        'pichincha': 'Pichincha', 'quito': 'Pichincha', 'guayas': 'Guayas',
+        'guayaquil': 'Guayas', 'azuay': 'Azuay', 'cuenca': 'Azuay', 'manabi': 'Manabi',
+        'esmeraldas': 'Esmeraldas', 'tungurahua': 'Tungurahua', 'ambato': 'Tungurahua',
+        'chimborazo': 'Chimborazo', 'riobamba': 'Chimborazo'
+    }
+    for keyword, provincia in provincias.items():
+        if keyword in content_lower:
+            return provincia
+    return 'Nacional'
+
+
+def corpus(size, seed=7):
+    rng = random.Random(seed)
+    places = [name for names in list(CANTONES.values()) + list(PARROQUIAS.values()) for name in names]
+    events = []
+    for _ in range(size):
+        title, content = rng.choice(TEMPLATES)
+        fill = dict(place=rng.choice(places), other=rng.choice(places),
+                    mag=f"{rng.uniform(3, 7):.1f}", depth=rng.randint(5, 200))
+        events.append({'title': title.format(**fill), 'content': content.format(**fill)})
+    return events
+
+
+def per_event_us(fn, events):
+    start = time.perf_counter()
+    for event in events:
+        fn(event)
+    return (time.perf_counter() - start) / len(events) * 1e6
+
+
+def synthetic_gazetteer(size, backend):
+    rng = random.Random(size)
+    syllables = ['ca', 'ma', 'to', 'qui', 'lla', 'pa', 'ri', 'ba', 'ya', 'cu', 'zo', 'ne', 'hua', 'chi']
+    entries = [(province, province, 'provincia') for province in CANTONES]
+    for canton_list in CANTONES.values():
+        entries.extend((canton, 'X', LEVEL_CANTON) for canton in canton_list)
+    while len(entries) < size:
+        name = ''.join(rng.choice(syllables) for _ in range(rng.randint(3, 5))).capitalize()
+        entries.append((name, rng.choice(list(CANTONES)), LEVEL_CANTON))
+    return Gazetteer(entries, backend=backend)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=5000)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(30))
+
+    events = corpus(args.events)
+    backends = ['python'] + (['pyahocorasick'] if ahocorasick is not None else [])
+
+    print(f"{args.events} eventos, {sum(len(e['title']) + len(e['content']) for e in events) // len(events)} "
+          f"caracteres promedio")
+    print(f"{'variante':<38} {'us/evento':>10} {'sin zona':>9}")
+    legacy = [legacy_extract_zone(e) for e in events]
+    print(f"{'legacy (12 palabras)':<38} {per_event_us(legacy_extract_zone, events):>10.1f} "
+          f"{legacy.count('Nacional') / len(events):>9.1%}")
+    for backend in backends:
+        gazetteer = Gazetteer.ecuador(backend=backend)
+        zones = [gazetteer.locate(e['title'], e['content']) for e in events]
+        elapsed = per_event_us(lambda e: gazetteer.locate(e['title'], e['content']), events)
+        label = f"ecuador {len(gazetteer.entries)} nombres [{backend}]"
+        print(f"{label:<38} {elapsed:>10.1f} {zones.count(None) / len(events):>9.1%}")
+
+    print()
+    print(f"{'nombres':>8} {'backend':<14} {'compilar ms':>12} {'us/evento':>10}")
+    for size in (1000, 5000, 20000, 50000):
+        for backend in backends:
+            start = time.perf_counter()
+            gazetteer = synthetic_gazetteer(size, backend)
+            build_ms = (time.perf_counter() - start) * 1000
+            elapsed = per_event_us(lambda e: gazetteer.locate(e['title'], e['content']), events)
+            print(f"{size:>8} {backend:<14} {build_ms:>12.1f} {elapsed:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Benchmark de deduplicacion: precision / recall por pares y throughput
+Fixture etiquetada (fixtures/neardup_labeled.jsonl): cada linea es un
+evento con su `cluster` verdadero. Los clusters reproducen lo que llega
+de las fuentes:
+  - reediciones del mismo boletin (magnitud revisada, texto agregado)
+  - copias en agregadores con prefijos/sufijos ("URGENTE:", "Fuente: ...")
+  - el mismo sismo con otra palabra de zona ("cerca de Quito" / "en Pichincha")
+  - eventos distintos del mismo tipo, provincia y dia (lluvias en varios
+    cantones, sismos distintos), que el hash type_zone_dia colapsaba
+
+Compara el hash original type_zone_dia con NearDuplicateIndex a varios
+umbrales.
+
+Uso:
+    python benchmarks/bench_neardup.py
+    python benchmarks/bench_neardup.py --regenerate   # reescribe la fixture
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import combinations
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+import structlog  # noqa: E402
+from gazetteer_data import CANTONES  # noqa: E402
+from gazetteer import Gazetteer  # noqa: E402
+from neardup import NearDuplicateIndex, founder_hash  # noqa: E402
+
+FIXTURE = os.path.join(HERE, 'fixtures', 'neardup_labeled.jsonl')
+
+QUAKE_TITLES = [
+    "Sismo de magnitud {mag} cerca de {place}",
+    "Sismo de magnitud {mag} en {province}",
+    "Informe sísmico: sismo de magnitud {mag} localizado cerca de {place}",
+]
+QUAKE_BODY = (
+    "El Instituto Geofísico informa que se registró un sismo de magnitud {mag} Mlv a una "
+    "profundidad de {depth} km, localizado a {dist} km de {place}. Latitud {lat}, Longitud {lon}. "
+    "Se sintió en {place} y zonas aledañas de {province}."
+)
+RAIN_TITLE = "Alerta de lluvias intensas en {place}"
+RAIN_BODY = (
+    "El INAMHI emite alerta {color} por precipitaciones de {mm} mm en el cantón {place}, provincia de "
+    "{province}. Se prevén tormentas eléctricas y posibles desbordamientos de ríos durante la {when}."
+)
+CUT_TITLE = "Corte de energía programado en {place}"
+CUT_BODY = (
+    "CNEL EP informa la suspensión del servicio eléctrico en {place} ({province}) el {day} desde las "
+    "{start}:00 hasta las {end}:00 en los sectores {sectors} por {reason}."
+)
+SECTORS = ['norte', 'centro', 'sur', 'La Florida', 'Las Palmas', 'El Recreo', 'San José', 'Los Vergeles',
+           'Cdla. Kennedy', 'Urdesa', 'La Alborada', 'Sauces', 'Mapasingue', 'Bellavista']
+REASONS = ['mantenimiento de redes', 'cambio de transformador', 'poda de árboles', 'reubicación de postes']
+
+
+def variant(rng, title, body):
+    """Copia de agregador o reedicion del mismo evento"""
+    kind = rng.choice(['prefix', 'suffix', 'truncate', 'edit', 'same'])
+    if kind == 'prefix':
+        title = rng.choice(['URGENTE: ', 'ÚLTIMO MINUTO | ', 'Atención: ']) + title
+    elif kind == 'suffix':
+        body = body + rng.choice([' Fuente: IGEPN.', ' Más información en breve.', ' Mantenga la calma.'])
+    elif kind == 'truncate':
+        body = body[:int(len(body) * rng.uniform(0.6, 0.85))]
+    elif kind == 'edit':
+        words = body.split()
+        for _ in range(2):
+            words[rng.randrange(len(words))] = rng.choice(['aproximadamente', 'reportado', 'según'])
+        body = ' '.join(words)
+    return title, body
+
+
+def generate(seed=11, days=5):
+    rng = random.Random(seed)
+    provinces = list(CANTONES)
+    events = []
+    cluster = 0
+    start = datetime(2026, 1, 1, 0, 0)
+    for day in range(days):
+        for province in rng.sample(provinces, 6):
+            places = rng.sample(CANTONES[province], min(3, len(CANTONES[province])))
+            # Varios eventos distintos del mismo tipo, provincia y dia
+            for place in places:
+                base_time = start + timedelta(days=day, minutes=rng.randrange(0, 1200))
+                etype = rng.choice(['sismo', 'lluvia', 'corte'])
+                if etype == 'sismo':
+                    fill = dict(mag=f"{rng.uniform(2.5, 6.5):.1f}", depth=rng.randint(5, 180),
+                                dist=rng.randint(5, 60), place=place, province=province,
+                                lat=round(rng.uniform(-4.5, 1.2), 2), lon=round(rng.uniform(-80.8, -75.5), 2))
+                    title, body = rng.choice(QUAKE_TITLES).format(**fill), QUAKE_BODY.format(**fill)
+                    extra = dict(magnitude=float(fill['mag']), latitude=fill['lat'], longitude=fill['lon'])
+                elif etype == 'lluvia':
+                    fill = dict(place=place, province=province, color=rng.choice(['amarilla', 'naranja', 'roja']),
+                                mm=rng.randint(20, 90), when=rng.choice(['tarde', 'noche', 'madrugada']))
+                    title, body, extra = RAIN_TITLE.format(**fill), RAIN_BODY.format(**fill), {}
+                else:
+                    fill = dict(place=place, province=province, day=f"{base_time:%d/%m/%Y}",
+                                start=rng.randint(6, 12), end=rng.randint(13, 18),
+                                sectors=', '.join(rng.sample(SECTORS, 3)), reason=rng.choice(REASONS))
+                    title, body, extra = CUT_TITLE.format(**fill), CUT_BODY.format(**fill), {}
+
+                for copy in range(rng.choice([1, 1, 2, 3, 4])):
+                    t, b = (title, body) if copy == 0 else variant(rng, title, body)
+                    if etype == 'sismo' and copy and rng.random() < 0.3:
+                        # Mismo sismo con otra palabra de zona
+                        t = QUAKE_TITLES[1 if '{place}' in t else 0].format(**fill)
+                    events.append(dict(cluster=cluster, type=etype, zone=province,
+                                       occurred_at=(base_time + timedelta(minutes=rng.randint(0, 40))).isoformat(),
+                                       title=t, description=b, **extra))
+                cluster += 1
+    rng.shuffle(events)
+    events.sort(key=lambda e: e['occurred_at'])
+    return events
+
+
+def load():
+    with open(FIXTURE, encoding='utf-8') as f:
+        events = [json.loads(line) for line in f]
+    for event in events:
+        event['occurred_at'] = datetime.fromisoformat(event['occurred_at'])
+    return events
+
+
+def pair_scores(events, predicted):
+    """Precision y recall sobre pares de eventos agrupados juntos"""
+    truth_pairs, predicted_pairs = set(), set()
+    by_truth, by_pred = defaultdict(list), defaultdict(list)
+    for index, event in enumerate(events):
+        by_truth[event['cluster']].append(index)
+        by_pred[predicted[index]].append(index)
+    for members in by_truth.values():
+        truth_pairs.update(combinations(members, 2))
+    for members in by_pred.values():
+        predicted_pairs.update(combinations(members, 2))
+    hits = len(truth_pairs & predicted_pairs)
+    precision = hits / len(predicted_pairs) if predicted_pairs else 1.0
+    recall = hits / len(truth_pairs) if truth_pairs else 1.0
+    return precision, recall
+
+
+def legacy_hash(event):
+    return f"{event['type']}_{event['zone']}_{event['occurred_at'].date().isoformat()}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--regenerate', action='store_true')
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(30))
+
+    if args.regenerate or not os.path.exists(FIXTURE):
+        os.makedirs(os.path.dirname(FIXTURE), exist_ok=True)
+        with open(FIXTURE, 'w', encoding='utf-8') as f:
+            for event in generate():
+                f.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+    events = load()
+    clusters = len({e['cluster'] for e in events})
+    print(f"{len(events)} eventos, {clusters} clusters reales")
+    print(f"{'metodo':<22} {'precision':>10} {'recall':>8} {'clusters':>9} {'eventos/s':>10}")
+
+    start = time.perf_counter()
+    predicted = [legacy_hash(e) for e in events]
+    rate = len(events) / (time.perf_counter() - start)
+    precision, recall = pair_scores(events, predicted)
+    print(f"{'type_zone_dia':<22} {precision:>10.3f} {recall:>8.3f} {len(set(predicted)):>9} {rate:>10.0f}")
+
+    gazetteer = Gazetteer.ecuador()
+    for threshold in (0.3, 0.4, 0.5, 0.6):
+        index = NearDuplicateIndex(threshold=threshold, places=gazetteer.places)
+        start = time.perf_counter()
+        predicted = [index.assign(e, founder_hash(e, str(i)))[0] for i, e in enumerate(events)]
+        rate = len(events) / (time.perf_counter() - start)
+        precision, recall = pair_scores(events, predicted)
+        label = f"minhash-lsh j>={threshold}"
+        print(f"{label:<22} {precision:>10.3f} {recall:>8.3f} {len(set(predicted)):>9} {rate:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
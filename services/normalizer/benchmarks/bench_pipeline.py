@@ -0,0 +1,150 @@
+"""
+Benchmark por etapa del camino de un evento en el normalizer
+Corpus: los mensajes crudos de bench_workers (eventos de bench_neardup).
+Mide us/evento de cada etapa en el orden de process_batch y compara las
+que cambiaron:
+  - decodificar: json.loads vs codec.loads
+  - validar: modelo Pydantic anterior (@validator + .dict()) vs NormalizedEvent
+  - publicar: json.dumps(default=str) vs codec.dumps
+Si pydantic no esta instalado se omite la columna "anterior" de validar.
+
+Uso:
+    python benchmarks/bench_pipeline.py --events 2000 --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+from datetime import datetime
+from typing import Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+sys.path.insert(0, HERE)
+
+import structlog  # noqa: E402
+import codec  # noqa: E402
+from bench_workers import messages  # noqa: E402
+from extraction import EventExtractor, PENDING_HASH  # noqa: E402
+from models import NormalizedEvent  # noqa: E402
+from neardup import NearDuplicateIndex, fingerprint, founder_hash  # noqa: E402
+from quake import extract_quake_fields  # noqa: E402
+
+try:
+    from pydantic import BaseModel, Field, validator
+except ImportError:  # pragma: no cover - depende del entorno
+    BaseModel = None
+
+if BaseModel is not None:
+    warnings.filterwarnings('ignore')
+
+    class LegacyNormalizedEvent(BaseModel):
+        """Copia del modelo Pydantic que usaba el normalizer"""
+        type: str = Field(...)
+        occurred_at: datetime = Field(...)
+        zone: Optional[str] = Field(None)
+        severity: Optional[str] = Field(None)
+        title: str = Field(..., min_length=1, max_length=500)
+        description: Optional[str] = Field(None)
+        evidence_url: str = Field(...)
+        source_id: str = Field(...)
+        dedup_hash: str = Field(...)
+        magnitude: Optional[float] = Field(None, ge=0, le=10)
+        magnitude_type: Optional[str] = Field(None, max_length=10)
+        depth_km: Optional[float] = Field(None, ge=0, le=700)
+        latitude: Optional[float] = Field(None, ge=-90, le=90)
+        longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+        @validator('type')
+        def validate_type(cls, v):
+            if v not in ['sismo', 'lluvia', 'corte']:
+                raise ValueError('tipo')
+            return v
+
+        @validator('severity')
+        def validate_severity(cls, v):
+            if v is not None and v not in ['Baja', 'Media', 'Alta']:
+                raise ValueError('severidad')
+            return v
+
+
+def per_event_us(fn, items, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(30))
+
+    bodies = messages(args.events)
+    raws = [codec.loads(body) for body in bodies]
+    extractor = EventExtractor()
+    fields = []
+    for raw in raws:
+        payload = raw['raw_payload']
+        quake = extract_quake_fields(payload['title'], payload['content']) if raw['source_type'] == 'sismo' else {}
+        fields.append(dict(
+            type=raw['source_type'],
+            occurred_at=extractor.date_parser.parse(payload['date'], raw['source_id']),
+            zone=extractor.extract_zone(payload),
+            severity=extractor.extract_severity(payload),
+            title=payload['title'], description=payload['content'],
+            evidence_url=payload['url'], source_id=raw['source_id'],
+            dedup_hash=PENDING_HASH, **quake
+        ))
+    events = [NormalizedEvent(**f).as_dict() for f in fields]
+    prints = [fingerprint(e['title'], e['description'], extractor.gazetteer.places) for e in events]
+
+    index = NearDuplicateIndex(places=extractor.gazetteer.places)
+
+    def dedup(pair):
+        event, fp = pair
+        index.assign(event, founder_hash(event, None), fp)
+
+    def legacy_validate(f):
+        return LegacyNormalizedEvent(**f).dict()
+
+    rows = [
+        ('decodificar', lambda b: json.loads(b), codec.loads, bodies),
+        ('fecha', None, lambda r: extractor.date_parser.parse(r['raw_payload']['date'], r['source_id']), raws),
+        ('zona', None, lambda r: extractor.extract_zone(r['raw_payload']), raws),
+        ('severidad', None, lambda r: extractor.extract_severity(r['raw_payload']), raws),
+        ('campos de sismo', None,
+         lambda r: extract_quake_fields(r['raw_payload']['title'], r['raw_payload']['content']), raws),
+        ('validar', legacy_validate if BaseModel is not None else None,
+         lambda f: NormalizedEvent(**f).as_dict(), fields),
+        ('huella minhash', None,
+         lambda e: fingerprint(e['title'], e['description'], extractor.gazetteer.places), events),
+        ('dedup_hash', None, dedup, list(zip(events, prints))),
+        ('publicar', lambda e: json.dumps(e, default=str).encode(), codec.dumps, events),
+    ]
+
+    print(f"{len(bodies)} eventos, mejor de {args.repeat}, orjson={'si' if codec.orjson else 'no'}")
+    print(f"{'etapa':<18} {'anterior us':>12} {'actual us':>10} {'speedup':>8}")
+    total_old = total_new = 0.0
+    for name, old_fn, new_fn, items in rows:
+        # dedup_hash una sola pasada: repetirla buscaria contra sus propios eventos
+        new_us = per_event_us(new_fn, items, 1 if name == 'dedup_hash' else args.repeat)
+        old_us = per_event_us(old_fn, items, args.repeat) if old_fn else new_us
+        total_old += old_us
+        total_new += new_us
+        old = f"{old_us:.1f}" if old_fn else '='
+        speedup = f"x{old_us / new_us:.1f}" if old_fn else ''
+        print(f"{name:<18} {old:>12} {new_us:>10.1f} {speedup:>8}")
+    print(f"{'total':<18} {total_old:>12.1f} {total_new:>10.1f} {'x%.2f' % (total_old / total_new):>8}")
+
+
+if __name__ == '__main__':
+    main()
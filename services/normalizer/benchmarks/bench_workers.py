@@ -0,0 +1,110 @@
+"""
+Benchmark de escalado de la normalizacion con ExtractionPool
+Corpus: eventos del generador de bench_neardup (una semilla por bloque de
+5 dias consecutivos, asi no se repiten textos) convertidos a mensajes
+crudos como los publica el scraper.
+Por cada cantidad de workers mide eventos/s del camino de process_batch
+sin BD ni RabbitMQ: json.loads -> extraccion en el pool -> dedup_hash en el
+proceso principal, en lotes de --batch. Verifica ademas que los resultados
+salen en el orden de entrega (el ack multiple depende de eso).
+
+Uso:
+    python benchmarks/bench_workers.py --events 4000 --workers 0 1 2 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+import structlog  # noqa: E402
+from extraction import EventExtractor, ExtractionPool  # noqa: E402
+from neardup import NearDuplicateIndex, founder_hash  # noqa: E402
+from bench_neardup import generate  # noqa: E402
+
+
+def messages(size):
+    events = []
+    seed = 0
+    while len(events) < size:
+        for event in generate(seed=seed, days=5):
+            event['occurred_at'] = datetime.fromisoformat(event['occurred_at']) + timedelta(days=5 * seed)
+            events.append(event)
+        seed += 1
+    bodies = []
+    for index, event in enumerate(events[:size]):
+        raw = {
+            'raw_id': index,
+            'source_id': f"source-{event['type']}",
+            'source_type': event['type'],
+            'raw_hash': f"{index:064x}",
+            'raw_payload': {
+                'title': event['title'],
+                'content': event['description'],
+                'date': f"{event['occurred_at']:%d/%m/%Y %H:%M}",
+                'url': f"https://example.org/{index}",
+            },
+        }
+        bodies.append(json.dumps(raw).encode())
+    return bodies
+
+
+def run(bodies, workers, batch_size):
+    extractor = EventExtractor()
+    pool = ExtractionPool(workers, extractor)
+    pool.start()
+    index = NearDuplicateIndex(places=extractor.gazetteer.places)
+    # Calentar los workers (nomenclator compilado) fuera de la medicion
+    pool.extract([(json.loads(body), 'sismo', None) for body in bodies[:workers * 32]])
+
+    order = []
+    extracting = 0.0
+    start = time.perf_counter()
+    for offset in range(0, len(bodies), batch_size):
+        prepared = []
+        for body in bodies[offset:offset + batch_size]:
+            raw_event = json.loads(body)
+            prepared.append((raw_event, raw_event['source_type'], None))
+        mark = time.perf_counter()
+        extracted = pool.extract(prepared)
+        extracting += time.perf_counter() - mark
+        for (raw_event, _, _), result in zip(prepared, extracted):
+            if result:
+                event, fingerprint = result
+                event['dedup_hash'], _ = index.assign(
+                    event, founder_hash(event, raw_event['raw_hash']), fingerprint)
+                order.append(raw_event['raw_id'])
+    elapsed = time.perf_counter() - start
+    pool.close()
+    # Fraccion que queda en el proceso principal (json + dedup_hash)
+    serial = (elapsed - extracting) / elapsed
+    return len(bodies) / elapsed, serial, order == sorted(order)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=4000)
+    parser.add_argument('--batch', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4])
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(30))
+
+    bodies = messages(args.events)
+    print(f"{args.events} eventos, lotes de {args.batch}, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'eventos/s':>10} {'x base':>7} {'serial':>7} {'en orden':>9}")
+    base = None
+    for workers in args.workers:
+        rate, serial, ordered = run(bodies, workers, args.batch)
+        if base is None:
+            base, base_serial = rate, serial
+        print(f"{workers:>8} {rate:>10.0f} {rate / base:>7.2f} {serial:>7.0%} {'si' if ordered else 'NO':>9}")
+    # Amdahl con la fraccion serial medida sin pool
+    print(f"techo teorico con CPUs suficientes: x{1 / base_serial:.1f}")
+
+
+if __name__ == '__main__':
+    main()
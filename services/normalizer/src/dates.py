@@ -0,0 +1,172 @@
+"""
+Parseo de fechas de las fuentes con caminos rapidos precompilados
+Orden de intentos:
+  1. el camino que funciono la ultima vez para la misma fuente
+  2. formato strptime configurado en parser_config['date_format']
+  3. ISO 8601 (datetime.fromisoformat)
+  4. español largo: "15 de enero de 2026, 14:32"
+  5. numerico dia/mes/año: "15/01/2026 14:32" (Ecuador usa dia primero)
+  6. dateutil como ultimo recurso, con meses traducidos y dayfirst; solo
+     si el texto trae dia y mes (si no, el caller usa scraped_at)
+Las fechas sin zona horaria se interpretan en America/Guayaquil y todo se
+retorna como datetime UTC sin tzinfo (lo que espera el verifier).
+"""
+import re
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from dateutil import parser as date_parser
+
+try:
+    from zoneinfo import ZoneInfo
+    LOCAL_TZ = ZoneInfo('America/Guayaquil')
+except Exception:  # pragma: no cover - imagen sin tzdata
+    # Ecuador no tiene horario de verano: UTC-5 fijo
+    LOCAL_TZ = timezone(timedelta(hours=-5), 'ECT')
+
+MONTHS = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6,
+    'julio': 7, 'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10,
+    'noviembre': 11, 'diciembre': 12,
+    'ene': 1, 'feb': 2, 'mar': 3, 'abr': 4, 'may': 5, 'jun': 6, 'jul': 7,
+    'ago': 8, 'sep': 9, 'sept': 9, 'set': 9, 'oct': 10, 'nov': 11, 'dic': 12,
+}
+ENGLISH_MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+                  'August', 'September', 'October', 'November', 'December']
+
+_TIME = r'(?:[,\s]+(?:a\s+las\s+)?(\d{1,2}):(\d{2})(?::(\d{2}))?\s*(?:(am|pm|a\.\s?m\.|p\.\s?m\.))?)?'
+SPANISH_PATTERN = re.compile(
+    r'(\d{1,2})\s+(?:de\s+)?([a-zA-ZñÑ]+)\.?\s+(?:de(?:l)?\s+)?(\d{4})' + _TIME, re.I
+)
+NUMERIC_PATTERN = re.compile(r'\b(\d{1,2})[/\-.](\d{1,2})[/\-.](\d{4})' + _TIME, re.I)
+MONTH_WORD_PATTERN = re.compile(r'\b(' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\b\.?', re.I)
+ISO_PREFIX = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+PATH_SOURCE_FORMAT = 'source_format'
+PATH_ISO = 'iso'
+PATH_SPANISH = 'spanish'
+PATH_NUMERIC = 'numeric'
+PATH_DATEUTIL = 'dateutil'
+
+
+def to_utc(value: datetime) -> datetime:
+    """Hora local de Ecuador (o con zona explicita) -> UTC sin tzinfo"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=LOCAL_TZ)
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _hour(hour: str, meridiem: Optional[str]) -> int:
+    value = int(hour)
+    if meridiem:
+        is_pm = meridiem.lower().startswith('p')
+        if is_pm and value < 12:
+            value += 12
+        elif not is_pm and value == 12:
+            value = 0
+    return value
+
+
+def _build(year, month, day, match, offset) -> datetime:
+    hour, minute, second, meridiem = match.group(offset, offset + 1, offset + 2, offset + 3)
+    return datetime(
+        int(year), month, int(day),
+        _hour(hour, meridiem) if hour else 0,
+        int(minute) if minute else 0,
+        int(second) if second else 0
+    )
+
+
+def _english_months(text: str) -> str:
+    return MONTH_WORD_PATTERN.sub(lambda m: ENGLISH_MONTHS[MONTHS[m.group(1).lower()] - 1], text)
+
+
+def parse_iso(text: str, _fmt=None) -> Optional[datetime]:
+    if not ISO_PREFIX.match(text):
+        return None
+    return datetime.fromisoformat(text.replace('Z', '+00:00'))
+
+
+def parse_spanish(text: str, _fmt=None) -> Optional[datetime]:
+    match = SPANISH_PATTERN.search(text)
+    if not match:
+        return None
+    month = MONTHS.get(match.group(2).lower())
+    if month is None:
+        return None
+    return _build(match.group(3), month, match.group(1), match, 4)
+
+
+def parse_numeric(text: str, _fmt=None) -> Optional[datetime]:
+    match = NUMERIC_PATTERN.search(text)
+    if not match:
+        return None
+    return _build(match.group(3), int(match.group(2)), match.group(1), match, 4)
+
+
+def parse_source_format(text: str, fmt: Optional[str]) -> Optional[datetime]:
+    if not fmt:
+        return None
+    if '%b' in fmt or '%B' in fmt:
+        text = _english_months(text)
+    return datetime.strptime(text, fmt)
+
+
+def parse_dateutil(text: str, _fmt=None) -> Optional[datetime]:
+    """Solo fechas con dia y mes en el texto ("12:30" o "Hace 5 minutos" -> None)"""
+    # Sin fuzzy: inventaria fechas con cualquier numero del texto. Con dos
+    # defaults distintos, si dia o mes cambian es que salieron del default
+    text = _english_months(text)
+    year = datetime.now(LOCAL_TZ).year
+    value = date_parser.parse(text, dayfirst=True, default=datetime(year, 1, 1))
+    probe = date_parser.parse(text, dayfirst=True, default=datetime(year, 2, 2))
+    if (value.month, value.day) != (probe.month, probe.day):
+        return None
+    return value
+
+
+PATHS = {
+    PATH_SOURCE_FORMAT: parse_source_format,
+    PATH_ISO: parse_iso,
+    PATH_SPANISH: parse_spanish,
+    PATH_NUMERIC: parse_numeric,
+    PATH_DATEUTIL: parse_dateutil,
+}
+DEFAULT_ORDER = [PATH_SOURCE_FORMAT, PATH_ISO, PATH_SPANISH, PATH_NUMERIC, PATH_DATEUTIL]
+
+
+class DateParser:
+    """Parser con camino aprendido por fuente y contadores de aciertos"""
+
+    def __init__(self):
+        self.learned: Dict[str, str] = {}
+        self.stats = Counter()
+
+    def parse(self, text: Optional[str], source_id: Optional[str] = None,
+              date_format: Optional[str] = None) -> Optional[datetime]:
+        """Fecha en UTC sin tzinfo, o None si ningun camino la reconoce"""
+        if not text or not text.strip():
+            self.stats['missing'] += 1
+            return None
+        text = text.strip()
+
+        learned = self.learned.get(source_id) if source_id else None
+        order = DEFAULT_ORDER if learned is None else [learned] + [p for p in DEFAULT_ORDER if p != learned]
+        for path in order:
+            try:
+                value = PATHS[path](text, date_format)
+            except (ValueError, OverflowError, TypeError):
+                continue
+            if value is None:
+                continue
+            self.stats[path] += 1
+            if source_id and path != PATH_DATEUTIL:
+                self.learned[source_id] = path
+            return to_utc(value)
+
+        self.stats['failed'] += 1
+        return None
+
+    def hit_rates(self) -> Dict[str, float]:
+        total = sum(self.stats.values())
+        return {path: round(count / total, 3) for path, count in self.stats.items()} if total else {}
@@ -0,0 +1,202 @@
+"""
+Etapas CPU de la normalizacion: zona, severidad, fecha, campos de sismo,
+validacion y huella MinHash para casi-duplicados
+  - sin BD ni RabbitMQ: entra el evento crudo con su tipo y formato de
+    fecha ya resueltos, sale el evento validado (sin dedup_hash)
+  - ExtractionPool reparte un lote entre procesos worker y devuelve los
+    resultados en el orden de entrada; dedup_hash, guardado y acks quedan
+    en el proceso principal, que los recorre en el orden de entrega
+  - cada worker compila su propio nomenclator al arrancar
+"""
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import structlog
+from dates import DateParser
+from gazetteer import Gazetteer
+from models import NormalizedEvent
+from neardup import Fingerprint, fingerprint
+from quake import extract_quake_fields, quake_severity
+
+logger = structlog.get_logger()
+
+# El dedup_hash lo asigna el proceso principal despues de la extraccion
+PENDING_HASH = ''
+# Por debajo de este tamaño por worker el envio entre procesos no compensa
+MIN_CHUNK = 16
+
+HIGH_KEYWORDS = ['fuerte', 'intenso', 'severo', 'grave', 'critico', 'emergencia']
+MEDIUM_KEYWORDS = ['moderado', 'medio', 'considerable']
+
+# (evento validado, huella para casi-duplicados) o None si no se pudo normalizar
+Extracted = Optional[Tuple[Dict, Fingerprint]]
+
+
+class EventExtractor:
+    """Extraccion y validacion de un evento crudo, sin estado compartido"""
+
+    def __init__(self, gazetteer: Optional[Gazetteer] = None, date_parser: Optional[DateParser] = None):
+        self.gazetteer = gazetteer or Gazetteer.ecuador()
+        self.date_parser = date_parser or DateParser()
+
+    def extract_zone(self, raw_payload: Dict) -> str:
+        """Extraer zona geografica (provincia) del payload"""
+        zone = self.gazetteer.locate(
+            str(raw_payload.get('title') or ''),
+            str(raw_payload.get('content') or '')
+        )
+        return zone or 'Nacional'
+
+    def extract_severity(self, raw_payload: Dict) -> str:
+        """Extraer severidad del evento"""
+        content = str(raw_payload.get('content', '')) + str(raw_payload.get('title', ''))
+        content_lower = content.lower()
+
+        for keyword in HIGH_KEYWORDS:
+            if keyword in content_lower:
+                return 'Alta'
+
+        for keyword in MEDIUM_KEYWORDS:
+            if keyword in content_lower:
+                return 'Media'
+
+        return 'Baja'
+
+    def parse_occurred_at(self, raw_payload: Dict, source_id: Optional[str] = None,
+                          date_format: Optional[str] = None) -> datetime:
+        """Parsear fecha del evento (UTC)"""
+        date_str = raw_payload.get('date')
+
+        occurred_at = self.date_parser.parse(date_str, source_id, date_format)
+        if occurred_at:
+            return occurred_at
+        if date_str:
+            logger.warning("date_parse_failed", date_str=date_str)
+
+        # Usar fecha de scraping como fallback (ya esta en UTC)
+        scraped_at = raw_payload.get('scraped_at')
+        if scraped_at:
+            try:
+                return datetime.fromisoformat(scraped_at)
+            except ValueError:
+                pass
+
+        return datetime.utcnow()
+
+    def extract(self, raw_event: Dict, event_type: str, date_format: Optional[str] = None) -> Extracted:
+        """Evento normalizado y validado, con dedup_hash pendiente"""
+        try:
+            raw_payload = raw_event['raw_payload']
+
+            occurred_at = self.parse_occurred_at(raw_payload, str(raw_event['source_id']), date_format)
+            zone = self.extract_zone(raw_payload)
+            severity = self.extract_severity(raw_payload)
+
+            # Sismos: magnitud, profundidad y epicentro; la severidad se deriva de ellos
+            quake_fields = {}
+            if event_type == 'sismo':
+                quake_fields = extract_quake_fields(raw_payload.get('title'), raw_payload.get('content'))
+                severity = quake_severity(quake_fields.get('magnitude'),
+                                          quake_fields.get('depth_km')) or severity
+
+            # Manejar titulo vacio
+            raw_title = raw_payload.get('title', '').strip()
+            if not raw_title:
+                raw_title = f"Evento {event_type} detectado"
+            title = raw_title[:500]
+
+            description = raw_payload.get('content', '')[:1000] if raw_payload.get('content') else None
+            evidence_url = raw_payload.get('url', '')
+
+            validated_event = NormalizedEvent(
+                type=event_type,
+                occurred_at=occurred_at,
+                zone=zone,
+                severity=severity,
+                title=title,
+                description=description,
+                evidence_url=evidence_url,
+                source_id=raw_event['source_id'],
+                dedup_hash=PENDING_HASH,
+                **quake_fields
+            )
+
+            # Huella del indice de casi-duplicados (shingles, lugares y firma MinHash)
+            return validated_event.as_dict(), fingerprint(title, description, self.gazetteer.places)
+
+        except Exception as e:
+            logger.error("normalization_failed",
+                        error=str(e),
+                        error_type=type(e).__name__)
+            return None
+
+
+# Estado por proceso worker
+_extractor: Optional[EventExtractor] = None
+
+
+def _init_worker():
+    global _extractor
+    _extractor = EventExtractor()
+
+
+def _extract_chunk(items: List[Tuple]) -> Tuple[List[Extracted], Counter]:
+    """Extraer un trozo del lote; retorna tambien los contadores de fechas del trozo"""
+    results = [_extractor.extract(*item) for item in items]
+    stats, _extractor.date_parser.stats = _extractor.date_parser.stats, Counter()
+    return results, stats
+
+
+class ExtractionPool:
+    """
+    Pool de procesos para EventExtractor.extract. Con workers=0 (o lotes
+    chicos) extrae en el proceso actual con el extractor local.
+    """
+
+    def __init__(self, workers: int, extractor: EventExtractor):
+        self.workers = workers
+        self.extractor = extractor
+        self.executor = None
+        self.stats = Counter()
+
+    def start(self):
+        """Crear los workers; llamar antes de abrir conexiones (fork)"""
+        if self.workers <= 0:
+            return
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        logger.info("extraction_pool_started", workers=self.workers, cpus=os.cpu_count())
+
+    def extract(self, items: List[Tuple]) -> List[Extracted]:
+        """items: (raw_event, event_type, date_format); resultados en el mismo orden"""
+        if self.executor is None or len(items) < MIN_CHUNK:
+            self.stats['local'] += len(items)
+            return [self.extractor.extract(*item) for item in items]
+
+        chunks = min(self.workers, len(items) // MIN_CHUNK)
+
+        size = -(-len(items) // chunks)
+        try:
+            results = []
+            # map conserva el orden de los trozos
+            for chunk_results, date_stats in self.executor.map(
+                    _extract_chunk, [items[i:i + size] for i in range(0, len(items), size)]):
+                results.extend(chunk_results)
+                self.extractor.date_parser.stats.update(date_stats)
+            self.stats['pooled'] += len(items)
+            return results
+        except BrokenProcessPool as e:
+            # Un worker murio (OOM, señal): recrear el pool y extraer este lote aqui
+            logger.error("extraction_pool_broken", error=str(e))
+            self.stats['pool_restarts'] += 1
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.start()
+            self.stats['local'] += len(items)
+            return [self.extractor.extract(*item) for item in items]
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,182 @@
+"""
+Extraccion de zona con un nomenclator compilado en un automata Aho-Corasick
+  - se compila una sola vez; cada texto se recorre en una pasada
+  - comparacion sin tildes ni mayusculas (el texto plegado conserva la
+    longitud, asi las posiciones valen tambien para el texto original)
+  - solo coincidencias de palabra completa y, entre solapadas, la mas larga
+    ("Puerto Quito" gana sobre "Quito")
+  - puntaje por provincia segun nivel (provincia > canton > parroquia),
+    con mas peso en el titulo; los nombres ambiguos reparten su peso
+Usa pyahocorasick si esta instalado y si no un automata en Python puro.
+"""
+import unicodedata
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+import structlog
+from gazetteer_data import CANTONES, PALABRAS_COMUNES, PARROQUIAS
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - depende del entorno
+    ahocorasick = None
+
+logger = structlog.get_logger()
+
+LEVEL_PROVINCIA = 'provincia'
+LEVEL_CANTON = 'canton'
+LEVEL_PARROQUIA = 'parroquia'
+
+WEIGHTS = {LEVEL_PROVINCIA: 3.0, LEVEL_CANTON: 2.0, LEVEL_PARROQUIA: 1.5}
+TITLE_FACTOR = 2.0
+
+
+def _fold_table() -> Dict[int, str]:
+    """Tabla de translate: minusculas sin tildes, un caracter por caracter"""
+    table = {}
+    for code in range(0x41, 0x250):
+        char = chr(code)
+        base = ''.join(c for c in unicodedata.normalize('NFD', char) if not unicodedata.combining(c))
+        folded = base.lower()
+        if len(folded) == 1 and folded != char:
+            table[code] = folded
+    return table
+
+
+FOLD_TABLE = _fold_table()
+
+
+def fold(text: str) -> str:
+    return text.translate(FOLD_TABLE)
+
+
+class PyAutomaton:
+    """Aho-Corasick en Python puro con la misma interfaz que ahocorasick.Automaton"""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List] = [[]]
+
+    def add_word(self, key: str, value):
+        state = 0
+        for char in key:
+            nxt = self.goto[state].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(value)
+
+    def make_automaton(self):
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter(self, text: str) -> Iterable[Tuple[int, object]]:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for value in out[state]:
+                yield index, value
+
+
+class Gazetteer:
+    """Nomenclator compilado: texto -> provincia con mayor puntaje"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str, str]], weak: Iterable[str] = (),
+                 backend: Optional[str] = None):
+        """entries: (nombre, provincia, nivel)"""
+        self.weak = {fold(name) for name in weak}
+        # nombre plegado -> {provincia: nivel de mayor peso}
+        self.entries: Dict[str, Dict[str, str]] = defaultdict(dict)
+        for name, province, level in entries:
+            candidates = self.entries[fold(name)]
+            current = candidates.get(province)
+            if current is None or WEIGHTS[level] > WEIGHTS[current]:
+                candidates[province] = level
+
+        if backend is None:
+            backend = 'pyahocorasick' if ahocorasick is not None else 'python'
+        self.backend = backend
+        self.automaton = ahocorasick.Automaton() if backend == 'pyahocorasick' else PyAutomaton()
+        for key in self.entries:
+            self.automaton.add_word(key, (key, len(key)))
+        self.automaton.make_automaton()
+        logger.info("gazetteer_compiled", names=len(self.entries), backend=backend)
+
+    @classmethod
+    def ecuador(cls, backend: Optional[str] = None) -> 'Gazetteer':
+        entries = []
+        for province, cantones in CANTONES.items():
+            entries.append((province, province, LEVEL_PROVINCIA))
+            entries.extend((canton, province, LEVEL_CANTON) for canton in cantones)
+        for province, parroquias in PARROQUIAS.items():
+            entries.extend((parroquia, province, LEVEL_PARROQUIA) for parroquia in parroquias)
+        return cls(entries, weak=PALABRAS_COMUNES, backend=backend)
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Coincidencias (inicio, fin, nombre) de palabra completa, sin solapes"""
+        if not text:
+            return []
+        folded = fold(text)
+        size = len(folded)
+        matches = []
+        for end, (key, length) in self.automaton.iter(folded):
+            start = end - length + 1
+            if start > 0 and folded[start - 1].isalnum():
+                continue
+            if end + 1 < size and folded[end + 1].isalnum():
+                continue
+            if key in self.weak and not text[start].isupper():
+                continue
+            matches.append((start, end + 1, key))
+
+        # Entre coincidencias solapadas gana la de mas a la izquierda y mas larga
+        matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+        chosen = []
+        last_end = -1
+        for match in matches:
+            if match[0] >= last_end:
+                chosen.append(match)
+                last_end = match[1]
+        return chosen
+
+    def places(self, *texts: Optional[str]) -> FrozenSet[str]:
+        """Nombres de cantones y parroquias mencionados (sin provincias)"""
+        found = set()
+        for text in texts:
+            for _, _, key in self.find(text or ''):
+                if LEVEL_PROVINCIA not in self.entries[key].values():
+                    found.add(key)
+        return frozenset(found)
+
+    def scores(self, title: str, content: str) -> Dict[str, float]:
+        scores: Dict[str, float] = defaultdict(float)
+        for factor, text in ((TITLE_FACTOR, title), (1.0, content)):
+            for _, _, key in self.find(text):
+                candidates = self.entries[key]
+                share = factor / len(candidates)
+                for province, level in candidates.items():
+                    scores[province] += WEIGHTS[level] * share
+        return scores
+
+    def locate(self, title: str, content: str) -> Optional[str]:
+        """Provincia con mayor puntaje (empate: la que aparece primero)"""
+        scores = self.scores(title, content)
+        if not scores:
+            return None
+        # dict conserva el orden de aparicion: max() se queda con la primera
+        return max(scores, key=scores.get)
@@ -0,0 +1,164 @@
+"""
+Nomenclator de Ecuador: 24 provincias, sus 221 cantones y parroquias /
+localidades principales (cabeceras con nombre distinto al canton,
+parroquias urbanas y rurales conocidas)
+"""
+
+# Provincia -> cantones
+CANTONES = {
+    'Azuay': [
+        'Cuenca', 'Camilo Ponce Enríquez', 'Chordeleg', 'El Pan', 'Girón',
+        'Guachapala', 'Gualaceo', 'Nabón', 'Oña', 'Paute', 'Pucará',
+        'San Fernando', 'Santa Isabel', 'Sevilla de Oro', 'Sígsig',
+    ],
+    'Bolívar': [
+        'Guaranda', 'Caluma', 'Chillanes', 'Chimbo', 'Echeandía', 'Las Naves',
+        'San Miguel',
+    ],
+    'Cañar': [
+        'Azogues', 'Biblián', 'Cañar', 'Déleg', 'El Tambo', 'La Troncal', 'Suscal',
+    ],
+    'Carchi': [
+        'Tulcán', 'Bolívar', 'Espejo', 'Mira', 'Montúfar', 'San Pedro de Huaca',
+    ],
+    'Chimborazo': [
+        'Riobamba', 'Alausí', 'Chambo', 'Chunchi', 'Colta', 'Cumandá', 'Guamote',
+        'Guano', 'Pallatanga', 'Penipe',
+    ],
+    'Cotopaxi': [
+        'Latacunga', 'La Maná', 'Pangua', 'Pujilí', 'Salcedo', 'Saquisilí', 'Sigchos',
+    ],
+    'El Oro': [
+        'Machala', 'Arenillas', 'Atahualpa', 'Balsas', 'Chilla', 'El Guabo',
+        'Huaquillas', 'Las Lajas', 'Marcabelí', 'Pasaje', 'Piñas', 'Portovelo',
+        'Santa Rosa', 'Zaruma',
+    ],
+    'Esmeraldas': [
+        'Esmeraldas', 'Atacames', 'Eloy Alfaro', 'Muisne', 'Quinindé', 'Rioverde',
+        'San Lorenzo',
+    ],
+    'Galápagos': [
+        'San Cristóbal', 'Isabela', 'Santa Cruz',
+    ],
+    'Guayas': [
+        'Guayaquil', 'Alfredo Baquerizo Moreno', 'Balao', 'Balzar', 'Colimes',
+        'Coronel Marcelino Maridueña', 'Daule', 'Durán', 'El Empalme', 'El Triunfo',
+        'General Antonio Elizalde', 'Isidro Ayora', 'Lomas de Sargentillo', 'Milagro',
+        'Naranjal', 'Naranjito', 'Nobol', 'Palestina', 'Pedro Carbo', 'Playas',
+        'Salitre', 'Samborondón', 'Santa Lucía', 'Simón Bolívar', 'Yaguachi',
+    ],
+    'Imbabura': [
+        'Ibarra', 'Antonio Ante', 'Cotacachi', 'Otavalo', 'Pimampiro',
+        'San Miguel de Urcuquí',
+    ],
+    'Loja': [
+        'Loja', 'Calvas', 'Catamayo', 'Celica', 'Chaguarpamba', 'Espíndola',
+        'Gonzanamá', 'Macará', 'Olmedo', 'Paltas', 'Pindal', 'Puyango', 'Quilanga',
+        'Saraguro', 'Sozoranga', 'Zapotillo',
+    ],
+    'Los Ríos': [
+        'Babahoyo', 'Baba', 'Buena Fe', 'Mocache', 'Montalvo', 'Palenque',
+        'Puebloviejo', 'Quevedo', 'Quinsaloma', 'Urdaneta', 'Valencia', 'Ventanas',
+        'Vinces',
+    ],
+    'Manabí': [
+        'Portoviejo', 'Bolívar', 'Chone', 'El Carmen', 'Flavio Alfaro', 'Jama',
+        'Jaramijó', 'Jipijapa', 'Junín', 'Manta', 'Montecristi', 'Olmedo', 'Paján',
+        'Pedernales', 'Pichincha', 'Puerto López', 'Rocafuerte', 'San Vicente',
+        'Santa Ana', 'Sucre', 'Tosagua', 'Veinticuatro de Mayo',
+    ],
+    'Morona Santiago': [
+        'Morona', 'Gualaquiza', 'Huamboya', 'Limón Indanza', 'Logroño', 'Pablo Sexto',
+        'Palora', 'San Juan Bosco', 'Santiago', 'Sucúa', 'Taisha', 'Tiwintza',
+    ],
+    'Napo': [
+        'Tena', 'Archidona', 'Carlos Julio Arosemena Tola', 'El Chaco', 'Quijos',
+    ],
+    'Orellana': [
+        'Francisco de Orellana', 'Aguarico', 'La Joya de los Sachas', 'Loreto',
+    ],
+    'Pastaza': [
+        'Pastaza', 'Arajuno', 'Mera', 'Santa Clara',
+    ],
+    'Pichincha': [
+        'Quito', 'Cayambe', 'Mejía', 'Pedro Moncayo', 'Pedro Vicente Maldonado',
+        'Puerto Quito', 'Rumiñahui', 'San Miguel de los Bancos',
+    ],
+    'Santa Elena': [
+        'Santa Elena', 'La Libertad', 'Salinas',
+    ],
+    'Santo Domingo de los Tsáchilas': [
+        'Santo Domingo', 'La Concordia',
+    ],
+    'Sucumbíos': [
+        'Lago Agrio', 'Cascales', 'Cuyabeno', 'Gonzalo Pizarro', 'Putumayo',
+        'Shushufindi', 'Sucumbíos',
+    ],
+    'Tungurahua': [
+        'Ambato', 'Baños de Agua Santa', 'Cevallos', 'Mocha', 'Patate', 'Quero',
+        'San Pedro de Pelileo', 'Santiago de Píllaro', 'Tisaleo',
+    ],
+    'Zamora Chinchipe': [
+        'Zamora', 'Centinela del Cóndor', 'Chinchipe', 'El Pangui', 'Nangaritza',
+        'Palanda', 'Paquisha', 'Yacuambi', 'Yantzaza',
+    ],
+}
+
+# Provincia -> parroquias, cabeceras y localidades conocidas
+PARROQUIAS = {
+    'Azuay': ['Baños de Cuenca', 'Ricaurte', 'Turi', 'El Valle', 'Tarqui', 'Molleturo'],
+    'Bolívar': ['Salinas de Guaranda', 'Simiátug', 'San José de Chimbo'],
+    'Cañar': ['Ingapirca', 'Javier Loyola', 'Manuel J. Calle'],
+    'Carchi': ['San Gabriel', 'El Ángel', 'Huaca', 'Maldonado', 'Chical'],
+    'Chimborazo': ['Cajabamba', 'Villa La Unión', 'Licto', 'Flores', 'Sangay'],
+    'Cotopaxi': ['San Miguel de Salcedo', 'Zumbahua', 'Quilotoa', 'Mulaló', 'Lasso', 'Tanicuchí'],
+    'El Oro': ['Puerto Bolívar', 'Jambelí', 'Ponce Enríquez', 'El Cambio'],
+    'Esmeraldas': ['Tonsupa', 'Same', 'Tonchigüe', 'Valdez', 'Limones', 'Borbón', 'Mompiche'],
+    'Galápagos': [
+        'Puerto Ayora', 'Puerto Baquerizo Moreno', 'Puerto Villamil', 'Bellavista',
+        'Santa Rosa de Galápagos', 'Floreana', 'Baltra',
+    ],
+    'Guayas': [
+        'Jujan', 'Bucay', 'Posorja', 'El Morro', 'Puná', 'Tenguel', 'Pascuales',
+        'Chongón', 'Tarqui', 'Ximena', 'Febres Cordero', 'Letamendi', 'La Puntilla',
+        'Velasco Ibarra', 'Juan Gómez Rendón', 'Progreso', 'Villamil Playas',
+    ],
+    'Imbabura': ['Atuntaqui', 'Urcuquí', 'San Antonio de Ibarra', 'La Esperanza', 'Lita', 'Peguche'],
+    'Loja': ['Vilcabamba', 'Cariamanga', 'Catacocha', 'Amaluza', 'Alamor', 'Malacatos'],
+    'Los Ríos': ['San Carlos', 'Ricaurte de Urdaneta', 'Catarama', 'Patricia Pilar', 'Pimocha'],
+    'Manabí': [
+        'Bahía de Caráquez', 'Calceta', 'Canoa', 'Crucita', 'Puerto Cayo', 'Machalilla',
+        'San Jacinto', 'San Clemente', 'Charapotó', 'Tarqui', 'Los Esteros', 'Cojimíes',
+        'Ricaurte', 'Pueblo Nuevo',
+    ],
+    'Morona Santiago': ['Macas', 'General Leonidas Plaza', 'Méndez', 'Sevilla Don Bosco', 'Sangay'],
+    'Napo': ['Misahuallí', 'Puerto Misahuallí', 'Baeza', 'Papallacta', 'Cosanga', 'Ahuano'],
+    'Orellana': ['Coca', 'Puerto Francisco de Orellana', 'Nuevo Rocafuerte', 'Dayuma', 'Joya de los Sachas'],
+    'Pastaza': ['Puyo', 'Shell', 'Sarayacu', 'Canelos', 'Tarqui'],
+    'Pichincha': [
+        'Distrito Metropolitano de Quito', 'Sangolquí', 'Machachi', 'Tabacundo',
+        'Cumbayá', 'Tumbaco', 'Calderón', 'Conocoto', 'Pomasqui', 'Guayllabamba',
+        'San Antonio de Pichincha', 'Nanegalito', 'Mindo', 'Amaguaña', 'Alangasí',
+        'Pifo', 'Puembo', 'Yaruquí', 'Nayón', 'Chillogallo', 'Quitumbe', 'Carapungo',
+        'Cotocollao', 'La Mariscal', 'Iñaquito', 'El Quinche', 'Tababela', 'Lloa',
+        'Nono', 'Los Bancos', 'Aloag', 'Tambillo', 'Uyumbicho', 'Olmedo',
+    ],
+    'Santa Elena': ['Montañita', 'Ballenita', 'Anconcito', 'Manglaralto', 'Colonche', 'Chanduy', 'Olón', 'Ayangue'],
+    'Santo Domingo de los Tsáchilas': ['Alluriquín', 'Valle Hermoso', 'Luz de América', 'Puerto Limón'],
+    'Sucumbíos': ['Nueva Loja', 'El Reventador', 'Reventador', 'Tarapoa', 'Lumbaquí', 'Puerto El Carmen'],
+    'Tungurahua': ['Baños', 'Pelileo', 'Píllaro', 'Huambaló', 'Izamba', 'Picaihua', 'Cotaló'],
+    'Zamora Chinchipe': ['Zumba', 'Zumbi', 'Guayzimi', 'Cumbaratza', 'Timbara'],
+}
+
+# Nombres que tambien son palabras comunes: solo cuentan cuando
+# aparecen con mayuscula inicial en el texto original
+PALABRAS_COMUNES = {
+    'mira', 'mera', 'baba', 'mocha', 'quero', 'espejo', 'pasaje', 'playas',
+    'balsas', 'el pan', 'chilla', 'la libertad', 'el triunfo', 'salitre',
+    'el empalme', 'flores', 'progreso', 'same', 'shell', 'limones', 'valdez',
+    'ventanas', 'palenque', 'el cambio', 'la esperanza', 'el valle', 'santiago',
+    'sucre', 'bolivar', 'olmedo', 'ricaurte', 'tarqui', 'colta', 'paltas',
+    'calvas', 'palestina', 'santa ana', 'san carlos', 'bellavista', 'valencia',
+    'montalvo', 'loreto', 'pueblo nuevo', 'el carmen', 'la mana', 'huaca',
+    'maldonado', 'nono', 'coca', 'morona',
+}
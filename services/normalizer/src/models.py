@@ -1,42 +1,104 @@
 """
-Modelos Pydantic para validacion de eventos normalizados
+Evento normalizado validado
+Clase con __slots__ y validaciones escritas a mano: mismas reglas que el
+modelo Pydantic anterior (tipos, severidades, largos y rangos) sin
+construir un modelo por evento. as_dict() da el dict que se guarda y se
+publica.
 """
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field, validator
-
-
-class NormalizedEvent(BaseModel):
-    """Modelo de evento normalizado"""
-    type: str = Field(..., description="Tipo de evento: sismo, lluvia, corte")
-    occurred_at: datetime = Field(..., description="Fecha y hora del evento")
-    zone: Optional[str] = Field(None, description="Zona geografica del evento")
-    severity: Optional[str] = Field(None, description="Severidad: Baja, Media, Alta")
-    title: str = Field(..., min_length=1, max_length=500, description="Titulo del evento")
-    description: Optional[str] = Field(None, description="Descripcion detallada")
-    evidence_url: str = Field(..., description="URL de evidencia")
-    source_id: str = Field(..., description="ID de la fuente")
-    dedup_hash: str = Field(..., description="Hash para deduplicacion")
-    
-    @validator('type')
-    def validate_type(cls, v):
-        """Validar que el tipo sea valido"""
-        valid_types = ['sismo', 'lluvia', 'corte']
-        if v not in valid_types:
-            raise ValueError(f'Tipo debe ser uno de: {valid_types}')
-        return v
-    
-    @validator('severity')
-    def validate_severity(cls, v):
-        """Validar que la severidad sea valida"""
-        if v is None:
-            return v
-        valid_severities = ['Baja', 'Media', 'Alta']
-        if v not in valid_severities:
-            raise ValueError(f'Severidad debe ser uno de: {valid_severities}')
-        return v
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+from typing import Any, Dict, Optional
+
+EVENT_TYPES = ('sismo', 'lluvia', 'corte')
+SEVERITIES = ('Baja', 'Media', 'Alta')
+TITLE_MAX_LENGTH = 500
+MAGNITUDE_TYPE_MAX_LENGTH = 10
+
+# campo -> (minimo, maximo) para los numericos opcionales
+RANGES = {
+    'magnitude': (0, 10),
+    'depth_km': (0, 700),
+    'latitude': (-90, 90),
+    'longitude': (-180, 180),
+}
+
+
+class ValidationError(ValueError):
+    """Evento que no cumple el esquema"""
+
+    def __init__(self, field: str, message: str):
+        super().__init__(f"{field}: {message}")
+        self.field = field
+
+
+def _optional_str(field: str, value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    raise ValidationError(field, "debe ser texto")
+
+
+def _required_str(field: str, value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValidationError(field, "debe ser texto")
+    return value
+
+
+def _optional_number(field: str, value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValidationError(field, "debe ser numerico")
+    low, high = RANGES[field]
+    if not low <= value <= high:
+        raise ValidationError(field, f"fuera de rango [{low}, {high}]")
+    return float(value)
+
+
+class NormalizedEvent:
+    """Evento normalizado"""
+
+    __slots__ = (
+        'type', 'occurred_at', 'zone', 'severity', 'title', 'description',
+        'evidence_url', 'source_id', 'dedup_hash', 'magnitude', 'magnitude_type',
+        'depth_km', 'latitude', 'longitude',
+    )
+
+    def __init__(self, type: str, occurred_at: datetime, title: str, evidence_url: str,
+                 source_id: str, dedup_hash: str, zone: Optional[str] = None,
+                 severity: Optional[str] = None, description: Optional[str] = None,
+                 magnitude: Optional[float] = None, magnitude_type: Optional[str] = None,
+                 depth_km: Optional[float] = None, latitude: Optional[float] = None,
+                 longitude: Optional[float] = None):
+        if type not in EVENT_TYPES:
+            raise ValidationError('type', f"debe ser uno de: {list(EVENT_TYPES)}")
+        if isinstance(occurred_at, str):
+            try:
+                occurred_at = datetime.fromisoformat(occurred_at.replace('Z', '+00:00'))
+            except ValueError:
+                raise ValidationError('occurred_at', "fecha invalida") from None
+        elif not isinstance(occurred_at, datetime):
+            raise ValidationError('occurred_at', "debe ser fecha")
+        if severity is not None and severity not in SEVERITIES:
+            raise ValidationError('severity', f"debe ser uno de: {list(SEVERITIES)}")
+        if not isinstance(title, str) or not 1 <= len(title) <= TITLE_MAX_LENGTH:
+            raise ValidationError('title', f"debe tener entre 1 y {TITLE_MAX_LENGTH} caracteres")
+        magnitude_type = _optional_str('magnitude_type', magnitude_type)
+        if magnitude_type is not None and len(magnitude_type) > MAGNITUDE_TYPE_MAX_LENGTH:
+            raise ValidationError('magnitude_type', f"maximo {MAGNITUDE_TYPE_MAX_LENGTH} caracteres")
+
+        self.type = type
+        self.occurred_at = occurred_at
+        self.zone = _optional_str('zone', zone)
+        self.severity = severity
+        self.title = title
+        self.description = _optional_str('description', description)
+        self.evidence_url = _required_str('evidence_url', evidence_url)
+        self.source_id = _required_str('source_id', source_id)
+        self.dedup_hash = _required_str('dedup_hash', dedup_hash)
+        self.magnitude = _optional_number('magnitude', magnitude)
+        self.magnitude_type = magnitude_type
+        self.depth_km = _optional_number('depth_km', depth_km)
+        self.latitude = _optional_number('latitude', latitude)
+        self.longitude = _optional_number('longitude', longitude)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
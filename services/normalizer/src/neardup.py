@@ -0,0 +1,273 @@
+"""
+Deteccion de casi-duplicados entre fuentes con MinHash + LSH
+  - cada evento se representa por el conjunto de shingles (palabras y
+    bigramas) de titulo y descripcion, sin tildes ni palabras vacias
+  - la firma MinHash se divide en bandas; eventos que comparten una banda
+    (mismo tipo) son candidatos y se confirman con Jaccard exacto
+  - guardas de dominio: fechas dentro de la ventana, lugares concretos
+    en comun, magnitudes y epicentros compatibles para sismos
+  - buckets separados por franjas de tiempo del ancho de la ventana: un
+    evento solo ve candidatos de su franja y las vecinas
+  - indice en memoria con expulsion por ventana de tiempo; cada evento
+    nuevo cuesta O(bandas + candidatos), sin recorrer el historial
+"""
+import hashlib
+import math
+import re
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+import structlog
+from gazetteer import fold
+
+logger = structlog.get_logger()
+
+NUM_PERM = 32
+EPOCH = datetime(1970, 1, 1)
+TOKEN_PATTERN = re.compile(r'\d+(?:[.,]\d+)?|[a-z0-9]+')
+STOPWORDS = frozenset({
+    'a', 'al', 'con', 'de', 'del', 'el', 'en', 'es', 'la', 'las', 'lo', 'los', 'para',
+    'por', 'que', 'se', 'su', 'un', 'una', 'y', 'o', 'e', 'u', 'sus', 'le', 'les',
+})
+DESCRIPTION_CHARS = 400
+
+
+def shingles(title: str, description: Optional[str]) -> FrozenSet[str]:
+    """Palabras y bigramas de palabras del texto plegado"""
+    text = fold(f"{title or ''} {(description or '')[:DESCRIPTION_CHARS]}")
+    tokens = [token for token in TOKEN_PATTERN.findall(text) if token not in STOPWORDS]
+    grams = set(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return frozenset(grams)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _distance_km(lat1, lon1, lat2, lon2) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(h))
+
+
+class Fingerprint(NamedTuple):
+    """Lo que el indice necesita de un evento; se puede calcular en otro proceso"""
+    grams: FrozenSet[str]
+    places: FrozenSet[str]
+    signature: List[Tuple[int, int]]
+
+
+def minhash(grams: FrozenSet[str], num_perm: int = NUM_PERM) -> List[Tuple[int, int]]:
+    """
+    MinHash por una sola permutacion (one permutation hashing): cada
+    shingle se hashea una vez (crc32, igual en todos los procesos) y cae
+    en una de num_perm celdas; cada celda guarda su minimo. Las celdas
+    vacias se densifican con la siguiente celda llena a la derecha
+    (rotacion), marcada con la distancia.
+    """
+    if not grams:
+        return []
+    cells: List = [None] * num_perm
+    for gram in grams:
+        h = zlib.crc32(gram.encode())
+        cell, value = h % num_perm, h // num_perm
+        current = cells[cell]
+        if current is None or value < current:
+            cells[cell] = value
+    signature = []
+    for index in range(num_perm):
+        distance = 0
+        value = cells[index]
+        while value is None:
+            distance += 1
+            value = cells[(index + distance) % num_perm]
+        signature.append((value, distance))
+    return signature
+
+
+def fingerprint(title: Optional[str], description: Optional[str],
+                places: Optional[Callable[[str, Optional[str]], FrozenSet[str]]] = None,
+                num_perm: int = NUM_PERM) -> Fingerprint:
+    grams = shingles(title, description)
+    return Fingerprint(
+        grams,
+        places(title, description) if places is not None else frozenset(),
+        minhash(grams, num_perm)
+    )
+
+
+class _Entry:
+    __slots__ = ('dedup_hash', 'type', 'occurred_at', 'shingles', 'places', 'magnitude',
+                 'latitude', 'longitude', 'keys', 'inserted_at')
+
+
+class NearDuplicateIndex:
+    """Indice LSH en memoria con ventana de tiempo"""
+
+    def __init__(self, threshold: float = 0.6, window_sec: int = 6 * 3600,
+                 retention_sec: int = 24 * 3600, num_perm: int = NUM_PERM, bands: int = 16,
+                 magnitude_tolerance: float = 0.5, distance_km: float = 100.0,
+                 places: Optional[Callable[[str, Optional[str]], FrozenSet[str]]] = None):
+        if num_perm % bands:
+            raise ValueError("num_perm debe ser multiplo de bands")
+        self.threshold = threshold
+        self.window = timedelta(seconds=window_sec)
+        self.window_sec = window_sec
+        self.retention_sec = retention_sec
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.magnitude_tolerance = magnitude_tolerance
+        self.distance_km = distance_km
+        self.places = places
+        self.buckets: Dict[Tuple, set] = {}
+        self.entries: Dict[int, _Entry] = {}
+        self.order: deque = deque()
+        self._next_id = 0
+        self.stats = {'lookups': 0, 'candidates': 0, 'matches': 0, 'evicted': 0}
+
+    # Firma
+
+    def fingerprint(self, event: Dict) -> Fingerprint:
+        return fingerprint(event.get('title'), event.get('description'), self.places, self.num_perm)
+
+    def _keys(self, event_type: str, slot: int, signature: List[Tuple[int, int]]) -> List[Tuple]:
+        rows = self.rows
+        return [(slot, event_type, band, tuple(signature[band * rows:(band + 1) * rows]))
+                for band in range(self.bands)]
+
+    def _slot(self, occurred_at: datetime) -> int:
+        """Franja de tiempo del ancho de la ventana: los buckets se separan por franja"""
+        return int((occurred_at - EPOCH).total_seconds() // self.window_sec)
+
+    # Guardas de dominio
+
+    def _compatible(self, entry: _Entry, event: Dict, places: FrozenSet[str]) -> bool:
+        occurred_at = event['occurred_at']
+        if abs(entry.occurred_at - occurred_at) > self.window:
+            return False
+        # Lugares concretos (cantones, parroquias) disjuntos: eventos distintos
+        if entry.places and places and not (entry.places & places):
+            return False
+        magnitude = event.get('magnitude')
+        if entry.magnitude is not None and magnitude is not None:
+            if abs(entry.magnitude - magnitude) > self.magnitude_tolerance:
+                return False
+        latitude, longitude = event.get('latitude'), event.get('longitude')
+        if None not in (entry.latitude, entry.longitude, latitude, longitude):
+            if _distance_km(entry.latitude, entry.longitude, latitude, longitude) > self.distance_km:
+                return False
+        return True
+
+    # API
+
+    def find(self, event: Dict, fp: Optional[Fingerprint] = None) -> Optional[Tuple[str, float]]:
+        """(dedup_hash, similitud) del evento mas parecido, o None"""
+        self.stats['lookups'] += 1
+        if fp is None:
+            fp = self.fingerprint(event)
+        if not fp.signature:
+            return None
+
+        # Solo la franja del evento y las vecinas: cubren toda la ventana
+        slot = self._slot(event['occurred_at'])
+        candidates = set()
+        buckets = self.buckets
+        for near in (slot - 1, slot, slot + 1):
+            for key in self._keys(event['type'], near, fp.signature):
+                bucket = buckets.get(key)
+                if bucket:
+                    candidates.update(bucket)
+        self.stats['candidates'] += len(candidates)
+
+        best = None
+        for entry_id in candidates:
+            entry = self.entries[entry_id]
+            if not self._compatible(entry, event, fp.places):
+                continue
+            similarity = jaccard(fp.grams, entry.shingles)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (entry.dedup_hash, similarity)
+        if best:
+            self.stats['matches'] += 1
+        return best
+
+    def add(self, event: Dict, dedup_hash: str, fp: Optional[Fingerprint] = None):
+        if fp is None:
+            fp = self.fingerprint(event)
+        if not fp.signature:
+            return
+        entry = _Entry()
+        entry.dedup_hash = dedup_hash
+        entry.type = event['type']
+        entry.occurred_at = event['occurred_at']
+        entry.shingles = fp.grams
+        entry.places = fp.places
+        entry.magnitude = event.get('magnitude')
+        entry.latitude = event.get('latitude')
+        entry.longitude = event.get('longitude')
+        entry.keys = self._keys(event['type'], self._slot(event['occurred_at']), fp.signature)
+        entry.inserted_at = time.monotonic()
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self.entries[entry_id] = entry
+        self.order.append(entry_id)
+        for key in entry.keys:
+            self.buckets.setdefault(key, set()).add(entry_id)
+        self.evict()
+
+    def assign(self, event: Dict, new_hash: str,
+               fp: Optional[Fingerprint] = None) -> Tuple[str, Optional[float]]:
+        """
+        Dedup_hash del evento: el del cluster casi-duplicado si existe,
+        o new_hash como fundador de un cluster nuevo. La huella se puede
+        pasar ya calculada (p.ej. por un worker de extraccion).
+        """
+        if fp is None or len(fp.signature) not in (0, self.num_perm):
+            fp = self.fingerprint(event)
+        match = self.find(event, fp)
+        if match:
+            dedup_hash, similarity = match
+        else:
+            dedup_hash, similarity = new_hash, None
+        # Tambien se indexan los miembros: amplian el cluster a nuevas variantes
+        self.add(event, dedup_hash, fp)
+        return dedup_hash, similarity
+
+    def evict(self, now: Optional[float] = None):
+        """Expulsar entradas mas viejas que la retencion (orden de insercion)"""
+        now = time.monotonic() if now is None else now
+        limit = now - self.retention_sec
+        while self.order and self.entries[self.order[0]].inserted_at < limit:
+            entry_id = self.order.popleft()
+            entry = self.entries.pop(entry_id)
+            for key in entry.keys:
+                bucket = self.buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(entry_id)
+                    if not bucket:
+                        del self.buckets[key]
+            self.stats['evicted'] += 1
+
+    def warm(self, rows: List[Dict]):
+        """Cargar eventos recientes de la BD (al iniciar) sin buscar duplicados"""
+        for row in rows:
+            self.add(row, row['dedup_hash'])
+        logger.info("neardup_index_warmed", entries=len(self.entries), buckets=len(self.buckets))
+
+
+def founder_hash(event: Dict, raw_hash: Optional[str] = None) -> str:
+    """Hash determinista de un cluster nuevo (estable ante reentregas del mismo raw)"""
+    if raw_hash:
+        key = f"{event['type']}_{raw_hash}"
+    else:
+        occurred_at = event['occurred_at']
+        stamp = occurred_at.isoformat() if isinstance(occurred_at, datetime) else str(occurred_at)
+        key = f"{event['type']}_{event.get('source_id')}_{stamp}_{event.get('title')}"
+    return hashlib.sha256(key.encode()).hexdigest()
@@ -0,0 +1,122 @@
+"""
+Extraccion estructurada de datos sismicos (magnitud, profundidad, epicentro)
+desde el texto de los boletines del IGEPN, con expresiones precompiladas.
+Formatos reconocidos:
+  "magnitud 4.8 Mlv", "M4.8", "4,8 Mw"
+  "profundidad de 12 km", "12 km de profundidad"
+  "Latitud -0.18, Longitud -78.47", "0.18° S, 78.47° O"
+"""
+import re
+from typing import Dict, Optional
+
+_NUMBER = r'(\d+(?:[.,]\d+)?)'
+_SIGNED = r'([-−]?\s?\d+(?:[.,]\d+)?)'
+
+MAGNITUDE_PATTERNS = [
+    re.compile(r'magnitud(?:\s+de)?\s*(?:[:=]\s*)?' + _NUMBER + r'\s*(ml[vw]?|mw[wcr]?|mb|ms|md)?\b', re.I),
+    re.compile(r'\b' + _NUMBER + r'\s*(ml[vw]?|mw[wcr]?|mb|ms|md)\b', re.I),
+    re.compile(r'\bM\s?' + _NUMBER + r'\b()'),
+]
+DEPTH_PATTERNS = [
+    re.compile(r'profundidad(?:\s+de)?\s*(?:[:=]\s*)?(?:aprox(?:imada)?\.?\s*)?' + _NUMBER + r'\s*km', re.I),
+    re.compile(_NUMBER + r'\s*km\s+de\s+profundidad', re.I),
+]
+LATITUDE_PATTERN = re.compile(r'latitud\s*[:=]?\s*' + _SIGNED + r'\s*°?\s*([NS])?', re.I)
+LONGITUDE_PATTERN = re.compile(r'longitud\s*[:=]?\s*' + _SIGNED + r'\s*°?\s*([EOW])?', re.I)
+COORDINATES_PATTERN = re.compile(
+    _NUMBER + r'\s*°\s*([NS])\s*[,;/]?\s*' + _NUMBER + r'\s*°\s*([EOW])', re.I
+)
+
+# Rangos validos: descartan falsos positivos (p.ej. "M1" de un codigo)
+MAGNITUDE_RANGE = (0.0, 10.0)
+DEPTH_RANGE = (0.0, 700.0)
+
+
+def _to_float(value: str) -> float:
+    return float(value.replace(',', '.').replace('−', '-').replace(' ', ''))
+
+
+def _in_range(value: float, bounds) -> bool:
+    return bounds[0] <= value <= bounds[1]
+
+
+MAGNITUDE_TYPES = {'MLV': 'MLv', 'ML': 'ML', 'MLW': 'MLw', 'MW': 'Mw', 'MWW': 'Mww',
+                   'MWC': 'Mwc', 'MWR': 'Mwr', 'MB': 'mb', 'MS': 'Ms', 'MD': 'Md'}
+
+
+def _magnitude(text: str) -> Dict:
+    """Primera magnitud valida; el tipo puede venir en otra mencion del mismo valor"""
+    result: Dict = {}
+    for pattern in MAGNITUDE_PATTERNS:
+        for match in pattern.finditer(text):
+            value = _to_float(match.group(1))
+            if not _in_range(value, MAGNITUDE_RANGE):
+                continue
+            if 'magnitude' not in result:
+                result['magnitude'] = value
+            if value == result['magnitude'] and match.group(2):
+                kind = match.group(2).upper()
+                result['magnitude_type'] = MAGNITUDE_TYPES.get(kind, kind)
+                return result
+    return result
+
+
+def _depth(text: str) -> Optional[float]:
+    for pattern in DEPTH_PATTERNS:
+        for match in pattern.finditer(text):
+            value = _to_float(match.group(1))
+            if _in_range(value, DEPTH_RANGE):
+                return value
+    return None
+
+
+def _coordinates(text: str) -> Dict:
+    latitude = longitude = None
+    match = LATITUDE_PATTERN.search(text)
+    if match:
+        latitude = _to_float(match.group(1))
+        if match.group(2) and match.group(2).upper() == 'S':
+            latitude = -abs(latitude)
+    match = LONGITUDE_PATTERN.search(text)
+    if match:
+        longitude = _to_float(match.group(1))
+        if match.group(2) and match.group(2).upper() in ('O', 'W'):
+            longitude = -abs(longitude)
+
+    if latitude is None or longitude is None:
+        match = COORDINATES_PATTERN.search(text)
+        if match:
+            latitude = _to_float(match.group(1)) * (-1 if match.group(2).upper() == 'S' else 1)
+            longitude = _to_float(match.group(3)) * (-1 if match.group(4).upper() in ('O', 'W') else 1)
+
+    if latitude is None or longitude is None:
+        return {}
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return {}
+    return {'latitude': latitude, 'longitude': longitude}
+
+
+def extract_quake_fields(title: str, content: str) -> Dict:
+    """Campos sismicos presentes en el texto; el titulo tiene prioridad"""
+    text = f"{title or ''}\n{content or ''}"
+    fields = _magnitude(text)
+    depth = _depth(text)
+    if depth is not None:
+        fields['depth_km'] = depth
+    fields.update(_coordinates(text))
+    return fields
+
+
+def quake_severity(magnitude: Optional[float], depth_km: Optional[float]) -> Optional[str]:
+    """
+    Severidad numerica de un sismo: los someros (< 70 km) se sienten mas,
+    asi que suben un nivel respecto a los intermedios y profundos
+    """
+    if magnitude is None:
+        return None
+    shallow = depth_km is not None and depth_km < 70
+    if magnitude >= 6.0 or (magnitude >= 5.0 and shallow):
+        return 'Alta'
+    if magnitude >= 4.0 or (magnitude >= 3.5 and shallow):
+        return 'Media'
+    return 'Baja'
@@ -0,0 +1,110 @@
+"""
+Cache en memoria de metadatos de fuentes (type, domain, name, parser_config)
+Se carga completa al inicio con un solo SELECT y se invalida por
+LISTEN sources_changed (trigger sobre la tabla sources) o por TTL
+"""
+import time
+from collections import Counter
+from typing import Dict, Optional
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import RealDictCursor
+import structlog
+
+logger = structlog.get_logger()
+
+SOURCES_CHANNEL = 'sources_changed'
+
+
+class SourceCache:
+    """Metadatos de fuentes indexados por source_id"""
+
+    def __init__(self, dsn: str, ttl_sec: float = 300, miss_reload_sec: float = 5):
+        self.dsn = dsn
+        self.ttl_sec = ttl_sec
+        self.miss_reload_sec = miss_reload_sec
+        self.sources: Dict[str, Dict] = {}
+        self.stats = Counter()
+        self.listen_conn = None
+        self._loaded_at = 0.0
+        self._stale = True
+
+    def load(self, db_conn):
+        """Carga masiva de todas las fuentes (activas o no)"""
+        cursor = db_conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            cursor.execute("""
+                SELECT source_id, name, type, domain, parser_config
+                FROM sources
+            """)
+            rows = cursor.fetchall()
+            db_conn.commit()
+        except Exception as e:
+            db_conn.rollback()
+            logger.error("source_cache_load_failed", error=str(e))
+            return
+        finally:
+            cursor.close()
+
+        self.sources = {str(row['source_id']): dict(row) for row in rows}
+        self._loaded_at = time.monotonic()
+        self._stale = False
+        self.stats['reloads'] += 1
+        self.stats['db_queries'] += 1
+        logger.info("source_cache_loaded", sources=len(self.sources))
+
+    def get(self, db_conn, source_id: str) -> Optional[Dict]:
+        """Metadatos de la fuente; recarga si el cache venció o fue invalidado"""
+        if self._stale or time.monotonic() - self._loaded_at > self.ttl_sec:
+            self.load(db_conn)
+
+        source = self.sources.get(str(source_id))
+        if source is not None:
+            self.stats['hits'] += 1
+            return source
+
+        # Fuente nueva aún no notificada: recargar, sin martillar la BD
+        self.stats['misses'] += 1
+        if time.monotonic() - self._loaded_at > self.miss_reload_sec:
+            self.load(db_conn)
+            return self.sources.get(str(source_id))
+        return None
+
+    def invalidate(self):
+        self._stale = True
+
+    def listen(self):
+        """Abrir la conexión LISTEN; si falla queda solo el TTL"""
+        try:
+            self.listen_conn = psycopg2.connect(self.dsn)
+            self.listen_conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            cursor = self.listen_conn.cursor()
+            cursor.execute(f"LISTEN {SOURCES_CHANNEL}")
+            cursor.close()
+            logger.info("source_cache_listening", channel=SOURCES_CHANNEL)
+        except Exception as e:
+            logger.warning("source_cache_listen_failed", error=str(e))
+            self.close()
+
+    def poll(self):
+        """Revisar notificaciones pendientes sin bloquear"""
+        if self.listen_conn is None:
+            return
+        try:
+            self.listen_conn.poll()
+        except Exception as e:
+            logger.warning("source_cache_listen_lost", error=str(e))
+            self.close()
+            self.invalidate()
+            return
+        if self.listen_conn.notifies:
+            source_ids = sorted({notify.payload for notify in self.listen_conn.notifies})
+            self.listen_conn.notifies.clear()
+            logger.info("source_cache_invalidated", source_ids=source_ids)
+            self.invalidate()
+
+    def close(self):
+        if self.listen_conn is not None:
+            if not self.listen_conn.closed:
+                self.listen_conn.close()
+            self.listen_conn = None
@@ -0,0 +1,209 @@
+"""
+Benchmark del envio masivo de notificaciones de un evento
+Levanta un stub local de la Bot API de Telegram (getMe y sendMessage) con
+latencia simulada que aplica los limites reales y responde 429 con
+retry_after al excederlos:
+  - --global-rate mensajes en cualquier ventana de 1 s
+  - 1 mensaje/s por chat privado y 20/min por grupo (chat_id negativo)
+Compara:
+  - secuencial: el loop anterior (un envio a la vez + sleep de 0.1 s)
+  - concurrente: notify_subscribers con NOTIFY_CONCURRENCY envios en vuelo
+    y el SendLimiter
+El objetivo es acercarse a --global-rate mensajes/s sin recibir 429.
+
+Uso:
+    python benchmarks/bench_fanout.py --subscribers 600 --latency-ms 80 --modes secuencial,concurrente
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+import structlog  # noqa: E402
+import main  # noqa: E402
+from ratelimit import SendLimiter  # noqa: E402
+from telegram.error import TelegramError  # noqa: E402
+from telegram_client import TelegramClient  # noqa: E402
+
+TOKEN = '123456:bench'
+EVENT = {
+    'event_id': 'bench-event',
+    'type': 'sismo',
+    'severity': 'Alta',
+    'zone': 'Quito',
+    'title': 'Sismo de magnitud 5.1 en Pichincha',
+    'description': 'Reporte preliminar del Instituto Geofisico.',
+    'evidence_url': 'https://www.igepn.edu.ec/eventos/1',
+    'score': 85,
+    'status': 'CONFIRMADO',
+}
+
+
+class FloodControl:
+    """Limites de la Bot API en el stub"""
+
+    def __init__(self, global_rate):
+        self.global_rate = global_rate
+        self.sent = deque()
+        self.chats = {}
+        self.lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+
+    def admit(self, chat_id):
+        """None si se acepta, o los segundos de retry_after"""
+        now = time.monotonic()
+        with self.lock:
+            while self.sent and self.sent[0] <= now - 1.0:
+                self.sent.popleft()
+            window, limit = (60.0, 20) if chat_id.startswith('-') else (1.0, 1)
+            history = self.chats.setdefault(chat_id, deque())
+            while history and history[0] <= now - window:
+                history.popleft()
+            if len(self.sent) >= self.global_rate or len(history) >= limit:
+                self.rejected += 1
+                return 1
+            self.sent.append(now)
+            history.append(now)
+            self.accepted += 1
+            return None
+
+
+class BotApiHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    flood = None
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode()
+        if 'json' in (self.headers.get('Content-Type') or ''):
+            params = json.loads(body or '{}')
+        else:
+            params = {key: values[0] for key, values in parse_qs(body).items()}
+        method = self.path.rsplit('/', 1)[-1]
+
+        if method == 'getMe':
+            result = {'ok': True, 'result': {'id': 1, 'is_bot': True, 'first_name': 'bench',
+                                             'username': 'bench_bot'}}
+        else:
+            chat_id = str(params.get('chat_id'))
+            retry_after = self.flood.admit(chat_id)
+            if retry_after is not None:
+                self.reply(429, {'ok': False, 'error_code': 429,
+                                 'description': f"Too Many Requests: retry after {retry_after}",
+                                 'parameters': {'retry_after': retry_after}})
+                return
+            result = {'ok': True, 'result': {
+                'message_id': self.flood.accepted, 'date': int(time.time()),
+                'chat': {'id': int(chat_id), 'type': 'group' if chat_id.startswith('-') else 'private'},
+                'text': params.get('text', ''),
+            }}
+        self.reply(200, result)
+
+    def reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server(latency, global_rate):
+    BotApiHandler.latency = latency
+    BotApiHandler.flood = FloodControl(global_rate)
+    ThreadingHTTPServer.request_queue_size = 1024
+    ThreadingHTTPServer.daemon_threads = True
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BotApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def subscriptions(count, seed):
+    """Chats privados, algunos con dos suscripciones, y algunos grupos"""
+    rng = random.Random(seed)
+    subs = []
+    for i in range(count):
+        if rng.random() < 0.05:
+            chat_id = -1000000 - rng.randrange(20)
+        elif subs and rng.random() < 0.05:
+            chat_id = rng.choice(subs)['telegram_chat_id']
+        else:
+            chat_id = 10000 + i
+        subs.append({'subscription_id': f"sub-{i}", 'user_id': f"user-{i}",
+                     'telegram_chat_id': chat_id, 'username': f"user{i}"})
+    return subs
+
+
+async def sequential(client, subs):
+    """Loop anterior: un envio a la vez y sleep de 0.1 s entre envios"""
+    sent = 0
+    message = client.format_message(EVENT)
+    for sub in subs:
+        try:
+            await client.bot.send_message(chat_id=sub['telegram_chat_id'], text=message, parse_mode='HTML')
+            sent += 1
+        except TelegramError:
+            pass
+        await asyncio.sleep(0.1)
+    return sent
+
+
+async def concurrent(client, subs):
+    svc = main.NotifierService()
+    svc.telegram_client = client
+    rows = []
+    svc.get_subscriptions = lambda event: subs
+    svc.save_notifications = rows.extend
+    await svc.notify_subscribers(EVENT)
+    return sum(1 for row in rows if row[2] == 'sent')
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subscribers', type=int, default=600)
+    parser.add_argument('--latency-ms', type=float, default=80)
+    parser.add_argument('--global-rate', type=float, default=30)
+    parser.add_argument('--client-rate', type=float, default=main.TELEGRAM_GLOBAL_RATE)
+    parser.add_argument('--concurrency', type=int, default=main.NOTIFY_CONCURRENCY)
+    parser.add_argument('--modes', default='secuencial,concurrente')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(30))
+    main.NOTIFY_CONCURRENCY = args.concurrency
+
+    subs = subscriptions(args.subscribers, args.seed)
+    print(f"{len(subs)} suscriptores, Bot API stub a {args.latency_ms} ms, "
+          f"limite {args.global_rate:.0f} msg/s y 1 msg/s por chat")
+    print(f"{'modo':<12} {'segundos':>9} {'enviados':>9} {'msg/s':>7} {'429':>5} {'10k subs (min)':>15}")
+    for mode in args.modes.split(','):
+        server = start_stub_server(args.latency_ms / 1000, args.global_rate)
+        flood = BotApiHandler.flood
+        client = TelegramClient(TOKEN, base_url=f"http://127.0.0.1:{server.server_port}/bot",
+                                connection_pool_size=args.concurrency,
+                                limiter=SendLimiter(args.client_rate))
+        run = sequential if mode == 'secuencial' else concurrent
+        start = time.perf_counter()
+        sent = asyncio.run(run(client, subs))
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+        rate = sent / elapsed
+        print(f"{mode:<12} {elapsed:>9.1f} {sent:>9} {rate:>7.1f} {flood.rejected:>5} "
+              f"{10000 / rate / 60:>15.1f}")
+
+
+if __name__ == '__main__':
+    main_()
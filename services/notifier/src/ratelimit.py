@@ -0,0 +1,91 @@
+"""
+Limites de envio de la Bot API de Telegram
+  - global: ~30 mensajes/s por bot, con una cubeta de tokens
+  - por chat: ~1 mensaje/s en chats privados y ~20/min en grupos (chat_id
+    negativo), con un intervalo minimo entre mensajes al mismo chat
+  - un RetryAfter (429) vacia la cubeta por los segundos indicados: todos
+    los envios siguientes esperan, no solo el que fallo
+No usan locks: todo corre en un solo event loop y cada reserva se hace sin
+await de por medio; la espera se calcula al reservar y se duerme despues.
+"""
+import asyncio
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """Cubeta de tokens: rate por segundo con rafagas de hasta capacity"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Tomar un token; retorna los segundos a esperar antes de usarlo"""
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def pause(self, seconds: float):
+        """Nadie envia durante `seconds` (deuda de tokens equivalente)"""
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class ChatLimiter:
+    """Intervalo minimo entre mensajes al mismo chat"""
+
+    def __init__(self, private_interval: float = 1.0, group_interval: float = 3.0):
+        self.private_interval = private_interval
+        self.group_interval = group_interval
+        # chat_id -> siguiente envio permitido (monotonic)
+        self.next_at: Dict[str, float] = {}
+
+    def reserve(self, chat_id) -> float:
+        now = time.monotonic()
+        chat_id = str(chat_id)
+        interval = self.group_interval if chat_id.startswith('-') else self.private_interval
+        at = max(now, self.next_at.get(chat_id, 0.0))
+        self.next_at[chat_id] = at + interval
+        return at - now
+
+    def purge(self):
+        """Olvidar chats sin envios pendientes"""
+        now = time.monotonic()
+        for chat_id in [chat_id for chat_id, at in self.next_at.items() if at <= now]:
+            del self.next_at[chat_id]
+
+
+class SendLimiter:
+    """Limite global y por chat combinados"""
+
+    def __init__(self, global_rate: float = 30.0, private_interval: float = 1.0,
+                 group_interval: float = 3.0):
+        # Sin rafagas: a lo sumo global_rate envios en cualquier segundo
+        self.bucket = TokenBucket(global_rate, capacity=1)
+        self.chats = ChatLimiter(private_interval, group_interval)
+        self.stats = {'waits': 0, 'waited_sec': 0.0, 'retry_after': 0}
+
+    async def acquire(self, chat_id):
+        """Esperar el turno del chat y luego un token global"""
+        await self._wait(self.chats.reserve(chat_id))
+        # El token se reserva despues de la espera del chat para no gastar
+        # capacidad global en envios que todavia no salen
+        await self._wait(self.bucket.reserve())
+
+    async def _wait(self, delay: float):
+        if delay > 0:
+            self.stats['waits'] += 1
+            self.stats['waited_sec'] += delay
+            await asyncio.sleep(delay)
+
+    def retry_after(self, seconds: float):
+        """Telegram pidio esperar (429 con retry_after)"""
+        self.stats['retry_after'] += 1
+        self.bucket.pause(seconds)
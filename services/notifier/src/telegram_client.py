@@ -1,33 +1,55 @@
 """
 Cliente de Telegram para envio de notificaciones
+Los envios pasan por un SendLimiter (limite global y por chat) y un
+RetryAfter de Telegram se reintenta despues de la espera que indica.
 """
-import asyncio
 from telegram import Bot
-from telegram.error import TelegramError
+from telegram.error import RetryAfter, TelegramError
+from telegram.request import HTTPXRequest
 import structlog
+from ratelimit import SendLimiter
 
 logger = structlog.get_logger()
 
 class TelegramClient:
     """Cliente para enviar notificaciones via Telegram"""
     
-    def __init__(self, bot_token):
-        self.bot = Bot(token=bot_token)
+    def __init__(self, bot_token, base_url=None, connection_pool_size=1, limiter=None, max_retries=3):
+        # El pool de conexiones debe alcanzar para los envios concurrentes
+        request = HTTPXRequest(connection_pool_size=connection_pool_size, pool_timeout=30.0)
+        self.bot = Bot(token=bot_token, base_url=base_url or 'https://api.telegram.org/bot', request=request)
+        self.limiter = limiter or SendLimiter()
+        self.max_retries = max_retries
         
-    async def send_notification(self, chat_id, event):
+    async def send_notification(self, chat_id, event, message=None):
         """
-        Enviar notificacion de evento a un chat
+        Enviar notificacion de evento a un chat respetando los limites;
+        message permite formatear una sola vez para todos los suscriptores
         """
         try:
             # Formatear mensaje
-            message = self._format_message(event)
+            if message is None:
+                message = self.format_message(event)
             
-            # Enviar mensaje
-            await self.bot.send_message(
-                chat_id=chat_id,
-                text=message,
-                parse_mode='HTML'
-            )
+            for attempt in range(self.max_retries + 1):
+                await self.limiter.acquire(chat_id)
+                try:
+                    await self.bot.send_message(
+                        chat_id=chat_id,
+                        text=message,
+                        parse_mode='HTML'
+                    )
+                    break
+                except RetryAfter as e:
+                    if attempt == self.max_retries:
+                        raise
+                    # Flood control: pausa global y reintento
+                    retry_after = getattr(e.retry_after, 'total_seconds', lambda: e.retry_after)()
+                    self.limiter.retry_after(float(retry_after))
+                    logger.warning("telegram_retry_after",
+                                  chat_id=chat_id,
+                                  retry_after=retry_after,
+                                  attempt=attempt + 1)
             
             logger.info("telegram_notification_sent",
                        chat_id=chat_id,
@@ -44,7 +66,7 @@ class TelegramClient:
                         error=str(e))
             return False
     
-    def _format_message(self, event):
+    def format_message(self, event):
         """
         Formatear mensaje de notificacion
         """
@@ -0,0 +1,116 @@
+"""
+Benchmark del motor de descarga: fuentes/segundo antes y después
+Levanta un servidor HTTP local con latencia simulada y compara:
+  - before: scrape() bloqueante en un pool de 10 threads (como el BlockingScheduler)
+  - after:  scrape_async() sobre el AsyncFetcher compartido
+
+Uso:
+    python benchmarks/bench_fetch.py --sources 300 --delay 0.5 --hosts 30
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import structlog  # noqa: E402
+from fetcher import AsyncFetcher  # noqa: E402
+from scrapers.igepn_scraper import IGEPNScraper  # noqa: E402
+
+PAGE = (
+    "<html><body><h1>Sismo de magnitud 4.5 en Pichincha</h1>"
+    "<span class='fecha'>15 de enero de 2026, 14:32</span>"
+    "<div class='content'>Reporte preliminar del Instituto Geofisico.</div>"
+    "</body></html>"
+).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server(delay):
+    StubHandler.delay = delay
+    ThreadingHTTPServer.request_queue_size = 1024
+    ThreadingHTTPServer.daemon_threads = True
+    server = ThreadingHTTPServer(('', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_sources(count, hosts, port):
+    # 127.0.0.0/8 es loopback completo en Linux: cada IP simula un host distinto
+    return [{
+        'source_id': f'bench-{i}',
+        'name': f'bench-{i}',
+        'base_url': f'http://127.0.0.{(i % hosts) + 1}:{port}/noticias/{i}',
+        'type': 'sismo',
+        'domain': 'igepn.edu.ec',
+        'parser_config': {},
+    } for i in range(count)]
+
+
+def run_before(sources):
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        return [e for e in pool.map(lambda s: IGEPNScraper(s).scrape(), sources) if e]
+
+
+async def run_after(sources, concurrency, per_host):
+    fetcher = AsyncFetcher(max_concurrency=concurrency, per_host_limit=per_host)
+    await fetcher.start()
+    try:
+        results = await asyncio.gather(*(IGEPNScraper(s).scrape_async(fetcher) for s in sources))
+    finally:
+        await fetcher.close()
+    return [e for e in results if e]
+
+
+def report(label, count, ok, elapsed):
+    print(f"{label:<8} sources={count:<5} ok={ok:<5} "
+          f"elapsed={elapsed:7.2f}s  rate={count / elapsed:8.1f} sources/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sources', type=int, default=300)
+    parser.add_argument('--hosts', type=int, default=30)
+    parser.add_argument('--delay', type=float, default=0.5, help='latencia simulada por respuesta (s)')
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--per-host', type=int, default=4)
+    args = parser.parse_args()
+
+    # Silenciar logs por evento para no medir el renderizado JSON
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(40))
+
+    server = start_stub_server(args.delay)
+    sources = build_sources(args.sources, args.hosts, server.server_address[1])
+
+    start = time.perf_counter()
+    ok = run_before(sources)
+    report('before', len(sources), len(ok), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    ok = asyncio.run(run_after(sources, args.concurrency, args.per_host))
+    report('after', len(sources), len(ok), time.perf_counter() - start)
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark de backends de parseo sobre las fixtures HTML grabadas
+Para cada fixture y backend ejecuta el parse() completo del scraper
+correspondiente y reporta:
+  - tiempo mediano por documento (ms)
+  - pico de memoria Python (tracemalloc, KiB)
+  - crecimiento del RSS del proceso (KiB), que incluye la memoria de
+    libxml2 / lexbor que tracemalloc no ve
+
+Cada combinación corre en un subproceso propio para que el RSS no se
+contamine entre backends.
+
+Uso:
+    python benchmarks/bench_parse.py --repeat 20
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+FIXTURES = {
+    'igepn_noticias.html': 'IGEPNScraper',
+    'inamhi_alertas.html': 'InamhiScraper',
+    'cnel_cortes.html': 'CnelScraper',
+}
+BACKENDS = ['html.parser', 'lxml', 'selectolax']
+
+
+def measure(fixture, backend, repeat):
+    """Ejecutado en el subproceso: mide un par fixture/backend"""
+    import structlog
+    from scrapers import cnel_scraper, igepn_scraper, inamhi_scraper
+    from scrapers.parsing import resolve_backend
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(40))
+    if resolve_backend(backend) != backend:
+        return {'error': 'no instalado'}
+
+    classes = {
+        'IGEPNScraper': igepn_scraper.IGEPNScraper,
+        'InamhiScraper': inamhi_scraper.InamhiScraper,
+        'CnelScraper': cnel_scraper.CnelScraper,
+    }
+    with open(os.path.join(HERE, 'fixtures', fixture), 'rb') as f:
+        html = f.read()
+    scraper = classes[FIXTURES[fixture]]({
+        'source_id': 'bench',
+        'base_url': 'http://bench.local/',
+        'parser_config': {'parser': backend},
+    })
+
+    # El RSS es un máximo histórico: se mide en el primer parse.
+    # tracemalloc se mide en el segundo para no contar imports perezosos.
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    scraper.parse_all(html)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    scraper.parse_all(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scraper.parse_all(html)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        'median_ms': statistics.median(timings) * 1000,
+        'py_peak_kib': peak / 1024,
+        'rss_growth_kib': rss_after - rss_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--child', nargs=2, metavar=('FIXTURE', 'BACKEND'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child[0], args.child[1], args.repeat)))
+        return
+
+    print(f"{'fixture':<28} {'backend':<12} {'median ms':>10} {'py peak KiB':>12} {'RSS +KiB':>10}")
+    for fixture in FIXTURES:
+        size_kib = os.path.getsize(os.path.join(HERE, 'fixtures', fixture)) / 1024
+        for backend in BACKENDS:
+            out = subprocess.run(
+                [sys.executable, __file__, '--repeat', str(args.repeat), '--child', fixture, backend],
+                capture_output=True, text=True, check=True
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            label = f"{fixture} ({size_kib:.0f}K)" if backend == BACKENDS[0] else ''
+            if 'error' in result:
+                print(f"{label:<28} {backend:<12} {result['error']:>10}")
+                continue
+            print(f"{label:<28} {backend:<12} {result['median_ms']:>10.2f} "
+                  f"{result['py_peak_kib']:>12.0f} {result['rss_growth_kib']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Sincronización incremental del catálogo de fuentes
+Escucha NOTIFY sources_changed (trigger sobre la tabla sources) en una
+conexión dedicada registrada en el event loop, y calcula el diff entre
+el catálogo programado y el de la base de datos
+"""
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+import psycopg2
+import psycopg2.extensions
+import structlog
+
+logger = structlog.get_logger()
+
+SOURCES_CHANNEL = 'sources_changed'
+
+
+def diff_catalog(current: Dict[str, Dict], fresh: List[Dict]) -> Tuple[List[Dict], List[str], List[Dict]]:
+    """
+    Comparar el catálogo programado con las fuentes activas en BD.
+    Retorna (agregadas, ids eliminados, modificadas).
+    """
+    fresh_by_id = {str(source['source_id']): source for source in fresh}
+    added = [source for source_id, source in fresh_by_id.items() if source_id not in current]
+    removed = [source_id for source_id in current if source_id not in fresh_by_id]
+    changed = [
+        source for source_id, source in fresh_by_id.items()
+        if source_id in current and current[source_id] != source
+    ]
+    return added, removed, changed
+
+
+class SourceListener:
+    """LISTEN sobre sources_changed integrado en el event loop de asyncio"""
+
+    def __init__(self, dsn: str, on_change: Callable[[], None]):
+        self.dsn = dsn
+        self.on_change = on_change
+        self.conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fd: Optional[int] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.conn is not None and not self.conn.closed
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Abrir la conexión de escucha; si falla queda el sondeo periódico"""
+        self._loop = loop
+        try:
+            self.conn = psycopg2.connect(self.dsn)
+            self.conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            cursor = self.conn.cursor()
+            cursor.execute(f"LISTEN {SOURCES_CHANNEL}")
+            cursor.close()
+            self._fd = self.conn.fileno()
+            loop.add_reader(self._fd, self._on_readable)
+            logger.info("source_listener_started", channel=SOURCES_CHANNEL)
+        except Exception as e:
+            logger.warning("source_listener_failed", error=str(e))
+            self.stop()
+
+    def stop(self):
+        if self._fd is not None and self._loop:
+            self._loop.remove_reader(self._fd)
+            self._fd = None
+        if self.conn is not None:
+            if not self.conn.closed:
+                self.conn.close()
+            self.conn = None
+
+    def _on_readable(self):
+        try:
+            self.conn.poll()
+        except Exception as e:
+            logger.warning("source_listener_lost", error=str(e))
+            self.stop()
+            return
+        if not self.conn.notifies:
+            return
+        source_ids = {notify.payload for notify in self.conn.notifies}
+        self.conn.notifies.clear()
+        logger.info("sources_change_notified", source_ids=sorted(source_ids))
+        self.on_change()
@@ -0,0 +1,154 @@
+"""
+Codec de mensajes de las colas
+Formatos, negociados por content_type / content_encoding del mensaje AMQP:
+  - application/json: el dict tal cual (orjson si esta instalado, si no
+    json de la libreria estandar). Es el formato por defecto y el unico
+    que entienden los consumidores anteriores.
+  - application/x-msgpack: esquema versionado por tipo de mensaje; el
+    cuerpo es el arreglo [version, campo1, campo2, ..., extras] con los
+    campos en el orden del esquema (sin repetir nombres) y en extras las
+    claves que el esquema no conoce.
+  - content_encoding=zstd: cuerpos msgpack de ZSTD_MIN_BYTES o mas se
+    comprimen si zstandard esta instalado.
+Los consumidores decodifican cualquiera de los formatos; cada productor
+elige el suyo con MESSAGE_FORMAT, asi el cambio se despliega primero en
+consumidores y despues en productores. Las fechas viajan como texto ISO y
+los tipos desconocidos (UUID, Decimal) como texto.
+El mismo modulo esta en scraper, normalizer, verifier y notifier:
+mantenerlos iguales.
+"""
+import json
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depende del entorno
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende del entorno
+    zstandard = None
+
+CONTENT_TYPE_JSON = 'application/json'
+CONTENT_TYPE_MSGPACK = 'application/x-msgpack'
+ENCODING_ZSTD = 'zstd'
+
+FORMAT_JSON = 'json'
+FORMAT_MSGPACK = 'msgpack'
+
+ZSTD_MIN_BYTES = 512
+ZSTD_LEVEL = 3
+
+KIND_RAW_EVENT = 'raw_event'
+KIND_NORMALIZED_EVENT = 'normalized_event'
+KIND_CONFIRMED_EVENT = 'confirmed_event'
+
+_NORMALIZED_FIELDS = (
+    'event_id', 'type', 'occurred_at', 'zone', 'severity', 'title', 'description',
+    'evidence_url', 'source_id', 'dedup_hash', 'magnitude', 'magnitude_type',
+    'depth_km', 'latitude', 'longitude',
+)
+
+# (tipo, version) -> campos en orden. Una version nueva solo agrega entradas:
+# los consumidores deben conocerla antes de que un productor la use.
+SCHEMAS = {
+    (KIND_RAW_EVENT, 1): ('raw_id', 'source_id', 'source_type', 'fetched_at', 'raw_hash', 'raw_payload'),
+    (KIND_NORMALIZED_EVENT, 1): _NORMALIZED_FIELDS,
+    (KIND_CONFIRMED_EVENT, 1): _NORMALIZED_FIELDS + ('score', 'status'),
+}
+CURRENT_VERSION = {kind: max(v for k, v in SCHEMAS if k == kind) for kind, _ in SCHEMAS}
+
+
+class Encoded(NamedTuple):
+    body: bytes
+    content_type: str
+    content_encoding: Optional[str]
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(message: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(message, default=_default)
+    return json.dumps(message, default=_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def loads(body: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+# Los contextos de zstandard no se comparten entre threads
+_local = threading.local()
+
+
+def _compressor():
+    if not hasattr(_local, 'compressor'):
+        _local.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return _local.compressor
+
+
+def _decompressor():
+    if not hasattr(_local, 'decompressor'):
+        _local.decompressor = zstandard.ZstdDecompressor()
+    return _local.decompressor
+
+
+def encode(message: Dict, kind: str, fmt: str = FORMAT_JSON) -> Encoded:
+    """Cuerpo y propiedades AMQP de un mensaje en el formato pedido"""
+    if fmt == FORMAT_JSON or msgpack is None:
+        return Encoded(dumps(message), CONTENT_TYPE_JSON, None)
+    if fmt != FORMAT_MSGPACK:
+        raise ValueError(f"formato de mensaje desconocido: {fmt}")
+
+    version = CURRENT_VERSION[kind]
+    fields = SCHEMAS[(kind, version)]
+    values = [version]
+    values.extend(message.get(field) for field in fields)
+    extras = {key: value for key, value in message.items() if key not in fields}
+    values.append(extras or None)
+    body = msgpack.packb(values, default=_default, use_bin_type=True)
+
+    if zstandard is not None and len(body) >= ZSTD_MIN_BYTES:
+        return Encoded(_compressor().compress(body), CONTENT_TYPE_MSGPACK, ENCODING_ZSTD)
+    return Encoded(body, CONTENT_TYPE_MSGPACK, None)
+
+
+def decode(body: bytes, kind: str, properties=None) -> Dict:
+    """Mensaje como dict segun content_type / content_encoding (sin propiedades: JSON)"""
+    content_type = getattr(properties, 'content_type', None) or CONTENT_TYPE_JSON
+    if getattr(properties, 'content_encoding', None) == ENCODING_ZSTD:
+        if zstandard is None:
+            raise ValueError("mensaje zstd sin zstandard instalado")
+        body = _decompressor().decompress(body)
+
+    if content_type == CONTENT_TYPE_JSON:
+        return loads(body)
+    if content_type != CONTENT_TYPE_MSGPACK:
+        raise ValueError(f"content_type desconocido: {content_type}")
+    if msgpack is None:
+        raise ValueError("mensaje msgpack sin msgpack instalado")
+
+    values = msgpack.unpackb(body, raw=False)
+    version = values[0]
+    fields = SCHEMAS.get((kind, version))
+    if fields is None:
+        raise ValueError(f"esquema desconocido: {kind} v{version}")
+    message = dict(zip(fields, values[1:len(fields) + 1]))
+    extras = values[len(fields) + 1] if len(values) > len(fields) + 1 else None
+    if extras:
+        message.update(extras)
+    return message
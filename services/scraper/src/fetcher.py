@@ -0,0 +1,68 @@
+"""
+Motor de descarga asíncrono para los scrapers
+Cliente HTTP compartido con keep-alive, límite de conexiones por host
+y tope global de concurrencia
+"""
+import asyncio
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+import structlog
+
+logger = structlog.get_logger()
+
+
+class AsyncFetcher:
+    """Cliente HTTP asíncrono compartido por todos los scrapers del proceso"""
+
+    def __init__(self, max_concurrency: int = 100, per_host_limit: int = 4,
+                 timeout: float = 30.0, keepalive: int = 20):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.client: Optional[httpx.AsyncClient] = None
+        self._global_slots: Optional[asyncio.Semaphore] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def start(self):
+        """Crear el cliente HTTP (debe llamarse dentro del event loop)"""
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.keepalive
+            ),
+            follow_redirects=True
+        )
+        self._global_slots = asyncio.Semaphore(self.max_concurrency)
+        logger.info("fetcher_started",
+                   max_concurrency=self.max_concurrency,
+                   per_host_limit=self.per_host_limit)
+
+    async def close(self):
+        """Cerrar conexiones abiertas"""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    def _slots_for(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = asyncio.Semaphore(self.per_host_limit)
+            self._host_slots[host] = slots
+        return slots
+
+    async def fetch(self, url: str, headers: Optional[Dict] = None) -> httpx.Response:
+        """
+        Descargar una URL respetando el tope global y el límite por host.
+        Lanza httpx.HTTPError si la petición falla o el status es >= 400;
+        un 304 (petición condicional) se retorna sin error.
+        """
+        async with self._global_slots:
+            async with self._slots_for(url):
+                response = await self.client.get(url, headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
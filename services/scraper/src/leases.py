@@ -0,0 +1,126 @@
+"""
+Coordinación entre réplicas del scraper
+  - ReplicaRing: membresía por heartbeat en Redis y asignación de fuentes
+    por rendezvous hashing; cuando una réplica deja de latir sus fuentes
+    pasan automáticamente a las demás
+  - SourceLeases: lease por fuente con SET NX PX y token de fencing
+    monótono, para que dos réplicas nunca descarguen la misma fuente a la
+    vez y una réplica con lease vencido no pise el estado de la nueva
+"""
+import hashlib
+import time
+from typing import Dict, List, Optional
+import structlog
+
+logger = structlog.get_logger()
+
+MEMBERS_KEY = 'scraper_replicas'
+
+# SET NX PX con token de fencing asignado en la misma operación atómica
+ACQUIRE_SCRIPT = """
+local token = redis.call('INCR', KEYS[2])
+if redis.call('SET', KEYS[1], ARGV[1] .. ':' .. token, 'NX', 'PX', ARGV[2]) then
+    return token
+end
+return false
+"""
+
+# Liberar solo si el lease sigue siendo nuestro
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Escritura protegida: se rechaza si ya escribió un token más nuevo
+FENCED_HSET_SCRIPT = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'fence') or '0')
+if tonumber(ARGV[1]) < current then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'fence', ARGV[1], unpack(ARGV, 3))
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+def _weight(member: str, source_id: str) -> int:
+    digest = hashlib.blake2b(f"{member}:{source_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+class ReplicaRing:
+    """Réplicas vivas del scraper y dueño de cada fuente"""
+
+    def __init__(self, redis_client, replica_id: str, ttl_ms: int = 15000):
+        self.redis = redis_client
+        self.replica_id = replica_id
+        self.ttl_ms = ttl_ms
+        self.members: List[str] = [replica_id]
+
+    def heartbeat(self):
+        """Renovar la presencia propia y refrescar la lista de réplicas vivas"""
+        now_ms = int(time.time() * 1000)
+        try:
+            pipe = self.redis.pipeline()
+            pipe.zadd(MEMBERS_KEY, {self.replica_id: now_ms + self.ttl_ms})
+            pipe.zremrangebyscore(MEMBERS_KEY, '-inf', now_ms)
+            pipe.zrange(MEMBERS_KEY, 0, -1)
+            members = sorted(m.decode() for m in pipe.execute()[-1])
+        except Exception as e:
+            logger.warning("replica_heartbeat_failed", replica=self.replica_id, error=str(e))
+            return
+        if members != self.members:
+            logger.info("replica_membership_changed",
+                       replica=self.replica_id,
+                       replicas=members)
+            self.members = members
+
+    def leave(self):
+        try:
+            self.redis.zrem(MEMBERS_KEY, self.replica_id)
+        except Exception as e:
+            logger.warning("replica_leave_failed", replica=self.replica_id, error=str(e))
+
+    def owner_of(self, source_id: str) -> str:
+        """Rendezvous hashing: al caer una réplica solo se mueven sus fuentes"""
+        return max(self.members, key=lambda member: _weight(member, source_id))
+
+    def owns(self, source_id: str) -> bool:
+        return self.owner_of(source_id) == self.replica_id
+
+
+class SourceLeases:
+    """Leases por fuente con tokens de fencing"""
+
+    def __init__(self, redis_client, replica_id: str):
+        self.redis = redis_client
+        self.replica_id = replica_id
+        self._acquire = redis_client.register_script(ACQUIRE_SCRIPT)
+        self._release = redis_client.register_script(RELEASE_SCRIPT)
+        self._fenced_hset = redis_client.register_script(FENCED_HSET_SCRIPT)
+
+    def acquire(self, source_id: str, ttl_ms: int) -> Optional[int]:
+        """Tomar el lease de la fuente; retorna el token de fencing o None"""
+        token = self._acquire(
+            keys=[f"source_lease:{source_id}", f"source_fence:{source_id}"],
+            args=[self.replica_id, ttl_ms]
+        )
+        return int(token) if token is not None else None
+
+    def release(self, source_id: str, token: int):
+        try:
+            self._release(
+                keys=[f"source_lease:{source_id}"],
+                args=[f"{self.replica_id}:{token}"]
+            )
+        except Exception as e:
+            logger.warning("source_lease_release_failed", source_id=source_id, error=str(e))
+
+    def fenced_hset(self, key: str, token: int, mapping: Dict[str, str], ttl_ms: int) -> bool:
+        """HSET que se descarta si otra réplica ya escribió con un token mayor"""
+        args = [token, ttl_ms]
+        for field, value in mapping.items():
+            args.extend([field, value])
+        return bool(self._fenced_hset(keys=[key], args=args))
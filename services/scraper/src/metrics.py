@@ -0,0 +1,48 @@
+"""
+Contadores del proceso de scraping
+Se acumulan en memoria y se vuelcan periódicamente a un hash de Redis
+para poder consultarlos sumados entre réplicas
+"""
+import threading
+from collections import Counter
+from typing import Dict
+import structlog
+
+logger = structlog.get_logger()
+
+
+class Counters:
+    """Contadores en memoria con volcado incremental a Redis"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._totals = Counter()
+        self._pending = Counter()
+        self._lock = threading.Lock()
+
+    def incr(self, field: str, amount: int = 1):
+        with self._lock:
+            self._totals[field] += amount
+            self._pending[field] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        """Totales del proceso desde el arranque"""
+        with self._lock:
+            return dict(self._totals)
+
+    def flush(self, redis_client, key: str):
+        """Sumar al hash de Redis lo acumulado desde el último volcado"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for field, amount in pending.items():
+                pipe.hincrby(key, field, amount)
+            pipe.execute()
+        except Exception as e:
+            # Devolver lo pendiente para el siguiente volcado
+            with self._lock:
+                self._pending.update(pending)
+            logger.warning("metrics_flush_failed", metrics=self.name, error=str(e))
@@ -0,0 +1,186 @@
+"""
+Relay del outbox transaccional raw_events_outbox -> RabbitMQ
+El INSERT de raw_events y su fila de outbox se hacen en la misma
+transacción (ver ScraperService.save_raw_events). Este relay, en su propio
+thread y con su propia conexión:
+  - reclama un lote de filas pendientes con FOR UPDATE SKIP LOCKED
+    (varias réplicas drenan sin pisarse)
+  - lo publica por el AsyncPublisher y espera los publisher confirms
+  - marca sent_at solo en las filas confirmadas, en el mismo COMMIT
+La fila es la única copia durable (el publicador no guarda nada) y lo que
+no se confirma (buffer lleno, conexión perdida, nack o timeout) queda
+pendiente y se reclama en otra vuelta.
+Si el proceso cae antes del COMMIT, o un confirm llega después del
+timeout, la fila se reenvía: la entrega es al-menos-una-vez y el
+normalizer descarta los raw_id ya procesados (raw_events.normalized_at,
+marcado en la misma transacción que guarda el evento).
+"""
+import threading
+import time
+from typing import List, Optional
+import psycopg2
+import structlog
+import codec
+from metrics import Counters
+
+logger = structlog.get_logger()
+
+CLAIM_SQL = """
+    SELECT o.outbox_id, o.payload::text
+    FROM raw_events_outbox o
+    WHERE o.sent_at IS NULL
+    ORDER BY o.outbox_id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+"""
+
+MARK_SENT_SQL = """
+    UPDATE raw_events_outbox
+    SET sent_at = CURRENT_TIMESTAMP
+    WHERE outbox_id = ANY(%s)
+"""
+
+PURGE_SQL = """
+    DELETE FROM raw_events_outbox
+    WHERE sent_at < CURRENT_TIMESTAMP - make_interval(secs => %s)
+"""
+
+
+class OutboxRelay:
+    """Drena raw_events_outbox en lotes con confirmación del broker"""
+
+    def __init__(self, dsn: str, publisher, routing_key: str = 'raw_events',
+                 batch_size: int = 500, poll_interval: float = 1.0,
+                 confirm_timeout: float = 30.0, retention_sec: int = 86400,
+                 message_format: str = codec.FORMAT_JSON):
+        self.dsn = dsn
+        self.publisher = publisher
+        self.routing_key = routing_key
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.confirm_timeout = confirm_timeout
+        self.retention_sec = retention_sec
+        self.message_format = message_format
+        self.stats = Counters('outbox')
+        self.conn = None
+        self._wake = threading.Event()
+        self._stopping = False
+        self._last_purge = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='outbox-relay', daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Avisar que hay filas nuevas (tras el COMMIT del scraper)"""
+        self._wake.set()
+
+    def stop(self, timeout: float = 10.0):
+        self._stopping = True
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        if self.conn is not None and not self.conn.closed:
+            self.conn.close()
+
+    def _connect(self):
+        if self.conn is None or self.conn.closed:
+            self.conn = psycopg2.connect(self.dsn)
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                self._connect()
+                # Drenar mientras haya lotes completos pendientes
+                while not self._stopping and self.drain_once() == self.batch_size:
+                    pass
+                self._purge()
+            except Exception as e:
+                logger.error("outbox_relay_failed", error=str(e))
+                self.stats.incr('errors')
+                if self.conn is not None:
+                    try:
+                        self.conn.close()
+                    except Exception:
+                        pass
+                    self.conn = None
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def drain_once(self) -> int:
+        """Publicar un lote; retorna cuántas filas se reclamaron"""
+        if not self.publisher.ready:
+            # Broker caído: las filas esperan en la tabla
+            return 0
+
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(CLAIM_SQL, (self.batch_size,))
+            rows = cursor.fetchall()
+            if not rows:
+                self.conn.commit()
+                return 0
+
+            confirmed: List[int] = []
+            failed: List[int] = []
+            done = threading.Event()
+
+            def settle(results, outbox_id):
+                def callback():
+                    results.append(outbox_id)
+                    if len(confirmed) + len(failed) == len(rows):
+                        done.set()
+                return callback
+
+            for outbox_id, payload in rows:
+                if self.message_format == codec.FORMAT_JSON:
+                    # El texto JSON que arma Postgres se publica tal cual
+                    message = codec.Encoded(payload.encode(), codec.CONTENT_TYPE_JSON, None)
+                else:
+                    message = codec.encode(codec.loads(payload), codec.KIND_RAW_EVENT, self.message_format)
+                # La fila es la copia durable: lo que no se confirme se reclama de nuevo
+                accepted = self.publisher.publish(self.routing_key, message.body, message.content_type,
+                                                  on_confirmed=settle(confirmed, outbox_id),
+                                                  on_failed=settle(failed, outbox_id),
+                                                  content_encoding=message.content_encoding)
+                if not accepted:
+                    settle(failed, outbox_id)()
+
+            if not done.wait(self.confirm_timeout):
+                logger.warning("outbox_confirm_timeout",
+                              claimed=len(rows),
+                              confirmed=len(confirmed))
+            if failed:
+                logger.warning("outbox_publish_failed", claimed=len(rows), failed=len(failed))
+                self.stats.incr('failed', len(failed))
+
+            sent = list(confirmed)
+            if sent:
+                cursor.execute(MARK_SENT_SQL, (sent,))
+            self.conn.commit()
+            self.stats.incr('sent', len(sent))
+            self.stats.incr('batches')
+            logger.info("outbox_batch_relayed", claimed=len(rows), sent=len(sent))
+            return len(rows)
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _purge(self):
+        """Borrar filas ya enviadas fuera de la ventana de retención"""
+        now = time.monotonic()
+        if now - self._last_purge < 600:
+            return
+        self._last_purge = now
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(PURGE_SQL, (self.retention_sec,))
+            purged = cursor.rowcount
+            self.conn.commit()
+        finally:
+            cursor.close()
+        if purged:
+            logger.info("outbox_purged", rows=purged)
@@ -0,0 +1,293 @@
+"""
+Publicador asíncrono a RabbitMQ con publisher confirms
+  - buffer en memoria acotado; publish() no bloquea al llamador
+  - un thread propio con pika.SelectConnection publica en pipeline y el
+    broker confirma en lote (Basic.Ack con multiple=True)
+  - recuperación automática de conexión y canal
+  - sin copia durable propia: la durabilidad es del llamador (OutboxRelay
+    con la tabla raw_events_outbox). Si el buffer está lleno publish()
+    retorna False; lo que se pierde con la conexión o el broker rechaza se
+    descarta y se llama on_failed, y el llamador lo reintenta desde su copia
+"""
+import collections
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import pika
+import structlog
+
+logger = structlog.get_logger()
+
+
+class OutboundMessage:
+    """Mensaje pendiente de confirmación"""
+
+    __slots__ = ('routing_key', 'body', 'content_type', 'content_encoding', 'enqueued_at',
+                 'on_confirmed', 'on_failed')
+
+    def __init__(self, routing_key: str, body: bytes, content_type: str,
+                 on_confirmed: Optional[Callable[[], None]] = None,
+                 content_encoding: Optional[str] = None,
+                 on_failed: Optional[Callable[[], None]] = None):
+        self.routing_key = routing_key
+        self.body = body
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+        self.enqueued_at = time.monotonic()
+        self.on_confirmed = on_confirmed
+        self.on_failed = on_failed
+
+
+class AsyncPublisher:
+    """Publicador con confirms en lote que corre en su propio thread"""
+
+    def __init__(self, url: str, queues: List[str],
+                 buffer_size: int = 10000, max_in_flight: int = 1000,
+                 reconnect_delay: float = 5.0):
+        self.url = url
+        self.queues = queues
+        self.buffer_size = buffer_size
+        self.max_in_flight = max_in_flight
+        self.reconnect_delay = reconnect_delay
+        self.stats = collections.Counter()
+        self.latencies = collections.deque(maxlen=10000)
+
+        self._buffer: 'queue.Queue[OutboundMessage]' = queue.Queue(maxsize=buffer_size)
+        self._pending: 'collections.OrderedDict[int, OutboundMessage]' = collections.OrderedDict()
+        self._delivery_tag = 0
+        self._connection = None
+        self._channel = None
+        self._ready = False
+        self._stopping = False
+        self._drain_scheduled = False
+        self._thread: Optional[threading.Thread] = None
+        self._idle = threading.Condition()
+
+    # API pública (cualquier thread)
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='rabbitmq-publisher', daemon=True)
+        self._thread.start()
+
+    def publish(self, routing_key: str, body: bytes, content_type: str = 'application/json',
+                on_confirmed: Optional[Callable[[], None]] = None,
+                content_encoding: Optional[str] = None,
+                on_failed: Optional[Callable[[], None]] = None) -> bool:
+        """
+        Encolar un mensaje persistente; nunca bloquea al llamador.
+        Retorna False si el buffer está lleno (el broker no da abasto o no
+        está disponible). Si luego se pierde la conexión o el broker lo
+        rechaza se llama on_failed (desde el thread del publicador).
+        """
+        message = OutboundMessage(routing_key, body, content_type, on_confirmed,
+                                  content_encoding=content_encoding, on_failed=on_failed)
+        try:
+            self._buffer.put_nowait(message)
+        except queue.Full:
+            self.stats['rejected'] += 1
+            return False
+        self.stats['enqueued'] += 1
+        self._wakeup()
+        return True
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Esperar a que todo lo encolado quede confirmado"""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._buffer.qsize() or self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(min(remaining, 0.1))
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Vaciar lo posible y descartar el resto (on_failed)"""
+        self.flush(timeout)
+        self._stopping = True
+        connection = self._connection
+        if connection is not None:
+            try:
+                connection.ioloop.add_callback_threadsafe(self._close_connection)
+            except Exception:
+                pass
+        if self._thread:
+            self._thread.join(timeout)
+        self._fail_buffered()
+
+    def snapshot(self) -> Dict:
+        """Contadores y latencia de confirmación (ms)"""
+        latencies = sorted(self.latencies)
+        data = dict(self.stats)
+        data['buffered'] = self._buffer.qsize()
+        data['in_flight'] = len(self._pending)
+        if latencies:
+            data['p50_ms'] = round(latencies[len(latencies) // 2] * 1000, 2)
+            data['p99_ms'] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2)
+        return data
+
+    # Thread del publicador
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                self._connection = pika.SelectConnection(
+                    pika.URLParameters(self.url),
+                    on_open_callback=self._on_connection_open,
+                    on_open_error_callback=self._on_connection_open_error,
+                    on_close_callback=self._on_connection_closed
+                )
+                self._connection.ioloop.start()
+            except Exception as e:
+                logger.error("publisher_ioloop_failed", error=str(e))
+            self._ready = False
+            self._connection = None
+            self._channel = None
+            self._fail_pending()
+            if self._stopping:
+                break
+            # Broker no disponible: devolver lo encolado a los llamadores
+            self._fail_buffered()
+            time.sleep(self.reconnect_delay)
+
+    def _wakeup(self):
+        connection = self._connection
+        if self._ready and connection is not None and not self._drain_scheduled:
+            self._drain_scheduled = True
+            try:
+                connection.ioloop.add_callback_threadsafe(self._drain)
+            except Exception:
+                self._drain_scheduled = False
+
+    def _on_connection_open(self, connection):
+        connection.channel(on_open_callback=self._on_channel_open)
+
+    def _on_connection_open_error(self, connection, error):
+        logger.warning("publisher_connection_failed", error=repr(error))
+        connection.ioloop.stop()
+
+    def _on_connection_closed(self, connection, reason):
+        self._ready = False
+        if not self._stopping:
+            logger.warning("publisher_connection_closed", reason=str(reason))
+        connection.ioloop.stop()
+
+    def _on_channel_open(self, channel):
+        self._channel = channel
+        channel.add_on_close_callback(self._on_channel_closed)
+        self._declare(list(self.queues))
+
+    def _declare(self, remaining):
+        if not remaining:
+            self._channel.confirm_delivery(ack_nack_callback=self._on_confirmation,
+                                           callback=self._on_confirm_selected)
+            return
+        self._channel.queue_declare(queue=remaining[0], durable=True,
+                                    callback=lambda _frame: self._declare(remaining[1:]))
+
+    def _on_confirm_selected(self, _frame):
+        self._delivery_tag = 0
+        self._ready = True
+        logger.info("publisher_ready", queues=self.queues)
+        self._drain()
+
+    def _on_channel_closed(self, channel, reason):
+        # Un canal cerrado por el broker (p.ej. PRECONDITION_FAILED) se
+        # recupera cerrando la conexión y dejando que _run reconecte
+        self._ready = False
+        logger.warning("publisher_channel_closed", reason=str(reason))
+        if self._connection and self._connection.is_open:
+            self._connection.close()
+
+    def _close_connection(self):
+        if self._connection and self._connection.is_open:
+            self._connection.close()
+
+    def _next_message(self) -> Optional[OutboundMessage]:
+        try:
+            return self._buffer.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _drain(self):
+        self._drain_scheduled = False
+        while self._ready and len(self._pending) < self.max_in_flight:
+            message = self._next_message()
+            if message is None:
+                break
+            self._delivery_tag += 1
+            self._pending[self._delivery_tag] = message
+            self._channel.basic_publish(
+                exchange='',
+                routing_key=message.routing_key,
+                body=message.body,
+                properties=pika.BasicProperties(
+                    delivery_mode=2,  # Mensaje persistente
+                    content_type=message.content_type,
+                    content_encoding=message.content_encoding
+                )
+            )
+            self.stats['published'] += 1
+        self._notify_idle()
+
+    def _on_confirmation(self, frame):
+        method = frame.method
+        acked = isinstance(method, pika.spec.Basic.Ack)
+        if method.multiple:
+            tags = [tag for tag in self._pending if tag <= method.delivery_tag]
+        else:
+            tags = [method.delivery_tag] if method.delivery_tag in self._pending else []
+
+        now = time.monotonic()
+        for tag in tags:
+            message = self._pending.pop(tag)
+            if acked:
+                self.stats['confirmed'] += 1
+                self.latencies.append(now - message.enqueued_at)
+                if message.on_confirmed:
+                    try:
+                        message.on_confirmed()
+                    except Exception as e:
+                        logger.error("publisher_confirm_callback_failed", error=str(e))
+            else:
+                # Nack: el broker no aceptó el mensaje, lo reintenta el llamador
+                self.stats['nacked'] += 1
+                self._fail([message])
+        self._drain()
+
+    def _fail(self, messages: List[OutboundMessage]):
+        """Descartar mensajes no confirmados y avisar a quien los publicó"""
+        for message in messages:
+            self.stats['failed'] += 1
+            if message.on_failed:
+                try:
+                    message.on_failed()
+                except Exception as e:
+                    logger.error("publisher_fail_callback_failed", error=str(e))
+        self._notify_idle()
+
+    def _fail_pending(self):
+        """Tras perder la conexión, lo no confirmado vuelve al llamador"""
+        unconfirmed = list(self._pending.values())
+        self._pending.clear()
+        self._fail(unconfirmed)
+
+    def _fail_buffered(self):
+        messages = []
+        while True:
+            try:
+                messages.append(self._buffer.get_nowait())
+            except queue.Empty:
+                break
+        if messages:
+            logger.warning("publisher_buffer_dropped", count=len(messages))
+        self._fail(messages)
+
+    def _notify_idle(self):
+        with self._idle:
+            self._idle.notify_all()
@@ -0,0 +1,81 @@
+"""
+Política adaptativa de frecuencia de sondeo por fuente
+Acelera cuando una fuente produce raw_hash nuevos, vuelve a su frecuencia
+base cuando deja de hacerlo y retrocede exponencialmente ante errores o
+ejecuciones ociosas (304, cuerpo sin cambios, duplicados)
+"""
+from typing import Dict, Tuple
+
+# Resultado de una ejecución de scrape_source
+OUTCOME_CHANGED = 'changed'
+OUTCOME_IDLE = 'idle'
+OUTCOME_ERROR = 'error'
+
+# Decisiones que toma la política (expuestas como métricas)
+DECISION_SPEEDUP = 'speedup'
+DECISION_RELAX = 'relax'
+DECISION_STEADY = 'steady'
+DECISION_BACKOFF_IDLE = 'backoff_idle'
+DECISION_BACKOFF_ERROR = 'backoff_error'
+
+
+class AdaptivePolicy:
+    """
+    Calcula el próximo intervalo de cada fuente a partir de su frequency_sec:
+      - changed: divide el intervalo actual a la mitad (mínimo min_interval)
+      - idle: regresa hacia la frecuencia base; tras idle_grace ejecuciones
+        ociosas seguidas lo multiplica por 1.5 (máximo base * max_factor)
+      - error: base * 2^errores consecutivos (máximo base * max_factor)
+    """
+
+    def __init__(self, min_interval: float = 15, max_factor: float = 8,
+                 idle_grace: int = 3, jitter_ratio: float = 0.1):
+        self.min_interval = float(min_interval)
+        self.max_factor = max_factor
+        self.idle_grace = idle_grace
+        self.jitter_ratio = jitter_ratio
+        self._state: Dict[str, Dict] = {}
+
+    def interval_for(self, source_id: str, base_interval: float) -> float:
+        """Intervalo vigente de la fuente (la base si aún no hay historial)"""
+        state = self._state.get(source_id)
+        return state['interval'] if state else float(base_interval)
+
+    def jitter_for(self, interval: float) -> int:
+        """Segundos máximos de jitter para que las fuentes no coincidan"""
+        return max(1, int(interval * self.jitter_ratio))
+
+    def forget(self, source_id: str):
+        self._state.pop(source_id, None)
+
+    def record(self, source_id: str, base_interval: float, outcome: str) -> Tuple[float, str]:
+        """Registrar el resultado de una ejecución y retornar (intervalo, decisión)"""
+        base = float(base_interval)
+        ceiling = base * self.max_factor
+        state = self._state.setdefault(source_id, {'interval': base, 'idle': 0, 'errors': 0})
+        interval = state['interval']
+
+        if outcome == OUTCOME_CHANGED:
+            state['idle'] = 0
+            state['errors'] = 0
+            interval = max(self.min_interval, min(interval, base) / 2)
+            decision = DECISION_SPEEDUP
+        elif outcome == OUTCOME_ERROR:
+            state['idle'] = 0
+            state['errors'] += 1
+            interval = min(ceiling, base * 2 ** state['errors'])
+            decision = DECISION_BACKOFF_ERROR
+        else:
+            state['errors'] = 0
+            state['idle'] += 1
+            if interval < base:
+                interval = min(base, interval * 2)
+                decision = DECISION_RELAX
+            elif state['idle'] > self.idle_grace and interval < ceiling:
+                interval = min(ceiling, interval * 1.5)
+                decision = DECISION_BACKOFF_IDLE
+            else:
+                decision = DECISION_STEADY
+
+        state['interval'] = interval
+        return interval, decision
@@ -0,0 +1,161 @@
+"""
+Clase base de los scrapers
+Separa la descarga (síncrona o mediante el AsyncFetcher compartido)
+del parseo del HTML, que cada scraper implementa en parse()
+
+Contrato común: parse() es un generador de eventos crudos
+{source_id, fetched_at, raw_payload, raw_hash} construidos con make_event().
+scrape_stream() entrega esos eventos en lotes a medida que se parsean (el
+servicio persiste cada lote sin esperar al resto de la página);
+scrape() y scrape_async() retornan la lista completa (vacía si no hay datos).
+"""
+import asyncio
+import hashlib
+from datetime import datetime
+from itertools import islice
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+import requests
+import httpx
+import structlog
+from scrapers.parsing import DEFAULT_BACKEND, parse_html
+
+logger = structlog.get_logger()
+
+# Resultado de la última descarga asíncrona (BaseScraper.fetch_outcome)
+FETCH_MODIFIED = 'modified'
+FETCH_NOT_MODIFIED = 'not_modified'
+FETCH_UNCHANGED = 'unchanged'
+FETCH_FAILED = 'failed'
+
+# Eventos por lote de scrape_stream()
+STREAM_CHUNK_SIZE = 100
+
+
+class BaseScraper:
+    """Contrato común: descarga de base_url y parseo del contenido"""
+
+    name = 'base'
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
+    }
+
+    def __init__(self, source_config: Dict):
+        self.source_id = source_config['source_id']
+        self.base_url = source_config['base_url']
+        self.parser_config = source_config.get('parser_config') or {}
+        self.domain = source_config.get('domain', '')
+        self.parser_backend = self.parser_config.get('parser', DEFAULT_BACKEND)
+        self.max_items = int(self.parser_config.get('max_items', 5))
+        self.fetch_outcome = None
+        self.validators = {}
+
+    def document(self, html: bytes):
+        """Árbol del documento con el backend configurado para la fuente"""
+        return parse_html(html, self.parser_backend)
+
+    def hash_key(self, raw_payload: Dict) -> str:
+        """Campos que identifican un evento crudo dentro de la fuente"""
+        return f"{raw_payload['title']}_{raw_payload['date']}_{raw_payload['url']}"
+
+    def make_event(self, raw_payload: Dict) -> Dict:
+        """Envolver un payload con source_id, fetched_at y raw_hash"""
+        raw_payload.setdefault('domain', self.domain)
+        return {
+            'source_id': self.source_id,
+            'fetched_at': datetime.utcnow().isoformat(),
+            'raw_payload': raw_payload,
+            'raw_hash': hashlib.sha256(self.hash_key(raw_payload).encode()).hexdigest()
+        }
+
+    def parse(self, html: bytes) -> Iterator[Dict]:
+        """Generar los eventos crudos contenidos en el HTML descargado"""
+        raise NotImplementedError
+
+    def parse_all(self, html: bytes) -> List[Dict]:
+        """Consumir el generador de parse() (para ejecutarlo fuera del loop)"""
+        return list(self.parse(html))
+
+    @staticmethod
+    def take(events: Iterator[Dict], size: int) -> List[Dict]:
+        """Siguientes `size` eventos del generador (lista vacía al terminar)"""
+        return list(islice(events, size))
+
+    def scrape(self) -> List[Dict]:
+        """Descarga bloqueante con requests (uso puntual y scripts)"""
+        try:
+            logger.info("scraping_started", source=self.name, url=self.base_url)
+            response = requests.get(self.base_url, headers=self.headers, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.error("scraping_request_failed",
+                        source=self.name,
+                        error=str(e),
+                        error_type=type(e).__name__)
+            return []
+        return self.parse_all(response.content)
+
+    def conditional_headers(self, validators: Dict) -> Dict:
+        """Headers de la petición con If-None-Match / If-Modified-Since"""
+        headers = dict(self.headers)
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    async def scrape_async(self, fetcher, validators: Optional[Dict] = None) -> List[Dict]:
+        """Como scrape_stream(), pero retorna todos los eventos juntos"""
+        events = []
+        async for chunk in self.scrape_stream(fetcher, validators):
+            events.extend(chunk)
+        return events
+
+    async def scrape_stream(self, fetcher, validators: Optional[Dict] = None,
+                            chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[List[Dict]]:
+        """
+        Descarga condicional mediante el AsyncFetcher compartido.
+        Si el servidor responde 304 o el cuerpo tiene el mismo hash que la
+        última vez, no se parsea ni se entrega nada; el motivo queda
+        en fetch_outcome y los validadores nuevos en self.validators.
+        El generador de parse() avanza en el thread pool del loop, un lote
+        de chunk_size eventos a la vez, para no bloquear las demás descargas.
+        """
+        validators = validators or {}
+        self.validators = validators
+        try:
+            logger.info("scraping_started", source=self.name, url=self.base_url)
+            response = await fetcher.fetch(self.base_url, headers=self.conditional_headers(validators))
+        except httpx.HTTPError as e:
+            self.fetch_outcome = FETCH_FAILED
+            logger.error("scraping_request_failed",
+                        source=self.name,
+                        error=str(e),
+                        error_type=type(e).__name__)
+            return
+
+        if response.status_code == 304:
+            self.fetch_outcome = FETCH_NOT_MODIFIED
+            logger.info("scraping_not_modified", source=self.name, url=self.base_url)
+            return
+
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        self.validators = {
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+            'body_hash': body_hash
+        }
+        if body_hash == validators.get('body_hash'):
+            self.fetch_outcome = FETCH_UNCHANGED
+            logger.info("scraping_body_unchanged", source=self.name, hash=body_hash[:8])
+            return
+
+        self.fetch_outcome = FETCH_MODIFIED
+        loop = asyncio.get_running_loop()
+        events = self.parse(response.content)
+        while True:
+            chunk = await loop.run_in_executor(None, self.take, events, chunk_size)
+            if not chunk:
+                return
+            yield chunk
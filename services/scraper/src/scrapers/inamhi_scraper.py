@@ -2,86 +2,79 @@
 Scraper para INAMHI - Instituto Nacional de Meteorologia e Hidrologia
 Extrae alertas meteorologicas y datos de precipitacion
 """
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import structlog
+from scrapers.base import BaseScraper
 
 logger = structlog.get_logger()
 
-class InamhiScraper:
+class InamhiScraper(BaseScraper):
     """Scraper para alertas meteorologicas de INAMHI"""
     
-    def __init__(self, source_url):
-        self.source_url = source_url
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+    name = 'INAMHI'
     
-    def scrape(self):
+    def hash_key(self, raw_payload):
+        # Varios avisos comparten URL y pueden no tener fecha
+        return f"{raw_payload['title']}_{raw_payload['date']}_{raw_payload['url']}_{raw_payload['content']}"
+    
+    def parse(self, html):
         """
-        Scrape de alertas meteorologicas
+        Genera un evento crudo por cada alerta meteorologica
         """
         try:
-            logger.info("inamhi_scraping_started", url=self.source_url)
-            
-            response = requests.get(self.source_url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            doc = self.document(html)
             
             # Buscar alertas meteorologicas
             # Nota: La estructura real del sitio puede variar
             # Este es un ejemplo de como extraer datos
             
-            events = []
+            found = 0
             
             # Buscar secciones de alertas
-            alert_sections = soup.find_all(['div', 'article'], class_=['alert', 'aviso', 'noticia'])
+            alert_sections = doc.select('div.alert, div.aviso, div.noticia, article.alert, article.aviso, article.noticia')
             
             if not alert_sections:
                 # Si no hay estructura especifica, buscar en el contenido general
-                content = soup.get_text()
+                content = doc.text()
                 
                 # Detectar palabras clave de alertas
                 keywords = ['lluvia', 'precipitacion', 'tormenta', 'alerta', 'aviso']
                 if any(keyword in content.lower() for keyword in keywords):
                     # Crear evento generico
-                    event = {
+                    payload = {
                         'title': 'Alerta meteorologica detectada',
                         'content': content[:500],  # Primeros 500 caracteres
-                        'url': self.source_url,
-                        'date': datetime.utcnow().isoformat(),
+                        'url': self.base_url,
+                        # Sin fecha propia: una fecha de scraping cambiaria el raw_hash
+                        # en cada ejecucion; el normalizer usa scraped_at como fallback
+                        'date': None,
                         'scraped_at': datetime.utcnow().isoformat()
                     }
-                    events.append(event)
+                    yield self.make_event(payload)
+                    found += 1
             else:
                 # Procesar cada alerta encontrada
-                for section in alert_sections[:5]:  # Maximo 5 alertas
-                    title_tag = section.find(['h1', 'h2', 'h3', 'h4'])
-                    title = title_tag.get_text(strip=True) if title_tag else 'Alerta meteorologica'
+                for section in alert_sections[:self.max_items]:  # Maximo max_items alertas
+                    title_tag = section.select_one('h1, h2, h3, h4')
+                    title = title_tag.text(strip=True) if title_tag else 'Alerta meteorologica'
                     
-                    content = section.get_text(strip=True)
+                    content = section.text(strip=True)
                     
                     # Buscar fecha
-                    date_tag = section.find(['time', 'span'], class_=['date', 'fecha'])
-                    date = date_tag.get_text(strip=True) if date_tag else None
+                    date_tag = section.select_one('time.date, time.fecha, span.date, span.fecha')
+                    date = date_tag.text(strip=True) if date_tag else None
                     
-                    event = {
+                    payload = {
                         'title': title,
                         'content': content[:500],
-                        'url': self.source_url,
+                        'url': self.base_url,
                         'date': date,
                         'scraped_at': datetime.utcnow().isoformat()
                     }
-                    events.append(event)
+                    yield self.make_event(payload)
+                    found += 1
             
-            logger.info("inamhi_scraping_completed", events_found=len(events))
-            return events
+            logger.info("inamhi_scraping_completed", events_found=found)
             
-        except requests.RequestException as e:
-            logger.error("inamhi_scraping_failed", error=str(e))
-            return []
         except Exception as e:
             logger.error("inamhi_unexpected_error", error=str(e))
-            return []
@@ -0,0 +1,166 @@
+"""
+Backends de parseo HTML intercambiables
+Todos exponen la misma interfaz mínima basada en selectores CSS
+(select / select_one / text / html), con la semántica que usan los
+scrapers sobre BeautifulSoup: text(strip=True) equivale a
+get_text(strip=True) y los resultados respetan el orden del documento.
+
+El backend se elige por fuente con parser_config['parser']:
+  - 'html.parser' (por defecto): BeautifulSoup, Python puro
+  - 'lxml': lxml.html + cssselect (libxml2)
+  - 'selectolax': selectolax sobre lexbor
+"""
+from functools import lru_cache
+from typing import List, Optional
+import structlog
+
+logger = structlog.get_logger()
+
+DEFAULT_BACKEND = 'html.parser'
+
+# BeautifulSoup.get_text() omite el contenido de estos elementos
+NON_TEXT_TAGS = ('script', 'style', 'template')
+
+
+class Node:
+    """Interfaz común a los nodos de todos los backends"""
+
+    def select(self, css: str) -> List['Node']:
+        raise NotImplementedError
+
+    def select_one(self, css: str) -> Optional['Node']:
+        found = self.select(css)
+        return found[0] if found else None
+
+    def text(self, strip: bool = False) -> str:
+        raise NotImplementedError
+
+    def html(self) -> str:
+        raise NotImplementedError
+
+
+class SoupNode(Node):
+    """BeautifulSoup con html.parser"""
+
+    def __init__(self, tag):
+        self._tag = tag
+
+    def select(self, css):
+        return [SoupNode(tag) for tag in self._tag.select(css)]
+
+    def select_one(self, css):
+        tag = self._tag.select_one(css)
+        return SoupNode(tag) if tag is not None else None
+
+    def text(self, strip=False):
+        return self._tag.get_text(strip=strip)
+
+    def html(self):
+        return str(self._tag)
+
+
+@lru_cache(maxsize=256)
+def _lxml_selector(css: str):
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(css)
+
+
+@lru_cache(maxsize=1)
+def _lxml_text_nodes():
+    from lxml import etree
+    excluded = ' or '.join(f'parent::{tag}' for tag in NON_TEXT_TAGS)
+    return etree.XPath(f'.//text()[not({excluded})]')
+
+
+class LxmlNode(Node):
+    """lxml.html con selectores cssselect compilados y cacheados"""
+
+    def __init__(self, element):
+        self._element = element
+
+    def select(self, css):
+        return [LxmlNode(el) for el in _lxml_selector(css)(self._element)]
+
+    def text(self, strip=False):
+        parts = _lxml_text_nodes()(self._element)
+        if strip:
+            return ''.join(part.strip() for part in parts)
+        return ''.join(parts)
+
+    def html(self):
+        from lxml import html as lxml_html
+        return lxml_html.tostring(self._element, encoding='unicode', with_tail=False)
+
+
+class LexborNode(Node):
+    """selectolax sobre el motor lexbor"""
+
+    def __init__(self, node):
+        self._node = node
+
+    def select(self, css):
+        return [LexborNode(node) for node in self._node.css(css)]
+
+    def select_one(self, css):
+        node = self._node.css_first(css)
+        return LexborNode(node) if node is not None else None
+
+    def text(self, strip=False):
+        if self._node.css_first(', '.join(NON_TEXT_TAGS)) is None:
+            return self._node.text(strip=strip)
+        parts = [
+            node.text_content or ''
+            for node in self._node.traverse(include_text=True)
+            if node.tag == '-text' and node.parent.tag not in NON_TEXT_TAGS
+        ]
+        if strip:
+            return ''.join(part.strip() for part in parts)
+        return ''.join(parts)
+
+    def html(self):
+        return self._node.html or ''
+
+
+def _parse_soup(html: bytes) -> Node:
+    from bs4 import BeautifulSoup
+    return SoupNode(BeautifulSoup(html, 'html.parser'))
+
+
+def _parse_lxml(html: bytes) -> Node:
+    from lxml import html as lxml_html
+    return LxmlNode(lxml_html.document_fromstring(html))
+
+
+def _parse_lexbor(html: bytes) -> Node:
+    from selectolax.lexbor import LexborHTMLParser
+    return LexborNode(LexborHTMLParser(html).root)
+
+
+BACKENDS = {
+    'html.parser': _parse_soup,
+    'lxml': _parse_lxml,
+    'selectolax': _parse_lexbor,
+}
+
+
+@lru_cache(maxsize=None)
+def resolve_backend(name: Optional[str]) -> str:
+    """Validar el backend pedido; si no existe o no está instalado se usa el por defecto"""
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        logger.warning("parser_backend_unknown", backend=name, fallback=DEFAULT_BACKEND)
+        return DEFAULT_BACKEND
+    try:
+        BACKENDS[name](b'<html></html>')
+    except ImportError as e:
+        logger.warning("parser_backend_unavailable",
+                      backend=name,
+                      fallback=DEFAULT_BACKEND,
+                      error=str(e))
+        return DEFAULT_BACKEND
+    return name
+
+
+def parse_html(html: bytes, backend: str = DEFAULT_BACKEND) -> Node:
+    """Construir el árbol del documento con el backend indicado"""
+    return BACKENDS[resolve_backend(backend)](html)
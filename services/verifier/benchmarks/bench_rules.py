@@ -0,0 +1,165 @@
+"""
+Benchmark de evaluacion de reglas del verifier
+Eventos sinteticos con la mezcla de fuentes del scraper (dominios oficiales
+y no oficiales, fechas recientes y viejas, campos incompletos). La BD y la
+red son simuladas con latencia fija:
+  - R5 (corroboracion): --db-ms por consulta
+  - R2 (URL accesible): cache con --hit-rate aciertos; los fallos tardan
+    --net-ms
+Compara el plan completo (todas las reglas, como antes) contra el plan con
+corte temprano y verifica que el status sea el mismo para cada evento, que
+todo score distinto este marcado como parcial y que complete() de el exacto.
+
+Uso:
+    python benchmarks/bench_rules.py --events 2000 --db-ms 1 --net-ms 40 --hit-rate 0.8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+import structlog  # noqa: E402
+from rules import DEFAULT_RULES, VerificationRules  # noqa: E402
+
+DOMAINS = ['www.igepn.edu.ec', 'www.gestionderiesgos.gob.ec', 'www.inamhi.gob.ec',
+           'www.eluniverso.com', 'www.primicias.ec', 'twitter.com']
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+
+    def execute(self, query, params=None):
+        self.db.queries += 1
+        time.sleep(self.db.latency)
+        self.params = params
+
+    def fetchone(self):
+        # Un tercio de los eventos con reportes de otra fuente en la ventana
+        return (2 if zlib.crc32(repr(self.params).encode()) % 3 == 0 else 1,)
+
+    def fetchall(self):
+        return list(DEFAULT_RULES)
+
+    def close(self):
+        pass
+
+
+class FakeDB:
+    def __init__(self, latency):
+        self.latency = latency
+        self.queries = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeUrlChecker:
+    """Aciertos de cache inmediatos; los fallos esperan net_ms"""
+
+    def __init__(self, latency, hit_rate):
+        self.latency = latency
+        self.hit_rate = hit_rate
+        self.checks = 0
+
+    def prefetch(self, url):
+        pass
+
+    def check(self, url, wait):
+        self.checks += 1
+        # Acierto o fallo fijo por URL: ambos planes ven lo mismo
+        if zlib.crc32(url.encode()) % 1000 >= self.hit_rate * 1000:
+            time.sleep(min(self.latency, max(wait, 0)))
+            if self.latency > wait:
+                return None
+        return 'caida' not in url
+
+
+def generate(size, seed):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    events = []
+    for i in range(size):
+        domain = rng.choice(DOMAINS)
+        events.append({
+            'event_id': str(i),
+            'type': rng.choice(['sismo', 'lluvia', 'corte']),
+            'occurred_at': (now - timedelta(hours=rng.choice([1, 5, 20, 30, 72]))).isoformat(),
+            'zone': rng.choice(['Quito', 'Guayaquil', None]),
+            'severity': rng.choice(['Baja', 'Media', 'Alta', None]),
+            'title': f"Evento {i}",
+            'description': rng.choice(['detalle', None]),
+            'evidence_url': f"https://{domain}/{'caida' if rng.random() < 0.1 else 'ok'}/{i}",
+            'dedup_hash': f"{i:064x}",
+        })
+    return events
+
+
+def run(events, args, early_stop):
+    db = FakeDB(args.db_ms / 1000)
+    checker = FakeUrlChecker(args.net_ms / 1000, args.hit_rate)
+    rules = VerificationRules(db, checker, time_budget_sec=args.budget_ms / 1000)
+    rules.load()
+    rules.early_stop = early_stop
+    db.queries = 0
+    start = time.perf_counter()
+    scorings = []
+    evaluations = []
+    for event in events:
+        scorings.append(rules.begin(event))
+        evaluations.append(rules.finish(scorings[-1]))
+    elapsed = time.perf_counter() - start
+    queries, checks, stats = db.queries, checker.checks, dict(rules.stats)
+    # Score exacto de los que se cortaron (lo que guarda el reprogramador)
+    exact = [rules.complete([scoring])[0].score for scoring in scorings]
+    return evaluations, exact, elapsed, queries, checks, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--db-ms', type=float, default=1.0)
+    parser.add_argument('--net-ms', type=float, default=40.0)
+    parser.add_argument('--hit-rate', type=float, default=0.8)
+    parser.add_argument('--budget-ms', type=float, default=500.0)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(30))
+
+    events = generate(args.events, args.seed)
+    print(f"{len(events)} eventos, BD {args.db_ms} ms, red {args.net_ms} ms con {args.hit_rate:.0%} en cache")
+    print(f"{'plan':<14} {'us/evento':>10} {'consultas BD':>13} {'sondas URL':>11} {'corte temprano':>15}")
+    results = {}
+    for name, early_stop in (('completo', False), ('corte temprano', True)):
+        evaluations, exact, elapsed, queries, checks, stats = run(events, args, early_stop)
+        results[name] = evaluations, exact
+        print(f"{name:<14} {elapsed / len(events) * 1e6:>10.0f} {queries / len(events):>13.2f} "
+              f"{checks / len(events):>11.2f} {stats['settled_early'] / len(events):>15.0%}")
+
+    full, _ = results['completo']
+    early, exact = results['corte temprano']
+    status = VerificationRules.determine_status
+    rules = VerificationRules(None, None)
+    mismatches = sum(status(rules, a.score) != status(rules, b.score) for a, b in zip(full, early))
+    partial = sum(a.score != b.score for a, b in zip(full, early))
+    unflagged = sum(a.score != b.score and not b.settled_early for a, b in zip(full, early))
+    completed = sum(a.score != score for a, score in zip(full, exact))
+    print(f"status distintos entre planes: {mismatches}")
+    print(f"scores parciales (cota inferior): {partial}, sin marcar: {unflagged}, "
+          f"distintos tras complete(): {completed}")
+
+
+if __name__ == '__main__':
+    main()
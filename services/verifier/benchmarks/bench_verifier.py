@@ -0,0 +1,241 @@
+"""
+Benchmark de throughput del verifier con un flujo sintetico de eventos
+normalizados (codificados como los publica el normalizer).
+BD, broker y red simulados con latencia fija:
+  - BD: --db-rtt-ms por sentencia y --commit-ms por commit
+  - broker: --publish-us por publish y por ack
+  - R2: --miss-rate de URLs fuera de cache; cada sonda tarda --net-ms y
+    las sondas lanzadas a la vez corren en paralelo (como en UrlChecker)
+Compara el camino anterior (un mensaje a la vez: UPDATE + commit + ack por
+mensaje, con las mismas reglas, corroboracion tardia y score completo de
+los CONFIRMADO) contra process_batch con distintos tamanos de lote.
+
+Uso:
+    python benchmarks/bench_verifier.py --events 2000 --batch-sizes 1,20,100
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+import structlog  # noqa: E402
+import codec  # noqa: E402
+import main  # noqa: E402
+from corroboration import CorroborationIndex  # noqa: E402
+from rules import VerificationRules  # noqa: E402
+
+ZONES = ['Quito', 'Guayaquil', 'Cuenca', 'Ambato', 'Loja', 'Manta', 'Esmeraldas', 'Ibarra']
+DOMAINS = ['www.igepn.edu.ec', 'www.gestionderiesgos.gob.ec', 'www.inamhi.gob.ec',
+           'www.eluniverso.com', 'www.primicias.ec']
+SOURCES = [str(uuid.uuid5(uuid.NAMESPACE_URL, domain)) for domain in DOMAINS]
+
+
+class Properties:
+    def __init__(self, content_type, content_encoding):
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.connection = db
+        self.pending = []
+        self.rows = []
+
+    def mogrify(self, template, args):
+        self.pending.append((args[0], args[2]))
+        return b'(...)'
+
+    def execute(self, query, params=None):
+        time.sleep(self.db.rtt)
+        self.db.statements += 1
+        if params is not None:
+            # COUNT de R5 para eventos fuera de la retencion, o UPDATE de una fila
+            self.rows = [(1,)] if 'COUNT' in query else [self.db.update(params[0], params[2])]
+        else:
+            self.rows = [self.db.update(event_id, status) for event_id, status in self.pending]
+            self.pending = []
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class FakeDB:
+    encoding = 'UTF8'
+
+    def __init__(self, rtt, commit):
+        self.rtt = rtt
+        self.commit_latency = commit
+        self.statements = 0
+        self.commits = 0
+        # event_id -> status guardado
+        self.statuses = {}
+
+    def update(self, event_id, status):
+        """Fila que retorna el UPDATE: (event_id, status anterior)"""
+        previous = self.statuses.get(event_id, 'NO_VERIFICADO')
+        self.statuses[event_id] = status
+        return event_id, previous
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        time.sleep(self.commit_latency)
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class FakeChannel:
+    def __init__(self, latency):
+        self.latency = latency
+        self.published = 0
+        self.acks = 0
+
+    def basic_publish(self, **kwargs):
+        time.sleep(self.latency)
+        self.published += 1
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        time.sleep(self.latency)
+        self.acks += 1
+
+    def basic_nack(self, delivery_tag, requeue=False):
+        self.acks += 1
+
+
+class FakeUrlChecker:
+    """Sondas concurrentes: cada una termina net_ms despues de lanzarse"""
+
+    def __init__(self, latency, miss_rate):
+        self.latency = latency
+        self.miss_rate = miss_rate
+        self.started = {}
+        self.urls = {}
+        self.stats = {}
+
+    def _miss(self, url):
+        return zlib.crc32(url.encode()) % 1000 < self.miss_rate * 1000
+
+    def prefetch(self, url):
+        if self._miss(url):
+            self.started.setdefault(url, time.monotonic())
+
+    def check(self, url, wait):
+        if self._miss(url):
+            done = self.started.setdefault(url, time.monotonic()) + self.latency
+            delay = done - time.monotonic()
+            if delay > wait:
+                time.sleep(max(wait, 0))
+                return None
+            if delay > 0:
+                time.sleep(delay)
+        return True
+
+    def purge(self):
+        pass
+
+
+def stream(size, seed):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    items = []
+    for i in range(size):
+        domain = rng.randrange(len(DOMAINS))
+        event = {
+            'event_id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'type': rng.choice(['sismo', 'lluvia', 'corte']),
+            'occurred_at': (now - timedelta(minutes=rng.randrange(0, 36 * 60))).isoformat(),
+            'zone': rng.choice(ZONES),
+            'severity': rng.choice(['Baja', 'Media', 'Alta']),
+            'title': f"Evento {i}",
+            'description': 'detalle del evento',
+            'evidence_url': f"https://{DOMAINS[domain]}/eventos/{i}",
+            'source_id': SOURCES[domain],
+            'dedup_hash': f"{i:064x}",
+        }
+        message = codec.encode(event, codec.KIND_NORMALIZED_EVENT, codec.FORMAT_JSON)
+        items.append((i + 1, Properties(message.content_type, message.content_encoding), message.body))
+    return items
+
+
+def service(args):
+    svc = main.VerifierService()
+    svc.db_conn = FakeDB(args.db_rtt_ms / 1000, args.commit_ms / 1000)
+    svc.channel = FakeChannel(args.publish_us / 1e6)
+    svc.url_checker = FakeUrlChecker(args.net_ms / 1000, args.miss_rate)
+    svc.corroboration = CorroborationIndex()
+    svc.rules = VerificationRules(svc.db_conn, svc.url_checker, time_budget_sec=args.budget_ms / 1000,
+                                  corroboration=svc.corroboration)
+    return svc
+
+
+def per_message(svc, items):
+    """
+    Camino anterior: un mensaje a la vez (UPDATE + commit, publicacion y
+    ack por mensaje) con las mismas reglas que process_batch
+    """
+    for delivery_tag, properties, body in items:
+        event = codec.decode(body, codec.KIND_NORMALIZED_EVENT, properties)
+        svc.verify_batch([event])
+        svc.channel.basic_ack(delivery_tag=delivery_tag)
+
+
+def batched(size):
+    def run(svc, items):
+        for start in range(0, len(items), size):
+            svc.process_batch(items[start:start + size])
+    return run
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--batch-sizes', default='1,20,100')
+    parser.add_argument('--db-rtt-ms', type=float, default=0.3)
+    parser.add_argument('--commit-ms', type=float, default=1.0)
+    parser.add_argument('--publish-us', type=float, default=50)
+    parser.add_argument('--net-ms', type=float, default=60)
+    parser.add_argument('--miss-rate', type=float, default=0.1)
+    parser.add_argument('--budget-ms', type=float, default=500)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(30))
+
+    items = stream(args.events, args.seed)
+    modes = [('por mensaje', per_message)]
+    modes += [(f"lote {size}", batched(size)) for size in map(int, args.batch_sizes.split(','))]
+
+    print(f"{len(items)} eventos; BD {args.db_rtt_ms} ms/sentencia + {args.commit_ms} ms/commit, "
+          f"{args.miss_rate:.0%} URLs sin cache a {args.net_ms} ms")
+    print(f"{'modo':<12} {'eventos/s':>10} {'sentencias':>11} {'commits':>8} {'acks':>6} {'publicados':>11}")
+    baseline = None
+    for name, run in modes:
+        svc = service(args)
+        start = time.perf_counter()
+        run(svc, items)
+        elapsed = time.perf_counter() - start
+        rate = len(items) / elapsed
+        baseline = baseline or rate
+        print(f"{name:<12} {rate:>10.0f} {svc.db_conn.statements:>11} {svc.db_conn.commits:>8} "
+              f"{svc.channel.acks:>6} {svc.channel.published:>11}  x{rate / baseline:.1f}")
+
+
+if __name__ == '__main__':
+    main_()
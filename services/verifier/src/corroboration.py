@@ -0,0 +1,178 @@
+"""
+Indice de corroboracion entre fuentes para la regla R5
+Ventana deslizante en memoria de los eventos recientes, agrupados por
+(tipo, zona) y ordenados por occurred_at: los reportes de otras fuentes
+dentro de +-window_sec se encuentran con bisect en O(log n + k).
+  - eventos sin zona pero con epicentro (sismos) se agrupan por tipo y se
+    comparan por distancia (distance_km)
+  - el mismo event_id puede llegar de varias fuentes (el normalizer une
+    los casi-duplicados en una fila): cada fuente cuenta
+  - add() retorna los eventos anteriores que quedan corroborados por el
+    nuevo, para reevaluarlos
+  - lo que queda fuera de la retencion se consulta en BD con el indice
+    idx_events_type_zone_occurred_at
+"""
+import math
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+import structlog
+
+logger = structlog.get_logger()
+
+
+def timestamp(value) -> Optional[float]:
+    """occurred_at (texto ISO o datetime) en segundos; sin zona se toma UTC"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _distance_km(lat1, lon1, lat2, lon2) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(h))
+
+
+class _Entry(NamedTuple):
+    at: float
+    source_id: str
+    event_id: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+
+class CorroborationIndex:
+    """Reportes recientes por (tipo, zona) ordenados por tiempo"""
+
+    def __init__(self, window_sec: int = 2 * 3600, retention_sec: int = 24 * 3600,
+                 distance_km: float = 100.0):
+        self.window_sec = window_sec
+        self.retention_sec = retention_sec
+        self.distance_km = distance_km
+        # (tipo, zona) -> tiempos ordenados y entradas en el mismo orden
+        self._times: Dict[Tuple, List[float]] = {}
+        self._entries: Dict[Tuple, List[_Entry]] = {}
+        # event_id -> ultimo evento visto (para reevaluarlo)
+        self.events: Dict[str, Dict] = {}
+        self.corroborated: Set[str] = set()
+        self.stats = {'lookups': 0, 'db_lookups': 0, 'rescored': 0}
+
+    def _key(self, event: Dict) -> Optional[Tuple]:
+        if event.get('zone'):
+            return (event.get('type'), event['zone'])
+        if event.get('latitude') is not None and event.get('longitude') is not None:
+            return (event.get('type'), None)
+        return None
+
+    def covers(self, event: Dict, now: Optional[float] = None) -> bool:
+        """True si la ventana del evento esta dentro de la retencion en memoria"""
+        at = timestamp(event.get('occurred_at'))
+        if at is None or self._key(event) is None:
+            return True
+        now = datetime.now(timezone.utc).timestamp() if now is None else now
+        return at - self.window_sec >= now - self.retention_sec
+
+    def _window(self, key: Tuple, at: float) -> List[_Entry]:
+        times = self._times.get(key)
+        if not times:
+            return []
+        low = bisect_left(times, at - self.window_sec)
+        high = bisect_right(times, at + self.window_sec)
+        return self._entries[key][low:high]
+
+    def _near(self, key: Tuple, entry: _Entry, other: _Entry) -> bool:
+        if key[1] is not None:
+            return True
+        return _distance_km(entry.latitude, entry.longitude, other.latitude, other.longitude) <= self.distance_km
+
+    def _matches(self, key: Tuple, entry: _Entry) -> List[_Entry]:
+        return [other for other in self._window(key, entry.at) if self._near(key, entry, other)]
+
+    def _entry(self, event: Dict) -> Optional[_Entry]:
+        at = timestamp(event.get('occurred_at'))
+        if at is None or not event.get('source_id'):
+            return None
+        return _Entry(at, str(event['source_id']), str(event.get('event_id')),
+                      event.get('latitude'), event.get('longitude'))
+
+    def sources(self, event: Dict) -> Set[str]:
+        """Fuentes distintas que reportan el evento (incluida la suya)"""
+        self.stats['lookups'] += 1
+        key = self._key(event)
+        entry = self._entry(event)
+        if key is None or entry is None:
+            return {str(event['source_id'])} if event.get('source_id') else set()
+        found = {other.source_id for other in self._matches(key, entry)}
+        found.add(entry.source_id)
+        if len(found) >= 2:
+            self.corroborated.add(entry.event_id)
+        return found
+
+    def add(self, event: Dict) -> List[Dict]:
+        """
+        Registrar un reporte. Retorna los eventos anteriores de otras fuentes
+        que con este quedan corroborados por primera vez.
+        """
+        key = self._key(event)
+        entry = self._entry(event)
+        if key is None or entry is None:
+            return []
+        self.events[entry.event_id] = event
+
+        matches = self._matches(key, entry)
+        if any(other == entry for other in matches):
+            return []
+        times = self._times.setdefault(key, [])
+        entries = self._entries.setdefault(key, [])
+        position = bisect_right(times, entry.at)
+        times.insert(position, entry.at)
+        entries.insert(position, entry)
+
+        newly = []
+        for other in matches:
+            if other.source_id == entry.source_id or other.event_id == entry.event_id:
+                continue
+            if other.event_id in self.corroborated or other.event_id not in self.events:
+                continue
+            self.corroborated.add(other.event_id)
+            newly.append(self.events[other.event_id])
+        self.stats['rescored'] += len(newly)
+        return newly
+
+    def evict(self, now: Optional[float] = None):
+        """Quitar reportes fuera de la retencion"""
+        now = datetime.now(timezone.utc).timestamp() if now is None else now
+        cutoff = now - self.retention_sec
+        for key in list(self._times):
+            times = self._times[key]
+            position = bisect_left(times, cutoff)
+            if not position:
+                continue
+            for entry in self._entries[key][:position]:
+                self.events.pop(entry.event_id, None)
+                self.corroborated.discard(entry.event_id)
+            del times[:position]
+            del self._entries[key][:position]
+            if not times:
+                del self._times[key]
+                del self._entries[key]
+
+    def warm(self, rows: List[Dict]):
+        """Cargar eventos recientes de BD al arrancar"""
+        # Lo cargado ya tiene score: solo se marca lo que ya esta corroborado
+        for row in rows:
+            self.add(row)
+            self.sources(row)
+        self.stats.update(lookups=0, rescored=0)
+        logger.info("corroboration_index_warmed", events=len(self.events), groups=len(self._times))
+
+    def __len__(self) -> int:
+        return sum(len(times) for times in self._times.values())
@@ -0,0 +1,89 @@
+"""
+Reputacion de dominios para la regla R1
+  - el host se toma de la URL ya parseada (sin usuario, puerto ni punto
+    final): "https://igepn.edu.ec@evil.com/" es evil.com
+  - un host es de confianza si el o alguno de sus dominios padre esta en
+    el conjunto: igepn.edu.ec y www.igepn.edu.ec si,
+    evilcnel.gob.ec.attacker.com no
+  - cada entrada de la lista blanca debe ser un dominio registrable
+    (eTLD+1): un sufijo publico como gob.ec se rechaza al compilar
+Los sufijos publicos son un subconjunto de la Public Suffix List con lo que
+aparece en las fuentes (segundo nivel de .ec y los genericos); un TLD que
+no esta se toma como sufijo de un solo nivel.
+"""
+from typing import FrozenSet, Iterable, Optional
+from urllib.parse import urlsplit
+import structlog
+
+logger = structlog.get_logger()
+
+PUBLIC_SUFFIXES = frozenset({
+    # Ecuador
+    'ec', 'com.ec', 'info.ec', 'net.ec', 'fin.ec', 'k12.ec', 'med.ec', 'pro.ec',
+    'org.ec', 'edu.ec', 'gob.ec', 'gov.ec', 'mil.ec', 'base.ec', 'official.ec',
+    # Genericos y de la region
+    'com', 'net', 'org', 'info', 'gov', 'edu', 'int', 'io', 'co', 'news',
+    'com.co', 'gov.co', 'com.pe', 'gob.pe', 'com.ar', 'gob.ar', 'com.mx', 'gob.mx',
+    'co.uk', 'org.uk', 'gov.uk',
+})
+
+
+def hostname(url: str) -> Optional[str]:
+    """Host en minusculas de una URL http(s), o None"""
+    try:
+        parts = urlsplit(url.strip())
+        host = parts.hostname
+    except ValueError:
+        return None
+    if parts.scheme not in ('http', 'https') or not host:
+        return None
+    return host.rstrip('.')
+
+
+def public_suffix(host: str) -> str:
+    """Sufijo publico mas largo del host"""
+    labels = host.split('.')
+    for i in range(len(labels)):
+        candidate = '.'.join(labels[i:])
+        if candidate in PUBLIC_SUFFIXES:
+            return candidate
+    return labels[-1]
+
+
+def registrable_domain(host: str) -> Optional[str]:
+    """eTLD+1 del host (None si el host es un sufijo publico)"""
+    suffix = public_suffix(host)
+    if host == suffix:
+        return None
+    rest = host[:-len(suffix) - 1]
+    return f"{rest.rsplit('.', 1)[-1]}.{suffix}"
+
+
+class DomainReputation:
+    """Lista blanca compilada en un conjunto de dominios registrables"""
+
+    def __init__(self, trusted: Iterable[str]):
+        self.trusted = self.compile(trusted)
+
+    @staticmethod
+    def compile(trusted: Iterable[str]) -> FrozenSet[str]:
+        domains = set()
+        for entry in trusted:
+            entry = entry.strip().lower().rstrip('.')
+            if registrable_domain(entry) is None:
+                logger.warning("trusted_domain_rejected", domain=entry, reason="public_suffix")
+                continue
+            domains.add(entry)
+        return frozenset(domains)
+
+    def is_trusted(self, url: str) -> bool:
+        """True si el host de la URL es un dominio de confianza o un subdominio suyo"""
+        host = hostname(url or '')
+        if host is None:
+            return False
+        # Recorrer el host y sus padres: O(etiquetas) busquedas en el conjunto
+        labels = host.split('.')
+        for i in range(len(labels) - 1):
+            if '.'.join(labels[i:]) in self.trusted:
+                return True
+        return False
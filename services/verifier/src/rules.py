@@ -1,15 +1,111 @@
 """
 Reglas de verificacion para calculo de score de confianza
+Las reglas y sus pesos vienen de la tabla verification_rules (name,
+weight, enabled) y se compilan en un plan de evaluacion:
+  - las reglas deshabilitadas o desconocidas no entran al plan
+  - primero las de CPU, despues las de BD y al final las de red; la sonda
+    de red se lanza antes de las de BD para que corra mientras tanto
+  - despues de cada regla, si los puntos que faltan ya no pueden cambiar
+    la banda de status, la evaluacion se detiene; el score queda como cota
+    inferior hasta que complete() evalua las reglas saltadas
+Cada regla retorna la fraccion de su peso que obtiene (0..1) o None si no
+se supo dentro del presupuesto de tiempo; las desconocidas suman 0 y se
+reevaluan despues. El plan se recarga en caliente con NOTIFY
+verification_rules_changed (RulesListener) y con una recarga periodica.
+Las reglas que dependen de la hora (R3) declaran cuando cambia su
+resultado; next_rescore() da esa fecha para el reprogramador del verifier.
 """
-import requests
+import time
+import unicodedata
 from datetime import datetime, timedelta
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+import psycopg2
+import psycopg2.extensions
 import structlog
+from domains import DomainReputation
 
 logger = structlog.get_logger()
 
+RULES_CHANNEL = 'verification_rules_changed'
+
+# R3: ventana en que un evento cuenta como reciente
+RECENT_WINDOW = timedelta(hours=24)
+
+# Costo de cada regla: define el orden del plan
+COST_CPU = 0
+COST_DB = 1
+COST_NET = 2
+
+
+class RuleSpec(NamedTuple):
+    """Implementacion de una regla: clave de logs, metodo y costo"""
+    key: str
+    method: str
+    cost: int
+    # Metodo que lanza el trabajo de red sin esperar (solo COST_NET)
+    start: Optional[str] = None
+    # Metodo que da la fecha en que el resultado cambia (reglas por hora)
+    boundary: Optional[str] = None
+
+
+class Step(NamedTuple):
+    key: str
+    weight: int
+    fn: Callable
+    start: Optional[Callable]
+    boundary: Optional[Callable]
+
+
+class Plan(NamedTuple):
+    """Reglas habilitadas agrupadas por costo, en orden de evaluacion"""
+    cpu: Tuple[Step, ...]
+    db: Tuple[Step, ...]
+    net: Tuple[Step, ...]
+    max_score: int
+
+
+class Evaluation(NamedTuple):
+    """
+    Score de un evento. points tiene las reglas evaluadas (None si no hubo
+    resultado a tiempo); unknown las desconocidas que aun podrian cambiar
+    el status; settled_early indica que el plan se detuvo antes del final
+    y el score es una cota inferior (complete() da el exacto).
+    """
+    score: int
+    points: Dict[str, Optional[int]]
+    unknown: Tuple[str, ...]
+    settled_early: bool
+
+
+def _normalize_name(name: str) -> str:
+    """Nombre de regla sin tildes ni mayusculas, para buscarlo en el catalogo"""
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).strip().lower()
+
+
+# Nombre en verification_rules -> implementacion
+RULE_CATALOG = {
+    'dominio en lista blanca': RuleSpec('R1_trusted_domain', 'rule_trusted_domain', COST_CPU),
+    'evidencia url valida': RuleSpec('R2_valid_url', 'rule_valid_url', COST_NET, 'start_valid_url'),
+    'timestamp reciente': RuleSpec('R3_recent_timestamp', 'rule_recent_timestamp', COST_CPU,
+                                   boundary='recent_until'),
+    'campos completos': RuleSpec('R4_complete_fields', 'rule_complete_fields', COST_CPU),
+    'corroboracion cruzada': RuleSpec('R5_cross_validation', 'rule_cross_validation', COST_DB),
+}
+
+# Pesos de init.sql: se usan si la tabla no se puede leer o esta vacia
+DEFAULT_RULES = (
+    ('Dominio en lista blanca', 40, True),
+    ('Evidencia URL valida', 15, True),
+    ('Timestamp reciente', 15, True),
+    ('Campos completos', 10, True),
+    ('Corroboracion cruzada', 20, True),
+)
+
+
 class VerificationRules:
-    """Conjunto de reglas para verificar eventos"""
-    
+    """Motor de reglas para verificar eventos"""
+
     # Dominios en lista blanca (fuentes oficiales)
     TRUSTED_DOMAINS = [
         'igepn.edu.ec',
@@ -19,29 +115,98 @@ class VerificationRules:
         'epmaps.gob.ec',
         'bomberos.gob.ec'
     ]
-    
-    def __init__(self, db_conn):
+
+    def __init__(self, db_conn, url_checker, time_budget_sec: float = 0.5,
+                 confirmed_min: int = 70, review_min: int = 40, corroboration=None):
         self.db_conn = db_conn
+        self.url_checker = url_checker
+        self.corroboration = corroboration
+        self.reputation = DomainReputation(self.TRUSTED_DOMAINS)
+        self.time_budget_sec = time_budget_sec
+        self.confirmed_min = confirmed_min
+        self.review_min = review_min
+        self.early_stop = True
+        self.plan = self.compile(DEFAULT_RULES)
+        self.stats = {'evaluations': 0, 'settled_early': 0, 'rules_skipped': 0, 'completed': 0}
+    
+    def compile(self, definitions) -> Plan:
+        """Plan de evaluacion a partir de filas (name, weight, enabled)"""
+        steps = []
+        for name, weight, enabled in definitions:
+            spec = RULE_CATALOG.get(_normalize_name(name))
+            if spec is None:
+                logger.warning("rule_definition_unknown", name=name)
+                continue
+            if not enabled or weight <= 0:
+                continue
+            start = getattr(self, spec.start) if spec.start else None
+            boundary = getattr(self, spec.boundary) if spec.boundary else None
+            cost = spec.cost
+            if spec.key == 'R5_cross_validation' and self.corroboration is not None:
+                # Con el indice en memoria R5 no va a BD salvo eventos viejos
+                cost = COST_CPU
+            steps.append((cost, Step(spec.key, weight, getattr(self, spec.method), start, boundary)))
+        
+        # Dentro de cada costo, primero las de mas peso: deciden la banda antes
+        steps.sort(key=lambda item: (item[0], -item[1].weight))
+        by_cost = {cost: tuple(step for c, step in steps if c == cost) for cost in (COST_CPU, COST_DB, COST_NET)}
+        return Plan(by_cost[COST_CPU], by_cost[COST_DB], by_cost[COST_NET],
+                    sum(step.weight for _, step in steps))
+    
+    @staticmethod
+    def signature(plan: Plan):
+        return tuple((step.key, step.weight) for step in plan.cpu + plan.db + plan.net)
+    
+    def load(self) -> bool:
+        """Recargar el plan desde verification_rules; True si cambiaron reglas o pesos"""
+        cursor = self.db_conn.cursor()
+        try:
+            cursor.execute("SELECT name, weight, enabled FROM verification_rules ORDER BY name")
+            rows = cursor.fetchall()
+            self.db_conn.commit()
+        except Exception as e:
+            self.db_conn.rollback()
+            logger.error("rules_load_failed", error=str(e))
+            return False
+        finally:
+            cursor.close()
+        
+        if not rows:
+            logger.warning("rules_table_empty", fallback="defaults")
+            rows = DEFAULT_RULES
+        previous = self.signature(self.plan)
+        self.plan = self.compile(rows)
+        changed = self.signature(self.plan) != previous
+        logger.info("rules_loaded",
+                   changed=changed,
+                   rules=[(step.key, step.weight) for step in self.plan.cpu + self.plan.db + self.plan.net],
+                   max_score=self.plan.max_score)
+        return changed
     
     def rule_trusted_domain(self, event):
         """
-        R1: Dominio en lista blanca
-        Puntos: +40
+        R1: Dominio en lista blanca (el host o un dominio padre, ver domains)
+        Fraccion: 1
         """
         evidence_url = event.get('evidence_url', '')
         
-        for domain in self.TRUSTED_DOMAINS:
-            if domain in evidence_url:
-                logger.info("rule_passed", rule="R1_trusted_domain", points=40)
-                return 40
+        if self.reputation.is_trusted(evidence_url):
+            logger.info("rule_passed", rule="R1_trusted_domain")
+            return 1
         
-        logger.info("rule_failed", rule="R1_trusted_domain", points=0)
+        logger.info("rule_failed", rule="R1_trusted_domain")
         return 0
     
-    def rule_valid_url(self, event):
+    def start_valid_url(self, event):
+        """Lanzar la sonda de R2 sin esperar"""
+        evidence_url = event.get('evidence_url')
+        if evidence_url:
+            self.url_checker.prefetch(evidence_url)
+    
+    def rule_valid_url(self, event, wait=None):
         """
-        R2: URL valida y accesible
-        Puntos: +15
+        R2: URL valida y accesible (HEAD con cache en UrlChecker)
+        Fraccion: 1; None si no se supo dentro de `wait` segundos
         """
         evidence_url = event.get('evidence_url', '')
         
@@ -49,22 +214,31 @@ class VerificationRules:
             logger.info("rule_failed", rule="R2_valid_url", reason="no_url")
             return 0
         
+        reachable = self.url_checker.check(evidence_url, self.time_budget_sec if wait is None else wait)
+        if reachable is None:
+            logger.info("rule_unknown", rule="R2_valid_url", reason="time_budget")
+            return None
+        if reachable:
+            logger.info("rule_passed", rule="R2_valid_url")
+            return 1
+        logger.info("rule_failed", rule="R2_valid_url")
+        return 0
+    
+    def recent_until(self, event):
+        """Fecha (UTC sin tzinfo) en que R3 deja de dar puntos"""
+        occurred_at = event.get('occurred_at')
+        if not occurred_at:
+            return None
         try:
-            response = requests.head(evidence_url, timeout=5, allow_redirects=True)
-            if response.status_code < 400:
-                logger.info("rule_passed", rule="R2_valid_url", points=15, status=response.status_code)
-                return 15
-            else:
-                logger.info("rule_failed", rule="R2_valid_url", status=response.status_code)
-                return 0
-        except Exception as e:
-            logger.warning("rule_failed", rule="R2_valid_url", error=str(e))
-            return 0
+            occurred_at = datetime.fromisoformat(str(occurred_at).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        return occurred_at.replace(tzinfo=None) + RECENT_WINDOW
     
     def rule_recent_timestamp(self, event):
         """
         R3: Timestamp reciente (ultimas 24 horas)
-        Puntos: +15
+        Fraccion: 1
         """
         occurred_at_str = event.get('occurred_at')
         
@@ -77,9 +251,9 @@ class VerificationRules:
             now = datetime.utcnow()
             age = now - occurred_at.replace(tzinfo=None)
             
-            if age <= timedelta(hours=24):
-                logger.info("rule_passed", rule="R3_recent_timestamp", points=15, age_hours=age.total_seconds()/3600)
-                return 15
+            if age <= RECENT_WINDOW:
+                logger.info("rule_passed", rule="R3_recent_timestamp", age_hours=age.total_seconds()/3600)
+                return 1
             else:
                 logger.info("rule_failed", rule="R3_recent_timestamp", age_hours=age.total_seconds()/3600)
                 return 0
@@ -90,84 +264,284 @@ class VerificationRules:
     def rule_complete_fields(self, event):
         """
         R4: Campos completos
-        Puntos: +10
+        Fraccion: 0.7 por los requeridos + 0.3 por la descripcion
         """
         required_fields = ['type', 'zone', 'severity', 'title', 'evidence_url']
-        optional_fields = ['description']
         
-        score = 0
+        fraction = 0
         
         # Verificar campos requeridos
         all_required = all(event.get(field) for field in required_fields)
         if all_required:
-            score += 7
+            fraction += 0.7
         
         # Verificar campos opcionales
         if event.get('description'):
-            score += 3
+            fraction += 0.3
         
-        logger.info("rule_evaluated", rule="R4_complete_fields", points=score)
-        return score
+        logger.info("rule_evaluated", rule="R4_complete_fields", fraction=fraction)
+        return fraction
     
-    def rule_cross_validation(self, event):
+    def count_sources_db(self, event):
         """
-        R5: Corroboracion cruzada (mismo evento de multiples fuentes)
-        Puntos: +20
+        Fuentes distintas con reportes del mismo tipo y zona dentro de la
+        ventana (idx_events_type_zone_occurred_at)
         """
-        dedup_hash = event.get('dedup_hash')
-        
-        if not dedup_hash:
-            return 0
+        occurred_at = event.get('occurred_at')
+        if not event.get('zone') or not occurred_at:
+            return 1
+        occurred_at = datetime.fromisoformat(str(occurred_at).replace('Z', '+00:00')).replace(tzinfo=None)
+        window = timedelta(seconds=self.corroboration.window_sec if self.corroboration else 2 * 3600)
         
+        cursor = self.db_conn.cursor()
         try:
-            cursor = self.db_conn.cursor()
             cursor.execute("""
                 SELECT COUNT(DISTINCT source_id) as source_count
                 FROM events
-                WHERE dedup_hash = %s
-            """, (dedup_hash,))
-            
+                WHERE type = %s
+                  AND zone = %s
+                  AND occurred_at BETWEEN %s AND %s
+            """, (event.get('type'), event['zone'], occurred_at - window, occurred_at + window))
             result = cursor.fetchone()
+        finally:
             cursor.close()
-            
-            source_count = result[0] if result else 0
+        return max(result[0] if result else 0, 1)
+    
+    def rule_cross_validation(self, event):
+        """
+        R5: Corroboracion cruzada (reportes de otras fuentes del mismo tipo
+        y zona, o epicentro cercano, dentro de la ventana)
+        Fraccion: 1
+        """
+        try:
+            if self.corroboration is not None and self.corroboration.covers(event):
+                source_count = len(self.corroboration.sources(event))
+            else:
+                if self.corroboration is not None:
+                    self.corroboration.stats['db_lookups'] += 1
+                source_count = self.count_sources_db(event)
             
             if source_count >= 2:
-                logger.info("rule_passed", rule="R5_cross_validation", points=20, sources=source_count)
-                return 20
+                logger.info("rule_passed", rule="R5_cross_validation", sources=source_count)
+                return 1
             else:
                 logger.info("rule_failed", rule="R5_cross_validation", sources=source_count)
                 return 0
-                
+        
         except Exception as e:
             logger.error("rule_error", rule="R5_cross_validation", error=str(e))
             return 0
     
-    def calculate_score(self, event):
+    def begin(self, event, exact=False):
         """
-        Calcular score total aplicando todas las reglas
+        Primera etapa: reglas de CPU y, si el status aun no esta decidido o
+        el score se va a completar (exact, o needs_exact), lanzar las sondas
+        de red. Para lotes: begin() de todos los eventos y despues finish() y
+        complete(), asi las sondas del lote corren a la vez en una sola ronda.
         """
-        score = 0
+        scoring = _Scoring(self, event, time.monotonic() + self.time_budget_sec)
+        for step in scoring.plan.cpu:
+            if scoring.apply(step, step.fn(event)):
+                break
         
-        score += self.rule_trusted_domain(event)
-        score += self.rule_valid_url(event)
-        score += self.rule_recent_timestamp(event)
-        score += self.rule_complete_fields(event)
-        score += self.rule_cross_validation(event)
+        # La red arranca antes de las consultas a BD y corre mientras tanto
+        if not scoring.settled or exact or self.needs_exact(scoring.score):
+            scoring.start_probes()
+        return scoring
+    
+    def finish(self, scoring):
+        """Segunda etapa: reglas de BD y espera de las de red"""
+        event = scoring.event
+        if not scoring.settled:
+            for step in scoring.plan.db:
+                if scoring.apply(step, step.fn(event)):
+                    break
+        if not scoring.settled:
+            for step in scoring.plan.net:
+                if scoring.apply(step, step.fn(event, wait=scoring.deadline - time.monotonic())):
+                    break
+        
+        plan, points = scoring.plan, scoring.points
+        self.stats['evaluations'] += 1
+        if scoring.remaining > 0:
+            self.stats['settled_early'] += 1
+            self.stats['rules_skipped'] += sum(
+                1 for step in plan.cpu + plan.db + plan.net if step.key not in points)
+        return self._result(scoring)
+    
+    def complete(self, scorings):
+        """
+        Evaluar las reglas que el corte temprano salto: el status no cambia
+        pero el score pasa de cota inferior a exacto. Las sondas de red ya
+        corren desde begin() si el evento las necesitaba; si no, se lanzan
+        las de todos los eventos antes de esperar la primera.
+        """
+        partial = [scoring for scoring in scorings if scoring.remaining > 0]
+        deadline = time.monotonic() + self.time_budget_sec
+        for scoring in partial:
+            scoring.start_probes()
+        for scoring in partial:
+            plan, event = scoring.plan, scoring.event
+            for step in plan.cpu + plan.db:
+                if step.key not in scoring.points:
+                    scoring.apply(step, step.fn(event))
+            for step in plan.net:
+                if step.key not in scoring.points:
+                    scoring.apply(step, step.fn(event, wait=deadline - time.monotonic()))
+        self.stats['completed'] += len(partial)
+        return [self._result(scoring) for scoring in scorings]
+    
+    def evaluate_batch(self, events, exact=False):
+        """
+        Score de un lote: begin() de todos, finish() y complete() de los que
+        se cortaron y necesitan score exacto (todos con exact, si no solo
+        needs_exact). Las sondas de red del lote corren en una sola ronda.
+        """
+        scorings = [self.begin(event, exact) for event in events]
+        evaluations = [self.finish(scoring) for scoring in scorings]
+        completing = [
+            i for i, evaluation in enumerate(evaluations)
+            if evaluation.settled_early and (exact or self.needs_exact(evaluation.score))
+        ]
+        for i, evaluation in zip(completing, self.complete([scorings[i] for i in completing])):
+            evaluations[i] = evaluation
+        return evaluations
+    
+    def _result(self, scoring):
+        score, skipped = scoring.score, scoring.remaining > 0
+        # Solo importan las desconocidas que todavia pueden cambiar la banda
+        unknown = () if self.is_settled(score, scoring.pending) else tuple(
+            key for key, value in scoring.points.items() if value is None)
         
-        logger.info("score_calculated", total_score=score)
-        return score
+        logger.info("score_calculated", total_score=score, unknown=list(unknown), settled_early=skipped)
+        return Evaluation(score, scoring.points, unknown, skipped)
+    
+    def next_rescore(self, evaluation, event):
+        """
+        Proxima fecha en que el score puede cambiar solo por el paso del
+        tiempo: la primera frontera de las reglas por hora que hoy dan puntos
+        """
+        boundaries = [
+            step.boundary(event) for step in self.plan.cpu + self.plan.db + self.plan.net
+            if step.boundary is not None and evaluation.points.get(step.key)
+        ]
+        boundaries = [boundary for boundary in boundaries if boundary is not None]
+        return min(boundaries) if boundaries else None
+    
+    def calculate_score(self, event):
+        """
+        Calcular score aplicando el plan dentro del presupuesto de tiempo;
+        las reglas desconocidas suman 0
+        """
+        return self.finish(self.begin(event))
+    
+    def needs_exact(self, score):
+        """Los CONFIRMADO van al notifier con su score: siempre se completa"""
+        return self.determine_status(score) == 'CONFIRMADO'
+    
+    def is_settled(self, score, pending_weight):
+        """True si ningun resultado de las reglas restantes cambia la banda"""
+        if not self.early_stop and pending_weight:
+            return False
+        return self.determine_status(score) == self.determine_status(score + pending_weight)
     
     def determine_status(self, score):
         """
         Determinar estado segun score
-        - CONFIRMADO: score >= 70
-        - EN_VERIFICACION: 40 <= score < 70
-        - NO_VERIFICADO: score < 40
+        - CONFIRMADO: score >= confirmed_min (70)
+        - EN_VERIFICACION: review_min (40) <= score < confirmed_min
+        - NO_VERIFICADO: score < review_min
         """
-        if score >= 70:
+        if score >= self.confirmed_min:
             return 'CONFIRMADO'
-        elif score >= 40:
+        elif score >= self.review_min:
             return 'EN_VERIFICACION'
         else:
             return 'NO_VERIFICADO'
+
+
+class _Scoring:
+    """Estado de la evaluacion de un evento entre begin() y finish()"""
+
+    __slots__ = ('rules', 'plan', 'event', 'deadline', 'points', 'score', 'remaining', 'pending', 'settled',
+                 'probing')
+
+    def __init__(self, rules: VerificationRules, event, deadline: float):
+        self.rules = rules
+        self.plan = rules.plan
+        self.event = event
+        self.deadline = deadline
+        self.points: Dict[str, Optional[int]] = {}
+        self.score = 0
+        self.remaining = self.plan.max_score
+        self.pending = 0  # peso de las reglas desconocidas
+        self.settled = False
+        self.probing = False
+
+    def start_probes(self):
+        """Lanzar las sondas de red del plan (una vez)"""
+        if not self.probing:
+            self.probing = True
+            for step in self.plan.net:
+                step.start(self.event)
+
+    def apply(self, step: Step, fraction) -> bool:
+        """Sumar el resultado de una regla; True si el status ya no cambia"""
+        self.remaining -= step.weight
+        if fraction is None:
+            self.points[step.key] = None
+            self.pending += step.weight
+        else:
+            self.points[step.key] = round(step.weight * fraction)
+            self.score += self.points[step.key]
+        self.settled = self.rules.is_settled(self.score, self.remaining + self.pending)
+        return self.settled
+
+
+class RulesListener:
+    """
+    LISTEN sobre verification_rules_changed en una conexion dedicada;
+    pika no tiene event loop propio, asi que se consulta con poll()
+    """
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self.conn = None
+
+    @property
+    def alive(self) -> bool:
+        return self.conn is not None and not self.conn.closed
+    
+    def start(self):
+        """Abrir la conexion de escucha; si falla queda la recarga periodica"""
+        try:
+            self.conn = psycopg2.connect(self.dsn)
+            self.conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            cursor = self.conn.cursor()
+            cursor.execute(f"LISTEN {RULES_CHANNEL}")
+            cursor.close()
+            logger.info("rules_listener_started", channel=RULES_CHANNEL)
+        except Exception as e:
+            logger.warning("rules_listener_failed", error=str(e))
+            self.stop()
+    
+    def stop(self):
+        if self.conn is not None:
+            if not self.conn.closed:
+                self.conn.close()
+            self.conn = None
+    
+    def changed(self) -> bool:
+        """True si llego alguna notificacion desde la ultima consulta (no bloquea)"""
+        if not self.alive:
+            return False
+        try:
+            self.conn.poll()
+        except Exception as e:
+            logger.warning("rules_listener_lost", error=str(e))
+            self.stop()
+            return False
+        if not self.conn.notifies:
+            return False
+        self.conn.notifies.clear()
+        return True
@@ -0,0 +1,292 @@
+"""
+Verificacion de URLs de evidencia (regla R2) fuera del hilo de pika
+  - las sondas corren en un event loop propio en un thread con un
+    httpx.AsyncClient compartido (keep-alive, tope de conexiones)
+  - resultados en Redis, compartidos entre replicas del verifier, con una
+    copia local de vida corta para no ir a Redis en cada evento
+  - stale-while-revalidate: un resultado vencido hace menos de stale_sec
+    se sigue usando y se lanza una sonda en segundo plano para refrescarlo
+  - los fallos tambien se cachean (TTL negativo) y un host que no responde
+    (DNS, conexion, timeout) marca todas sus URLs como caidas
+  - una sola sonda por URL: en vuelo dentro del proceso y con un lock en
+    Redis entre replicas
+El camino de cada evento no hace peticiones HTTP: lee el cache y, solo si
+la URL nunca se vio, espera la sonda de fondo como maximo el tiempo que se
+le da; si no termino retorna None (desconocido) y la reevaluacion usa el
+resultado cuando llegue. Sin Redis funciona igual con el cache local.
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+import structlog
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - depende del entorno
+    redis = None
+
+logger = structlog.get_logger()
+
+# Servidores que no aceptan HEAD: se reintenta con GET
+HEAD_NOT_ALLOWED = (405, 501)
+
+URL_KEY = 'url_liveness:{}'
+HOST_DOWN_KEY = 'url_host_down:{}'
+LOCK_KEY = 'url_probe_lock:{}'
+
+FRESH = 'fresh'
+STALE = 'stale'
+HOST_DOWN = 'host_down'
+
+# Tras un error de Redis el camino caliente usa solo el cache local un rato
+REDIS_BACKOFF_SEC = 30
+
+
+def _url_key(url: str) -> str:
+    return URL_KEY.format(hashlib.sha1(url.encode()).hexdigest())
+
+
+class UrlChecker:
+    """Sondas HTTP en segundo plano con cache compartido en Redis"""
+
+    def __init__(self, timeout: float = 5.0, ttl_sec: float = 3600, negative_ttl_sec: float = 300,
+                 stale_sec: float = 6 * 3600, local_ttl_sec: float = 30, max_connections: int = 50,
+                 redis_url: Optional[str] = None):
+        self.timeout = timeout
+        self.ttl_sec = ttl_sec
+        self.negative_ttl_sec = negative_ttl_sec
+        self.stale_sec = stale_sec
+        self.local_ttl_sec = local_ttl_sec
+        self.max_connections = max_connections
+        self.redis_url = redis_url if redis is not None else None
+        # url -> (accesible, status, verificado en (epoch), copia local valida hasta (monotonic))
+        self.urls: Dict[str, Tuple[bool, Optional[int], float, float]] = {}
+        # host[:puerto] -> caido hasta (epoch)
+        self.down_hosts: Dict[str, float] = {}
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'host_down_hits': 0,
+                      'probes': 0, 'unknown': 0, 'redis_hits': 0, 'redis_errors': 0}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._redis = None
+        self._aredis = None
+        self._redis_retry_at = 0.0
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(max_connections=self.max_connections),
+                follow_redirects=True
+            )
+            if self.redis_url:
+                self._aredis = aioredis.from_url(self.redis_url, socket_timeout=1)
+            started.set()
+            self._loop.run_forever()
+
+        if self.redis_url:
+            self._redis = redis.from_url(self.redis_url, socket_timeout=0.2)
+        self._thread = threading.Thread(target=run, name='url-checker', daemon=True)
+        self._thread.start()
+        started.wait()
+        logger.info("url_checker_started", timeout=self.timeout, ttl_sec=self.ttl_sec,
+                    stale_sec=self.stale_sec, shared=bool(self.redis_url))
+
+    def close(self):
+        if self._loop is None:
+            return
+
+        async def shutdown():
+            await self._client.aclose()
+            if self._aredis is not None:
+                await self._aredis.close()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+        if self._redis is not None:
+            self._redis.close()
+
+    def _remember(self, url: str, stored: bytes):
+        """Copia local de un resultado leido de Redis ("ok|status|epoch")"""
+        ok, status, checked_at = stored.decode().split('|')
+        entry = (ok == '1', int(status) if status else None, float(checked_at),
+                 time.monotonic() + self.local_ttl_sec)
+        self.urls[url] = entry
+        self.stats['redis_hits'] += 1
+        return entry
+
+    def _lookup(self, url: str) -> Tuple[Optional[bool], Optional[str]]:
+        """(resultado, FRESH/STALE/HOST_DOWN) o (None, None)"""
+        now = time.time()
+        host = urlsplit(url).netloc
+        entry = self.urls.get(url)
+        if (entry is None or entry[3] <= time.monotonic()) and self._redis is not None \
+                and time.monotonic() >= self._redis_retry_at:
+            try:
+                stored, down_until = self._redis.mget(_url_key(url), HOST_DOWN_KEY.format(host))
+            except Exception as e:
+                self.stats['redis_errors'] += 1
+                self._redis_retry_at = time.monotonic() + REDIS_BACKOFF_SEC
+                logger.warning("url_cache_redis_failed", error=str(e))
+                stored = down_until = None
+            if down_until:
+                self.down_hosts[host] = float(down_until)
+            if stored:
+                entry = self._remember(url, stored)
+
+        # Host caido despues del ultimo resultado de esta URL
+        down_until = self.down_hosts.get(host)
+        if down_until and down_until > now and (entry is None or entry[2] < down_until - self.negative_ttl_sec):
+            return False, HOST_DOWN
+        if entry is None:
+            return None, None
+        age = now - entry[2]
+        ttl = self.ttl_sec if entry[0] else self.negative_ttl_sec
+        if age < ttl:
+            return entry[0], FRESH
+        if age < ttl + self.stale_sec:
+            return entry[0], STALE
+        return None, None
+
+    def cached(self, url: str) -> Optional[bool]:
+        """Resultado en cache (fresco o vencido hace poco), o None"""
+        result, state = self._lookup(url)
+        if state == FRESH:
+            self.stats['hits'] += 1
+        elif state == HOST_DOWN:
+            self.stats['host_down_hits'] += 1
+        elif state == STALE:
+            # Se responde con el valor vencido y se refresca en segundo plano
+            self.stats['stale_hits'] += 1
+            self.submit(url)
+        return result
+
+    def prefetch(self, url: str):
+        """Lanzar la sonda si no hay resultado en cache, sin esperar"""
+        if self._lookup(url)[0] is None:
+            self.submit(url)
+
+    def submit(self, url: str) -> Future:
+        """Sonda en el loop (o la que ya esta en vuelo para la misma URL)"""
+        with self._lock:
+            future = self._inflight.get(url)
+            if future is None:
+                future = asyncio.run_coroutine_threadsafe(self._refresh(url), self._loop)
+                self._inflight[url] = future
+                future.add_done_callback(lambda _: self._forget(url))
+            return future
+
+    def _forget(self, url: str):
+        with self._lock:
+            self._inflight.pop(url, None)
+
+    def check(self, url: str, wait: float) -> Optional[bool]:
+        """
+        True/False desde el cache; si la URL no se conoce, espera la sonda de
+        fondo como maximo `wait` segundos y si no termino retorna None
+        """
+        result = self.cached(url)
+        if result is not None:
+            return result
+        self.stats['misses'] += 1
+        future = self.submit(url)
+        try:
+            return future.result(timeout=max(wait, 0))
+        except FutureTimeout:
+            # La sonda sigue y deja el resultado en cache
+            self.stats['unknown'] += 1
+            return None
+
+    async def _refresh(self, url: str) -> bool:
+        """Sondear la URL, salvo que otra replica ya lo este haciendo"""
+        if self._aredis is not None:
+            key = _url_key(url)
+            try:
+                locked = await self._aredis.set(LOCK_KEY.format(key), '1', nx=True,
+                                                ex=int(self.timeout * 2) + 1)
+            except Exception as e:
+                self.stats['redis_errors'] += 1
+                logger.warning("url_cache_redis_failed", error=str(e))
+                locked = True
+            if not locked:
+                # Esperar el resultado de la otra replica; si no llega, sondear
+                deadline = time.monotonic() + self.timeout * 2
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(0.25)
+                    try:
+                        stored = await self._aredis.get(key)
+                    except Exception:
+                        break
+                    if stored:
+                        entry = self._remember(url, stored)
+                        if time.time() - entry[2] < self.timeout * 2:
+                            return entry[0]
+        return await self._probe(url)
+
+    async def _probe(self, url: str) -> bool:
+        self.stats['probes'] += 1
+        host = urlsplit(url).netloc
+        try:
+            response = await self._client.head(url)
+            if response.status_code in HEAD_NOT_ALLOWED:
+                async with self._client.stream('GET', url) as response:
+                    pass
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout) as e:
+            # Host caido: negativo para todas sus URLs
+            self.down_hosts[host] = time.time() + self.negative_ttl_sec
+            await self._store(url, False, None, down_host=host)
+            logger.warning("url_host_down", host=host, error=type(e).__name__)
+            return False
+        except Exception as e:
+            await self._store(url, False, None)
+            logger.warning("url_probe_failed", url=url, error=str(e))
+            return False
+
+        ok = response.status_code < 400
+        self.down_hosts.pop(host, None)
+        await self._store(url, ok, response.status_code)
+        return ok
+
+    async def _store(self, url: str, ok: bool, status: Optional[int], down_host: Optional[str] = None):
+        now = time.time()
+        self.urls[url] = (ok, status, now, time.monotonic() + self.local_ttl_sec)
+        if self._aredis is None:
+            return
+        # En Redis vive el TTL mas la ventana en que se sirve vencido
+        ttl = (self.ttl_sec if ok else self.negative_ttl_sec) + self.stale_sec
+        key = _url_key(url)
+        try:
+            pipe = self._aredis.pipeline(transaction=False)
+            pipe.set(key, f"{int(ok)}|{status or ''}|{now}", ex=int(ttl))
+            if down_host:
+                pipe.set(HOST_DOWN_KEY.format(down_host), str(now + self.negative_ttl_sec),
+                         ex=int(self.negative_ttl_sec))
+            pipe.delete(LOCK_KEY.format(key))
+            await pipe.execute()
+        except Exception as e:
+            self.stats['redis_errors'] += 1
+            logger.warning("url_cache_redis_failed", error=str(e))
+
+    def purge(self):
+        """Quitar entradas que ya no se sirven ni vencidas (llamar periodicamente)"""
+        now = time.time()
+        horizon = max(self.ttl_sec, self.negative_ttl_sec) + self.stale_sec
+        # list(): el thread del loop puede estar escribiendo
+        for url in [url for url, entry in list(self.urls.items()) if now - entry[2] >= horizon]:
+            self.urls.pop(url, None)
+        for host in [host for host, until in list(self.down_hosts.items()) if until <= now]:
+            self.down_hosts.pop(host, None)